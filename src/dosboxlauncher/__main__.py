@@ -19,6 +19,12 @@ class DOSBoxLauncherApp(Gtk.Application):
             self.window = MainWindow(self)
             self.window.present()
 
+    def do_shutdown(self) -> None:
+        if hasattr(self, "window"):
+            self.window.stop_health_checker()
+            self.window.close_save_manager()
+        Gtk.Application.do_shutdown(self)
+
 
 def main() -> None:
     """Run the application."""
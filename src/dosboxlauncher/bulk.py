@@ -0,0 +1,269 @@
+"""Streaming import and export of the game library.
+
+Games are read and written one record at a time, in JSON Lines (one
+``Game.to_dict`` object per line) or CSV (the same fields as columns, with
+tags separated by semicolons), so files of any size can be processed
+without holding them in memory.
+"""
+
+import csv
+import json
+import uuid
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import IO
+
+from .config import AppConfig, create_game_config, save_app_config
+from .exceptions import GameNotFoundError, ValidationError
+from .models import UPDATABLE_FIELDS, Game, GameLibrary
+from .statcache import stat_cache
+
+FORMATS = ("jsonl", "csv")
+BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 100
+CSV_FIELDS = ("id", "name", "exe_path", "config_path", "created_at", "notes", "tags")
+TAG_SEPARATOR = ";"
+
+_SUFFIXES = {".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv"}
+
+
+@dataclass
+class ImportResult:
+    """What an import did.
+
+    ``errors`` holds the line number and message of the first
+    MAX_REPORTED_ERRORS rejected records; ``rejected`` counts all of them.
+    """
+
+    added: int = 0
+    updated: int = 0
+    rejected: int = 0
+    errors: list[tuple[int, str]] = field(default_factory=list)
+
+    @property
+    def processed(self) -> int:
+        """Number of records read so far."""
+        return self.added + self.updated + self.rejected
+
+    def _reject(self, line: int, message: str) -> None:
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+
+def format_for(path: str | Path) -> str:
+    """Guess the format of a file from its extension.
+
+    Raises:
+        ValidationError: If the extension isn't a known one.
+    """
+    fmt = _SUFFIXES.get(Path(path).suffix.lower())
+    if fmt is None:
+        raise ValidationError(f"Unknown file format for {path}; use .jsonl or .csv")
+    return fmt
+
+
+def read_records(file: IO[str], fmt: str) -> Iterator[tuple[int, dict | ValidationError]]:
+    """Read serialized games one at a time.
+
+    Yields:
+        The line number of each record, and the record, or the error that
+        made it unreadable.
+    """
+    if fmt == "jsonl":
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield line_number, ValidationError(f"Invalid JSON: {e}")
+                continue
+            if not isinstance(record, dict):
+                yield line_number, ValidationError("Record is not a JSON object")
+                continue
+            yield line_number, record
+    elif fmt == "csv":
+        reader = csv.DictReader(file)
+        for row in reader:
+            record = {key: value for key, value in row.items() if key in CSV_FIELDS}
+            tags = record.get("tags") or ""
+            record["tags"] = [tag.strip() for tag in tags.split(TAG_SEPARATOR) if tag.strip()]
+            yield reader.line_num, record
+    else:
+        raise ValidationError(f"Unknown file format: {fmt}")
+
+
+def game_from_record(record: dict) -> Game:
+    """Create a game from an imported record, checking its fields.
+
+    Raises:
+        ValidationError: If a field is missing or malformed.
+    """
+    name = record.get("name")
+    if not isinstance(name, str) or not name.strip():
+        raise ValidationError("Game name cannot be empty")
+    for key in ("id", "exe_path", "config_path", "created_at", "notes"):
+        if not isinstance(record.get(key) or "", str):
+            raise ValidationError(f"Field {key} must be a string")
+    tags = record.get("tags") or []
+    if not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
+        raise ValidationError("Field tags must be a list of strings")
+
+    try:
+        game_id = uuid.UUID(record["id"]) if record.get("id") else uuid.uuid4()
+        created_at = record.get("created_at") or datetime.now()
+        return Game(
+            id=game_id,
+            name=name.strip(),
+            exe_path=record.get("exe_path") or "",
+            config_path=record.get("config_path") or "",
+            created_at=created_at,
+            notes=record.get("notes") or "",
+            tags=tags,
+        )
+    except ValueError as e:
+        raise ValidationError(f"Invalid field value: {e}") from e
+
+
+def import_games(
+    config: AppConfig,
+    file: IO[str],
+    fmt: str,
+    batch_size: int = BATCH_SIZE,
+    check_files: bool = False,
+    progress: Callable[[ImportResult], None] | None = None,
+) -> ImportResult:
+    """Add games from a file to a config's library, saving as it goes.
+
+    Records are read ``batch_size`` at a time. Each batch is validated,
+    applied to the library as one change, and saved, so an interrupted
+    import keeps every batch that finished. Added games get a DOSBox
+    config file from the base config, like games added by hand. A record whose ID is already
+    in the library updates that game; other records are added. Records
+    that fail validation, or whose executable is already in the library
+    under another game, are rejected and reported in the result.
+
+    Args:
+        config: The config to import into.
+        file: The file to read.
+        fmt: "jsonl" or "csv".
+        batch_size: Records to validate and save at a time.
+        check_files: If True, also reject games whose executable or config
+            directory doesn't exist.
+        progress: Called with the running result after each batch.
+
+    Raises:
+        ValidationError: If the format is unknown.
+        ConfigError: If saving a batch fails. Earlier batches stay saved.
+    """
+    result = ImportResult()
+    records = read_records(file, fmt)
+    while batch := list(islice(records, batch_size)):
+        games = _validate_batch(batch, check_files, result)
+        library = config.games
+        with library.batch():
+            for line_number, game in games:
+                try:
+                    _apply(library, game, result)
+                except (ValidationError, GameNotFoundError) as e:
+                    result._reject(line_number, str(e))
+        save_app_config(config)
+        if progress:
+            progress(result)
+    return result
+
+
+def _validate_batch(
+    batch: list[tuple[int, dict | ValidationError]], check_files: bool, result: ImportResult
+) -> list[tuple[int, Game]]:
+    """Turn a batch of records into games, rejecting the invalid ones."""
+    games = []
+    for line_number, record in batch:
+        try:
+            if isinstance(record, ValidationError):
+                raise record
+            game = game_from_record(record)
+            if check_files:
+                is_valid, errors = game.validate(check_config_file=False)
+                if not is_valid:
+                    raise ValidationError("; ".join(errors))
+        except ValidationError as e:
+            result._reject(line_number, str(e))
+            continue
+        games.append((line_number, game))
+    return games
+
+
+def _apply(library: GameLibrary, game: Game, result: ImportResult) -> None:
+    """Add a game to the library, or update the game with its ID."""
+    if game.exe_path:
+        duplicate = library.find_duplicate(game.exe_path)
+        if duplicate is not None and duplicate.id != game.id:
+            raise ValidationError(f"Executable already in the library as {duplicate.name}")
+
+    if library.get(game.id) is None:
+        # Games without a config directory are left for validation to report
+        if game.config_path and stat_cache.isdir(game.config_path):
+            try:
+                create_game_config(game)
+            except OSError as e:
+                raise ValidationError(f"Failed to create config file: {e}") from e
+        library.add(game)
+        result.added += 1
+    else:
+        library.update(game.id, **{name: getattr(game, name) for name in UPDATABLE_FIELDS})
+        result.updated += 1
+
+
+def export_games(
+    library: GameLibrary,
+    file: IO[str],
+    fmt: str,
+    progress: Callable[[int], None] | None = None,
+    progress_every: int = BATCH_SIZE,
+) -> int:
+    """Write every game in a library to a file, one record at a time.
+
+    Args:
+        library: The library to export. Games added or removed while the
+            export runs are not included.
+        file: The file to write.
+        fmt: "jsonl" or "csv".
+        progress: Called with the number of games written so far, every
+            ``progress_every`` games and at the end.
+        progress_every: How often to report progress.
+
+    Returns:
+        The number of games written.
+
+    Raises:
+        ValidationError: If the format is unknown.
+    """
+    if fmt == "jsonl":
+
+        def write(data: dict) -> None:
+            file.write(json.dumps(data) + "\n")
+
+    elif fmt == "csv":
+        writer = csv.DictWriter(file, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+
+        def write(data: dict) -> None:
+            writer.writerow({**data, "tags": TAG_SEPARATOR.join(data["tags"])})
+
+    else:
+        raise ValidationError(f"Unknown file format: {fmt}")
+
+    count = 0
+    for game in library.view():
+        write(game.to_dict())
+        count += 1
+        if progress and count % progress_every == 0:
+            progress(count)
+    if progress and count % progress_every:
+        progress(count)
+    return count
@@ -0,0 +1,208 @@
+"""Command line tools for managing the game library without the GUI."""
+
+import argparse
+import sys
+from contextlib import nullcontext
+
+from .bulk import BATCH_SIZE, FORMATS, ImportResult, export_games, format_for, import_games
+from .config import create_game_config, get_games_dir, load_app_config, save_app_config
+from .exceptions import DOSBoxLauncherError
+from .models import Game
+from .scanner import SCAN_MAX_DEPTH, SCAN_WORKERS, ScanProgress, scan_games
+from .validation import VALIDATION_WORKERS
+
+
+def _open(path: str, mode: str):
+    """Open a file for import or export, with "-" meaning stdin or stdout."""
+    if path == "-":
+        return nullcontext(sys.stdin if "r" in mode else sys.stdout)
+    return open(path, mode, newline="", encoding="utf-8")
+
+
+def _import(args: argparse.Namespace) -> int:
+    fmt = args.format or format_for(args.file)
+    config = load_app_config()
+
+    def report(result: ImportResult) -> None:
+        print(
+            f"{result.processed} records read: {result.added} added, "
+            f"{result.updated} updated, {result.rejected} rejected",
+            file=sys.stderr,
+        )
+
+    with _open(args.file, "r") as f:
+        result = import_games(
+            config,
+            f,
+            fmt,
+            batch_size=args.batch_size,
+            check_files=args.check_files,
+            progress=None if args.quiet else report,
+        )
+
+    for line, message in result.errors:
+        print(f"{args.file}:{line}: {message}", file=sys.stderr)
+    if result.rejected > len(result.errors):
+        print(f"... and {result.rejected - len(result.errors)} more errors", file=sys.stderr)
+    return 1 if result.rejected else 0
+
+
+def _export(args: argparse.Namespace) -> int:
+    fmt = args.format or format_for(args.file)
+    config = load_app_config()
+
+    def report(count: int) -> None:
+        print(f"{count} games written", file=sys.stderr)
+
+    with _open(args.file, "w") as f:
+        export_games(config.games, f, fmt, progress=None if args.quiet else report)
+    return 0
+
+
+def _validate(args: argparse.Namespace) -> int:
+    config = load_app_config()
+    checked = invalid = 0
+    for report in config.games.validate_all(
+        check_config_file=not args.skip_config_file, max_workers=args.workers
+    ):
+        checked += 1
+        if not report.is_valid:
+            invalid += 1
+            print(f"{report.game.name} ({report.game_id}): {'; '.join(report.errors)}")
+    if not args.quiet:
+        print(f"{checked} games checked, {invalid} with problems", file=sys.stderr)
+    return 1 if invalid else 0
+
+
+def _scan(args: argparse.Namespace) -> int:
+    config = load_app_config()
+    config_dir = config.default_config_dir or str(get_games_dir())
+    status = ScanProgress()
+
+    def report(progress: ScanProgress) -> None:
+        nonlocal status
+        status = progress
+        if not args.quiet and progress.directories % 1000 == 0:
+            print(f"{progress.directories} folders scanned", file=sys.stderr)
+
+    def add(games: list[Game]) -> None:
+        with config.games.batch():
+            for game in games:
+                create_game_config(game)
+                config.games.add(game)
+        save_app_config(config)
+
+    # Games are listed as they are found and, with --add, saved a batch at a time
+    found = []
+    for proposal in scan_games(
+        args.roots,
+        library=config.games,
+        max_workers=args.workers,
+        max_depth=args.max_depth,
+        progress=report,
+    ):
+        print(f"{proposal.name}\t{proposal.exe_path}", flush=True)
+        if args.add:
+            found.append(proposal.to_game(config_dir))
+            if len(found) >= BATCH_SIZE:
+                add(found)
+                found = []
+    if found:
+        add(found)
+
+    if not args.quiet:
+        print(
+            f"{status.directories} folders scanned: {status.found} games found, "
+            f"{status.known} already in the library",
+            file=sys.stderr,
+        )
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create the argument parser for the command line tools."""
+    parser = argparse.ArgumentParser(prog="dosboxlauncher-cli", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser(
+        "import", help="add games from a JSON Lines or CSV file to the library"
+    )
+    import_parser.add_argument("file", help="file to read, or - for stdin")
+    import_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=BATCH_SIZE,
+        help=f"records to validate and save at a time (default {BATCH_SIZE})",
+    )
+    import_parser.add_argument(
+        "--check-files",
+        action="store_true",
+        help="reject games whose executable or config directory doesn't exist",
+    )
+    import_parser.set_defaults(run=_import)
+
+    export_parser = commands.add_parser(
+        "export", help="write the library to a JSON Lines or CSV file"
+    )
+    export_parser.add_argument("file", help="file to write, or - for stdout")
+    export_parser.set_defaults(run=_export)
+
+    validate_parser = commands.add_parser(
+        "validate", help="check that every game's files exist and list the ones that don't"
+    )
+    validate_parser.add_argument(
+        "--skip-config-file",
+        action="store_true",
+        help="don't check for each game's DOSBox config file",
+    )
+    validate_parser.add_argument(
+        "--workers",
+        type=int,
+        default=VALIDATION_WORKERS,
+        help=f"games to check at once (default {VALIDATION_WORKERS})",
+    )
+    validate_parser.add_argument("-q", "--quiet", action="store_true", help="don't print a summary")
+    validate_parser.set_defaults(run=_validate, file=None)
+
+    scan_parser = commands.add_parser(
+        "scan", help="look for DOS games in folders and list the ones not in the library"
+    )
+    scan_parser.add_argument("roots", nargs="+", metavar="folder", help="folder to scan")
+    scan_parser.add_argument("--add", action="store_true", help="add the games found")
+    scan_parser.add_argument(
+        "--workers",
+        type=int,
+        default=SCAN_WORKERS,
+        help=f"folders to read at once (default {SCAN_WORKERS})",
+    )
+    scan_parser.add_argument(
+        "--max-depth",
+        type=int,
+        default=SCAN_MAX_DEPTH,
+        help=f"levels of subfolders to look in (default {SCAN_MAX_DEPTH})",
+    )
+    scan_parser.add_argument("-q", "--quiet", action="store_true", help="don't report progress")
+    scan_parser.set_defaults(run=_scan, file=None)
+
+    for command in (import_parser, export_parser):
+        command.add_argument(
+            "--format", choices=FORMATS, help="file format (default: from the extension)"
+        )
+        command.add_argument("-q", "--quiet", action="store_true", help="don't report progress")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run a command line tool and return its exit status."""
+    args = build_parser().parse_args(argv)
+    if args.file == "-" and args.format is None:
+        args.format = FORMATS[0]
+    try:
+        return args.run(args)
+    except (DOSBoxLauncherError, OSError) as e:
+        print(f"dosboxlauncher-cli: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
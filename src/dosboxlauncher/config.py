@@ -1,43 +1,86 @@
 """Application configuration management."""
 
+import json
 import os
 from dataclasses import dataclass, field
+from itertools import islice
 from pathlib import Path
 
-import yaml
 from platformdirs import PlatformDirs
 
 from .exceptions import ConfigError
-from .models import GameLibrary
+from .models import Game, GameLibrary
+from .statcache import stat_cache
+from .storage import (
+    BACKENDS,
+    JournalStorage,
+    ShardedStorage,
+    SqliteStorage,
+    StorageBackend,
+    YamlStorage,
+    _write_json,
+    refresh,
+)
+from .validation import LAUNCH_CHECK_TIMEOUT
 
 APP_NAME = "DOSBoxLauncher"
 APP_AUTHOR = "DOSBoxLauncher"
+DATABASE_NAME = "config.db"
+MANIFEST_NAME = "library.json"
+MIGRATION_BATCH_SIZE = 500
+# Largest single game the JSON migration will buffer while decoding it
+MIGRATION_MAX_RECORD = 1024 * 1024
 
 
 @dataclass
 class AppConfig:
-    """Application configuration."""
+    """Application configuration.
+
+    ``storage`` names the backend the configuration is saved with: "yaml"
+    for a single config.yaml, "journal" for config.yaml plus a log of the
+    changes since it was written, "sqlite" for a database with one row
+    per game, or "sharded" for one file per game in the games directory.
+    Switching backend migrates the library on the next load or
+    save and keeps the old file as a .bak.
+
+    ``launch_timeout`` is how many seconds to wait for a game's files
+    before launching it, so a stale network mount can't hang the launch.
+    """
 
     dosbox_path: str | None = None
     default_config_dir: str | None = None
     games: GameLibrary = field(default_factory=GameLibrary)
+    storage: str = "yaml"
+    launch_timeout: float = LAUNCH_CHECK_TIMEOUT
 
-    def to_dict(self) -> dict:
-        """Convert to dictionary for YAML serialization."""
+    def settings(self) -> dict:
+        """Get every setting except the game library."""
         return {
             "dosbox_path": self.dosbox_path,
             "default_config_dir": self.default_config_dir,
-            "games": self.games.to_dict(),
+            "storage": self.storage,
+            "launch_timeout": self.launch_timeout,
         }
 
+    def to_dict(self) -> dict:
+        """Convert to dictionary for YAML serialization."""
+        return {**self.settings(), "games": self.games.to_dict()}
+
     @classmethod
-    def from_dict(cls, data: dict) -> "AppConfig":
-        """Create AppConfig from dictionary."""
+    def from_dict(cls, data: dict, lazy: bool = False) -> "AppConfig":
+        """Create AppConfig from dictionary.
+
+        Args:
+            data: Parsed config file contents.
+            lazy: If True, load games lazily (see ``GameLibrary.from_dict``).
+        """
         games_data = data.get("games", {})
         return cls(
             dosbox_path=data.get("dosbox_path"),
             default_config_dir=data.get("default_config_dir"),
-            games=GameLibrary.from_dict(games_data),
+            games=GameLibrary.from_dict(games_data, lazy=lazy),
+            storage=data.get("storage") or "yaml",
+            launch_timeout=data.get("launch_timeout") or LAUNCH_CHECK_TIMEOUT,
         )
 
 
@@ -62,59 +105,258 @@ def get_games_dir() -> Path:
     return games_dir
 
 
-def load_app_config() -> AppConfig:
-    """Load application configuration from YAML file."""
-    config_path = get_config_path()
+def create_game_config(game: Game) -> None:
+    """Create a new game's DOSBox config file from the base config.
 
-    if not config_path.exists():
-        return AppConfig()
+    The base config is base-config.conf in the games directory, or else in
+    the working directory. Without one, no config file is created, and an
+    existing config file is kept.
+    """
+    game_config_path = game.get_config_file_path()
+    if stat_cache.exists(game_config_path):
+        return
+    base_config_path = get_games_dir() / "base-config.conf"
+    if not stat_cache.exists(base_config_path):
+        base_config_path = Path("base-config.conf")
 
-    try:
-        with open(config_path) as f:
-            data = yaml.safe_load(f) or {}
-        return AppConfig.from_dict(data)
-    except yaml.YAMLError as e:
-        raise ConfigError(f"Invalid config file: {e}") from e
-    except Exception as e:
-        raise ConfigError(f"Failed to load config: {e}") from e
+    if stat_cache.exists(base_config_path):
+        with open(base_config_path) as reader:
+            with open(game_config_path, "w") as writer:
+                writer.write(reader.read())
+        stat_cache.invalidate(game_config_path)
 
 
-def save_app_config(config: AppConfig) -> None:
-    """Save application configuration to YAML file."""
+def get_storage(name: str | None = None) -> StorageBackend:
+    """Get a storage backend for the config.
+
+    Args:
+        name: Backend name (see ``AppConfig.storage``), or None for the one
+            the existing config was saved with.
+
+    Raises:
+        ConfigError: If there is no backend with the given name.
+    """
     config_path = get_config_path()
+    database_path = config_path.with_name(DATABASE_NAME)
+    if name is None:
+        if database_path.exists():
+            name = SqliteStorage.name
+        elif (get_games_dir() / MANIFEST_NAME).exists():
+            name = ShardedStorage.name
+        elif JournalStorage(config_path).exists():
+            name = JournalStorage.name
+        else:
+            name = YamlStorage.name
+
+    if name == YamlStorage.name:
+        return YamlStorage(config_path)
+    if name == JournalStorage.name:
+        return JournalStorage(config_path)
+    if name == SqliteStorage.name:
+        return SqliteStorage(database_path)
+    if name == ShardedStorage.name:
+        return ShardedStorage(get_games_dir() / MANIFEST_NAME)
+    raise ConfigError(f"Unknown config storage: {name}")
 
-    config_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(config_path, "w") as f:
-        yaml.dump(config.to_dict(), f, default_flow_style=False, sort_keys=False)
+def load_app_config() -> AppConfig:
+    """Load application configuration."""
+    storage = get_storage()
+    config = storage.load()
+    if config.storage != storage.name:
+        save_app_config(config)
+    return config
 
 
-def migrate_from_json(json_path: str = "games.json") -> AppConfig:
-    """Migrate games from old JSON format to new YAML config."""
-    import json
+def reload_app_config(config: AppConfig) -> bool:
+    """Apply changes saved by other processes to a loaded configuration.
 
-    config = load_app_config()
+    Only the games that changed on disk are updated in ``config.games``,
+    and unsaved changes made to ``config`` are kept.
 
-    if not os.path.exists(json_path):
-        return config
+    Returns:
+        Whether anything changed.
 
-    try:
-        with open(json_path) as f:
-            old_games = json.load(f)
+    Raises:
+        ConfigError: If the configuration can't be read.
+    """
+    return refresh(config, get_storage(config.storage))
 
-        for old_game in old_games:
-            from .models import Game
 
-            # Old format didn't have exe path - leave blank for user to fill
-            game = Game(
-                name=old_game.get("name", "Unknown"),
-                exe_path="",
-                config_path=old_game.get("config_file", ""),
-            )
-            config.games.add(game)
+def save_app_config(config: AppConfig) -> None:
+    """Save application configuration with its storage backend."""
+    storage = get_storage(config.storage)
+    migrating = not storage.exists()
+    storage.save(config)
+
+    if migrating:
+        # Keep whatever the config was stored in before as a backup
+        for name in BACKENDS:
+            old = get_storage(name)
+            if old.path != storage.path and old.exists():
+                os.replace(old.path, old.path.with_name(old.path.name + ".bak"))
+
+
+def migrate_from_json(
+    json_path: str = "games.json", batch_size: int = MIGRATION_BATCH_SIZE
+) -> AppConfig:
+    """Migrate games from old JSON format to new YAML config.
+
+    The old file is decoded one game at a time and the games are saved
+    ``batch_size`` at a time. After each batch a checkpoint is written
+    next to the old file, so a migration that is interrupted picks up
+    after the last saved batch when run again. Games that can't be
+    migrated, and a file that can't be read past some point, are listed
+    in a ``.errors`` report next to the old file, one JSON object per
+    line; the rest of the file is still migrated.
+
+    Raises:
+        ConfigError: If saving a batch fails. The batches saved before it
+            are kept, and running the migration again resumes after them.
+        OSError: If the old file can't be opened.
+    """
+    config = load_app_config()
 
-        save_app_config(config)
-    except Exception:
-        pass  # Silent failure for migration - old file may not exist
+    if not os.path.exists(json_path):
+        return config
 
+    checkpoint_path = Path(json_path + ".checkpoint")
+    report_path = Path(json_path + ".errors")
+    stat = os.stat(json_path)
+    identity = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    done = _read_checkpoint(checkpoint_path, identity)
+    errors = []
+
+    with open(json_path, encoding="utf-8") as f, open(report_path, "a" if done else "w") as report:
+        records = enumerate(_iter_json_array(f))
+        finished = False
+        while not finished:
+            batch = []
+            try:
+                # Keeps the games decoded before an error
+                batch.extend(islice(records, batch_size))
+            except ValueError as e:
+                # The rest of the file can't be decoded
+                errors.append({"record": None, "error": f"Invalid JSON file: {e}"})
+                finished = True
+            finished = finished or len(batch) < batch_size
+
+            with config.games.batch():
+                for index, old_game in batch:
+                    if index < done:
+                        continue
+                    error = _migrate_game(config.games, old_game)
+                    if error:
+                        errors.append({"record": index, "error": error})
+
+            if any(index >= done for index, _ in batch):
+                save_app_config(config)
+                done = batch[-1][0] + 1
+                _write_json(checkpoint_path, {**identity, "done": done})
+            report.write("".join(json.dumps(error) + "\n" for error in errors))
+            report.flush()
+            errors.clear()
+
+    checkpoint_path.unlink(missing_ok=True)
+    if report_path.stat().st_size == 0:
+        report_path.unlink()
     return config
+
+
+def _migrate_game(library: GameLibrary, old_game) -> str | None:
+    """Add a game from the old JSON format to a library.
+
+    Returns:
+        Why the game couldn't be migrated, or None.
+    """
+    if not isinstance(old_game, dict):
+        return "Game is not a JSON object"
+    name = old_game.get("name", "Unknown")
+    config_file = old_game.get("config_file", "")
+    if not isinstance(name, str) or not isinstance(config_file, str):
+        return "Game name and config_file must be strings"
+
+    # Skip games an earlier migration already brought over
+    if any(g.config_path == config_file for g in library.find_by_name(name)):
+        return None
+
+    # Old format didn't have exe path - leave blank for user to fill
+    library.add(Game(name=name, exe_path="", config_path=config_file))
+    return None
+
+
+def _iter_json_array(file, chunk_size: int = 64 * 1024):
+    """Decode the items of a JSON array one at a time from a text file.
+
+    Raises:
+        ValueError: When the file stops being a valid JSON array.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def skip_space() -> bool:
+        """Move to the next non-space character, reading more as needed."""
+        nonlocal buffer, pos, eof
+        while True:
+            while pos < len(buffer) and buffer[pos].isspace():
+                pos += 1
+            if pos < len(buffer) or eof:
+                return pos < len(buffer)
+            chunk = file.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+
+    if not skip_space() or buffer[pos] != "[":
+        raise ValueError("expected a list of games")
+    pos += 1
+    first = True
+    while True:
+        if not skip_space():
+            raise ValueError("unexpected end of file")
+        if buffer[pos] == "]":
+            return
+        if not first:
+            if buffer[pos] != ",":
+                raise ValueError(f"expected ',' or ']' near {buffer[pos : pos + 20]!r}")
+            pos += 1
+            if not skip_space():
+                raise ValueError("unexpected end of file")
+        first = False
+
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except ValueError:
+                item, end = None, None
+            # An item that runs to the end of what's been read may continue
+            if end is not None and (end < len(buffer) or eof):
+                break
+            if eof or len(buffer) - pos > MIGRATION_MAX_RECORD:
+                raise ValueError(f"invalid game near {buffer[pos : pos + 20]!r}")
+            chunk = file.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+        pos = end
+        yield item
+
+
+def _read_checkpoint(path: Path, identity: dict) -> int:
+    """Get how many games an earlier run of a migration saved.
+
+    A checkpoint written for a different version of the file is ignored.
+    """
+    try:
+        with open(path) as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return 0
+    if not isinstance(checkpoint, dict):
+        return 0
+    if any(checkpoint.get(key) != value for key, value in identity.items()):
+        return 0
+    done = checkpoint.get("done", 0)
+    return done if isinstance(done, int) else 0
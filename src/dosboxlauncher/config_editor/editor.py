@@ -9,6 +9,7 @@ from gi.repository import Gtk
 
 from ..config import get_games_dir
 from ..models import Game
+from ..statcache import stat_cache
 from .dataclasses import COMBO_BOX_MAPPINGS, KEY_MAPPINGS, SECTION_MAPPINGS, Config, load_config
 from .parser import DOSBoxConfigParser
 from .tooltips import TOOLTIPS
@@ -222,6 +223,7 @@ class ConfigEditor(Gtk.Window):
         config_file_path = self._get_config_file_path()
         with open(config_file_path, "w") as f:
             self.config.write(f)
+        stat_cache.invalidate(config_file_path)
 
     def _reset_config(self, btn: Gtk.Widget | None = None) -> None:
         """Reset configuration to defaults with confirmation dialog."""
@@ -250,7 +252,7 @@ class ConfigEditor(Gtk.Window):
         config_path = self._get_config_file_path()
         self.config = DOSBoxConfigParser()
 
-        if os.path.exists(config_path):
+        if stat_cache.exists(config_path):
             self.config.read(config_path)
         else:
             self._create_config(config_path)
@@ -260,10 +262,11 @@ class ConfigEditor(Gtk.Window):
         """Remove the config file and game from library."""
         config_path = self._get_config_file_path()
         try:
-            if os.path.exists(config_path):
+            if stat_cache.exists(config_path):
                 os.remove(config_path)
         except OSError:
             pass  # Silent failure - file may already be removed
+        stat_cache.invalidate(config_path)
 
     def _get_config_file_path(self) -> str:
         """Get the config file path for this game."""
@@ -273,12 +276,13 @@ class ConfigEditor(Gtk.Window):
         """Create a new config file from default."""
         games_dir = get_games_dir()
         default_config = games_dir / DEFAULT_CONFIG
-        if not default_config.exists():
+        if not stat_cache.exists(default_config):
             default_config = DEFAULT_CONFIG
 
         with open(default_config) as reader:
             with open(config_path, "w") as writer:
                 writer.write(reader.read())
+        stat_cache.invalidate(config_path)
 
     def _get_config_section_name(self, section: str) -> str:
         """Map UI section names to DOSBox config section names."""
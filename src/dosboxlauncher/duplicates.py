@@ -0,0 +1,62 @@
+"""Helpers for detecting games that point at the same executable."""
+
+import hashlib
+import os
+import threading
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def resolve_exe_path(path: str) -> str:
+    """Get the canonical path of an executable, following symlinks."""
+    return os.path.realpath(path) if path else ""
+
+
+class HashCache:
+    """Content hashes of files, cached by inode, modification time and size.
+
+    A cached hash is reused for as long as the file's ``(st_ino,
+    st_mtime_ns, st_size)`` signature is unchanged, so rechecking a file
+    costs a single ``stat``.
+    """
+
+    def __init__(self) -> None:
+        self._hashes: dict[str, tuple[tuple[int, int, int], str]] = {}
+        self._lock = threading.Lock()
+
+    def digest(self, path: str) -> str | None:
+        """Get the SHA-256 hex digest of a file, or None if it can't be read."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            cached = self._hashes.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        sha = hashlib.sha256()
+        try:
+            with open(path, "rb") as f:
+                while chunk := f.read(HASH_CHUNK_SIZE):
+                    sha.update(chunk)
+        except OSError:
+            return None
+
+        digest = sha.hexdigest()
+        with self._lock:
+            self._hashes[path] = (signature, digest)
+        return digest
+
+    def invalidate(self, path: str | None = None) -> None:
+        """Forget the hash of one file, or of every file."""
+        with self._lock:
+            if path is None:
+                self._hashes.clear()
+            else:
+                self._hashes.pop(path, None)
+
+
+hash_cache = HashCache()
@@ -0,0 +1,160 @@
+"""Background checking of the games in a library."""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Callable, Iterable
+
+from .models import ChangeKind, GameLibrary, LibraryChange, _id_key
+from .validation import ValidationReport
+
+HEALTH_SLICE = 8
+HEALTH_RATE = 20.0
+HEALTH_INTERVAL = 300.0
+RECENT_GAMES = 20
+
+
+class HealthChecker:
+    """Keeps the validity of every game in a library fresh, in the background.
+
+    A daemon thread validates a slice of games at a time and sleeps after
+    each one, so no more than ``rate`` games are checked per second.
+    Games passed to ``prioritize``, such as those on screen, go first,
+    then recently played games, then the rest of the library. Once every
+    game has been checked the next pass starts ``interval`` seconds later.
+    Games that are added or edited are checked again soon.
+
+    The latest report for each game is available from ``status``. When a
+    game's errors change, the report is passed to ``on_result``, on the
+    checker's thread.
+
+    Args:
+        library: The library to check.
+        on_result: Called with the new report of a game whose errors changed.
+        slice_size: Games to check between pauses.
+        rate: Games to check per second at most.
+        interval: Seconds between passes over the whole library.
+        check_config_file: Passed on to ``Game.validate``.
+    """
+
+    def __init__(
+        self,
+        library: GameLibrary,
+        on_result: Callable[[ValidationReport], None] | None = None,
+        slice_size: int = HEALTH_SLICE,
+        rate: float = HEALTH_RATE,
+        interval: float = HEALTH_INTERVAL,
+        check_config_file: bool = False,
+    ) -> None:
+        self.library = library
+        self.on_result = on_result
+        self.slice_size = slice_size
+        self.rate = rate
+        self.interval = interval
+        self.check_config_file = check_config_file
+        self._status: dict[str, ValidationReport] = {}
+        self._queue: OrderedDict[str, None] = OrderedDict()
+        self._recent: deque[str] = deque(maxlen=RECENT_GAMES)
+        self._next_pass = 0.0
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._unsubscribe = library.subscribe(self._on_library_changed)
+
+    def status(self, game_id: str) -> ValidationReport | None:
+        """Get the latest report for a game, or None if it hasn't been checked."""
+        with self._cond:
+            return self._status.get(str(game_id))
+
+    def prioritize(self, game_ids: Iterable[str]) -> None:
+        """Check these games next, in the given order."""
+        with self._cond:
+            for key in reversed([str(game_id) for game_id in game_ids]):
+                self._queue[key] = None
+                self._queue.move_to_end(key, last=False)
+            self._cond.notify()
+
+    def played(self, game_id: str) -> None:
+        """Note that a game was launched, so it is checked early in each pass."""
+        key = str(game_id)
+        with self._cond:
+            if key in self._recent:
+                self._recent.remove(key)
+            self._recent.appendleft(key)
+        self.prioritize([key])
+
+    def _on_library_changed(self, change: LibraryChange) -> None:
+        if change.kind is ChangeKind.REMOVED:
+            with self._cond:
+                for key in change.ids:
+                    self._status.pop(key, None)
+                    self._queue.pop(key, None)
+        else:
+            self.prioritize(change.ids)
+
+    def check_next(self) -> list[ValidationReport]:
+        """Check the next slice of games, starting a new pass if one is due.
+
+        Returns:
+            The reports of the games checked.
+        """
+        # The library is only used outside our lock, as it calls
+        # _on_library_changed while holding its own
+        with self._cond:
+            new_pass = not self._queue and time.monotonic() >= self._next_pass
+        if new_pass:
+            keys = [_id_key(game) for game in self.library.snapshot()]
+        with self._cond:
+            if new_pass:
+                for key in [*self._recent, *keys]:
+                    self._queue.setdefault(key)
+                self._next_pass = time.monotonic() + self.interval
+            count = min(self.slice_size, len(self._queue))
+            keys = [self._queue.popitem(last=False)[0] for _ in range(count)]
+
+        reports = []
+        for key in keys:
+            game = self.library.get(key)
+            if game is None:
+                continue
+            _, errors = game.validate(check_config_file=self.check_config_file)
+            report = ValidationReport(key, game, tuple(errors))
+            current = self.library.get(key)
+            with self._cond:
+                if current is None:
+                    continue  # Removed while it was being checked
+                previous = self._status.get(key)
+                self._status[key] = report
+            reports.append(report)
+            if self.on_result and (previous.errors if previous else ()) != report.errors:
+                self.on_result(report)
+        return reports
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            with self._cond:
+                while not self._queue and not self._stop.is_set():
+                    wait = self._next_pass - time.monotonic()
+                    if wait <= 0:
+                        break
+                    self._cond.wait(wait)
+            if self._stop.is_set():
+                return
+            checked = len(self.check_next())
+            self._stop.wait(max(checked, 1) / self.rate)
+
+    def start(self) -> None:
+        """Start checking on a background thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="health-check", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop checking and following the library.
+
+        Doesn't wait; a slice already being checked finishes on its own.
+        """
+        self._unsubscribe()
+        self._stop.set()
+        with self._cond:
+            self._cond.notify()
@@ -1,16 +1,121 @@
 """Data models for DOSBox Launcher."""
 
 import os
+import sys
+import threading
 import uuid
-from dataclasses import dataclass, field
+from collections.abc import Callable, Container, Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
 from datetime import datetime
+from enum import Enum
+from itertools import islice
+from types import MappingProxyType
 
-from .exceptions import GameNotFoundError
+from .duplicates import hash_cache, resolve_exe_path
+from .exceptions import GameNotFoundError, ValidationError
+from .search import InvertedIndex, SearchSession, TrigramIndex
+from .statcache import stat_cache
+from .validation import VALIDATION_WORKERS, ValidationReport, validate_games
 
 
-@dataclass
+def _decode_id(value):
+    """Parse a serialized game ID; anything but a string or UUID counts as missing."""
+    if isinstance(value, str) and value:
+        return uuid.UUID(value)
+    return value if isinstance(value, uuid.UUID) else ""
+
+
+def _decode_created_at(value):
+    """Parse a serialized creation timestamp."""
+    if isinstance(value, str) and value:
+        return datetime.fromisoformat(value)
+    return value
+
+
+# Fields GameLibrary.update may change; the ID is fixed for a game's lifetime.
+UPDATABLE_FIELDS = ("name", "exe_path", "config_path", "notes", "tags")
+
+# Fields a lazily loaded Game keeps in serialized form until first access,
+# mapped to their position in Game._raw and their decoder.
+_LAZY_FIELDS = {
+    "id": (0, _decode_id),
+    "created_at": (1, _decode_created_at),
+}
+
+# Fields a Game created with Game.from_record reads from its record on
+# first access.
+_RECORD_FIELDS = ("exe_path", "config_path", "created_at", "notes", "tags")
+
+
+# Held while a lazy game stores what it decoded, since games are shared
+# with the threads that check, save and compact the library
+_decode_lock = threading.Lock()
+
+
+def _dir_end(path: str) -> int:
+    """Get the length of a path's directory part, including the last separator."""
+    return max(path.rfind("/"), path.rfind("\\")) + 1
+
+
+class PathTable:
+    """Directories shared by the paths of many games, stored once.
+
+    A serialized library lists each directory once in its path table.
+    Games refer to it by position: ``exe_dir`` is the directory of
+    ``exe_path``, which then holds just the file name, and ``config_dir``
+    replaces ``config_path``. Directories keep their trailing separator,
+    so joining them back gives exactly the original path.
+    """
+
+    def __init__(self, dirs: list[str] | None = None) -> None:
+        self.dirs: list[str] = [sys.intern(d) for d in dirs or ()]
+        self._index = {d: i for i, d in enumerate(self.dirs)}
+
+    def add(self, directory: str) -> int:
+        """Get the position of a directory, adding it if it's new."""
+        index = self._index.get(directory)
+        if index is None:
+            index = self._index[directory] = len(self.dirs)
+            self.dirs.append(sys.intern(directory))
+        return index
+
+    def pack(self, data: dict) -> dict:
+        """Replace the paths of a serialized game with references to the table."""
+        exe_path = data["exe_path"]
+        cut = _dir_end(exe_path)
+        packed = {}
+        for key, value in data.items():
+            if key == "exe_path" and cut:
+                packed["exe_dir"] = self.add(exe_path[:cut])
+                packed["exe_path"] = exe_path[cut:]
+            elif key == "config_path" and value:
+                packed["config_dir"] = self.add(value)
+            else:
+                packed[key] = value
+        return packed
+
+    def expand(self, data: dict) -> tuple[str, str]:
+        """Get the full executable and config paths of a serialized game."""
+        exe_path = data.get("exe_path", "")
+        if "exe_dir" in data:
+            exe_path = self.dirs[data["exe_dir"]] + exe_path
+        if "config_dir" in data:
+            return exe_path, self.dirs[data["config_dir"]]
+        return exe_path, data.get("config_path", "")
+
+
+@dataclass(slots=True)
 class Game:
-    """Represents a DOS game in the library."""
+    """Represents a DOS game in the library.
+
+    Games use slots rather than a per-instance ``__dict__``, since a library
+    can hold many thousands of them. Games loaded with
+    ``from_dict(..., lazy=True)`` keep their ID and creation time as the
+    serialized strings and only parse them when first read. Games created
+    with ``from_record`` go further and read everything but their ID and
+    name from storage when one of those fields is first read.
+    """
 
     name: str
     exe_path: str
@@ -18,13 +123,75 @@ class Game:
     id: uuid.UUID = field(default_factory=uuid.uuid4)
     created_at: datetime = field(default_factory=datetime.now)
     notes: str = ""
+    tags: tuple[str, ...] = ()
+    _raw: tuple | None = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         # Handle deserialization from dict/JSON
-        if isinstance(self.id, str) and self.id:
-            self.id = uuid.UUID(self.id)
-        if isinstance(self.created_at, str) and self.created_at:
-            self.created_at = datetime.fromisoformat(self.created_at)
+        self.id = _decode_id(self.id)
+        self.created_at = _decode_created_at(self.created_at)
+        self.tags = tuple(self.tags)
+
+    def __getattr__(self, name: str):
+        # Only reached for slots that are still unset, i.e. lazy fields
+        lazy = _LAZY_FIELDS.get(name)
+        raw = object.__getattribute__(self, "_raw")
+        if raw is not None and len(raw) > 2 and name in _RECORD_FIELDS:
+            self._load_record(raw)
+            return getattr(self, name)
+        if lazy is None or raw is None or raw[lazy[0]] is None:
+            # Fields are set before _raw lets go of them, so one another
+            # thread decoded or loaded since the lookup failed is there now
+            return object.__getattribute__(self, name)
+
+        index, decode = lazy
+        value = decode(raw[index])
+        with _decode_lock:
+            # Another thread may have decoded the field since
+            try:
+                return object.__getattribute__(self, name)
+            except AttributeError:
+                pass
+            setattr(self, name, value)
+            raw = self._raw
+            if raw is not None:
+                raw = raw[:index] + (None,) + raw[index + 1 :]
+                self._raw = None if all(item is None for item in raw) else raw
+        return value
+
+    def _serialized(self, name: str, encode) -> str:
+        """Get a field in serialized form without decoding a lazy value."""
+        try:
+            value = object.__getattribute__(self, name)
+        except AttributeError:
+            # Other threads may decode or load fields meanwhile, replacing _raw
+            raw = self._raw
+            if raw is not None and len(raw) > 2 and name in _RECORD_FIELDS:
+                self._load_record(raw)
+                return self._serialized(name, encode)
+            serialized = raw[_LAZY_FIELDS[name][0]] if raw is not None else None
+            if isinstance(serialized, str):
+                return serialized
+            # Such as a timestamp YAML parsed itself, or one decoded meanwhile
+            value = getattr(self, name)
+        return encode(value)
+
+    def _load_record(self, raw: tuple) -> None:
+        """Fill in the fields of a game created by ``from_record``.
+
+        Args:
+            raw: The game's ``_raw`` when it was found not to be loaded.
+        """
+        raw_id, _, load = raw
+        data = load(raw_id if raw_id is not None else str(self.id))
+        with _decode_lock:
+            if self._raw is not raw:
+                return  # Loaded by another thread meanwhile
+            self.exe_path = data.get("exe_path", "")
+            self.config_path = sys.intern(data.get("config_path", ""))
+            self.notes = data.get("notes", "")
+            self.tags = tuple(data.get("tags") or ())
+            self._raw = (raw_id, data.get("created_at", ""))
 
     def validate(self, check_config_file: bool = True) -> tuple[bool, list[str]]:
         """Validate that game paths exist and are accessible.
@@ -40,15 +207,15 @@ class Game:
         if not self.name:
             errors.append("Game name cannot be empty")
 
-        if not self.exe_path or not os.path.exists(self.exe_path):
+        if not self.exe_path or not stat_cache.exists(self.exe_path):
             errors.append(f"Game executable not found: {self.exe_path}")
 
-        if not self.config_path or not os.path.isdir(self.config_path):
+        if not self.config_path or not stat_cache.isdir(self.config_path):
             errors.append(f"Config directory not found: {self.config_path}")
 
         if check_config_file:
             config_file = self.get_config_file_path()
-            if not os.path.exists(config_file):
+            if not stat_cache.exists(config_file):
                 errors.append(f"Config file not found: {config_file}")
 
         return len(errors) == 0, errors
@@ -57,83 +224,739 @@ class Game:
         """Get the full path to the game's DOSBox config file."""
         return os.path.join(self.config_path, f"{self.id}.conf")
 
-    def to_dict(self) -> dict:
-        """Convert to dictionary for serialization."""
-        return {
-            "id": str(self.id),
+    def to_dict(self, paths: PathTable | None = None) -> dict:
+        """Convert to dictionary for serialization.
+
+        Args:
+            paths: If given, store the game's directories in this table
+                and refer to them by position (see ``PathTable``).
+        """
+        data = {
+            "id": self._serialized("id", str),
             "name": self.name,
             "exe_path": self.exe_path,
             "config_path": self.config_path,
-            "created_at": self.created_at.isoformat(),
+            "created_at": self._serialized("created_at", datetime.isoformat),
             "notes": self.notes,
+            "tags": list(self.tags),
         }
+        return data if paths is None else paths.pack(data)
+
+    @classmethod
+    def from_record(cls, game_id: str, name: str, load: Callable[[str], dict]) -> "Game":
+        """Create a game whose other fields are read when first needed.
+
+        Args:
+            game_id: Serialized ID of the game.
+            name: Name of the game.
+            load: Called with the ID to get the rest of the serialized game,
+                as produced by ``to_dict``.
+        """
+        game = object.__new__(cls)
+        game.name = name
+        game._raw = (game_id, None, load)
+        return game
 
     @classmethod
-    def from_dict(cls, data: dict) -> "Game":
-        """Create Game from dictionary."""
+    def from_dict(cls, data: dict, lazy: bool = False, paths: PathTable | None = None) -> "Game":
+        """Create Game from dictionary.
+
+        The config directory is interned, since most games share one.
+
+        Args:
+            data: Serialized game, as produced by ``to_dict``.
+            lazy: If True, defer parsing the ID and creation time until
+                they are first accessed.
+            paths: The table the game's directories were stored in, if any.
+        """
+        if paths is None:
+            exe_path = data.get("exe_path", "")
+            config_path = data.get("config_path", "")
+        else:
+            exe_path, config_path = paths.expand(data)
+        if lazy:
+            game = object.__new__(cls)
+            game.name = data.get("name", "")
+            game.exe_path = exe_path
+            game.config_path = sys.intern(config_path)
+            game.notes = data.get("notes", "")
+            game.tags = tuple(data.get("tags") or ())
+            # None marks a decoded field, so an empty "id:" is kept as ""
+            raw_id = data.get("id")
+            created_at = data.get("created_at")
+            game._raw = (
+                raw_id if isinstance(raw_id, str) else "",
+                created_at if created_at is not None else "",
+            )
+            return game
+
         return cls(
             id=data.get("id", ""),
             name=data.get("name", ""),
-            exe_path=data.get("exe_path", ""),
-            config_path=data.get("config_path", ""),
+            exe_path=exe_path,
+            config_path=sys.intern(config_path),
             created_at=data.get("created_at", ""),
             notes=data.get("notes", ""),
+            tags=tuple(data.get("tags") or ()),
         )
 
 
+def _differs(current: Game, game: Game) -> bool:
+    """Check whether a game read again from storage differs from ``current``.
+
+    Games that haven't read their record yet are compared by name only, as
+    reading it costs a file per game and they read it fresh when needed.
+    Games that have are compared in full, reading the new record.
+    """
+    if current is game:
+        return False
+    if _record_pending(current):
+        return current.name != game.name
+    return current.to_dict() != game.to_dict()
+
+
+def _record_pending(game: Game) -> bool:
+    """Check whether a game created by ``from_record`` hasn't loaded it yet."""
+    raw = game._raw
+    return raw is not None and len(raw) > 2
+
+
+def _id_key(game: Game) -> str:
+    """Get the library key for a game without decoding a lazy ID."""
+    try:
+        game_id = object.__getattribute__(game, "id")
+    except AttributeError:
+        raw = game._raw
+        raw_id = raw[0] if raw is not None else None
+        if raw_id is not None and len(raw_id) == 36 and raw_id == raw_id.lower():
+            return raw_id
+        # Decoded by another thread meanwhile, or needs decoding
+        game_id = game.id
+    return str(game_id) if game_id else ""
+
+
+class ChangeKind(Enum):
+    """Kinds of change reported by GameLibrary."""
+
+    ADDED = "added"
+    REMOVED = "removed"
+    UPDATED = "updated"
+
+
+@dataclass(frozen=True)
+class LibraryChange:
+    """A change to one or more games in a library, identified by ID."""
+
+    kind: ChangeKind
+    ids: tuple[str, ...]
+
+
+def _coalesce(previous: ChangeKind | None, current: ChangeKind) -> ChangeKind | None:
+    """Combine two changes to the same game; None means they cancel out."""
+    if previous is None:
+        return current
+    if previous is ChangeKind.ADDED:
+        return None if current is ChangeKind.REMOVED else ChangeKind.ADDED
+    if previous is ChangeKind.REMOVED:
+        return ChangeKind.UPDATED if current is ChangeKind.ADDED else ChangeKind.REMOVED
+    return current
+
+
+def _discard(index: dict[str, list[str]], value: str, key: str) -> None:
+    """Remove a key from a multi-valued index entry."""
+    keys = index.get(value)
+    if keys is not None and key in keys:
+        keys.remove(key)
+        if not keys:
+            del index[value]
+
+
+class LibraryView(Sequence):
+    """Read-only, ordered view of the games in a library.
+
+    A view shares the library's cached ordering instead of copying it, and
+    is unaffected by later changes to the library. That ordering is copied
+    from the library on the first view after each change, which costs time
+    in proportion to the size of the library.
+    """
+
+    __slots__ = ("_games",)
+
+    def __init__(self, games: tuple[Game, ...]) -> None:
+        self._games = games
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return LibraryView(self._games[index])
+        return self._games[index]
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    def __iter__(self) -> Iterator[Game]:
+        return iter(self._games)
+
+    def __repr__(self) -> str:
+        return f"LibraryView({len(self._games)} games)"
+
+
+class LibrarySnapshot(LibraryView):
+    """Immutable state of a library at one version.
+
+    Games are never changed in place by the library, so a snapshot can be
+    read from any thread without locking while the library moves on.
+    Compare ``version`` with the library's to tell whether anything built
+    from the snapshot is stale.
+    """
+
+    __slots__ = ("_by_id", "version")
+
+    def __init__(self, games: dict[str, Game], version: int) -> None:
+        super().__init__(tuple(games.values()))
+        self._by_id = MappingProxyType(dict(games))
+        self.version = version
+
+    def get(self, game_id: uuid.UUID | str) -> Game | None:
+        """Get a game by ID."""
+        return self._by_id.get(str(game_id))
+
+    def __contains__(self, game) -> bool:
+        if isinstance(game, Game):
+            return self._by_id.get(_id_key(game)) is game
+        return str(game) in self._by_id
+
+    def __repr__(self) -> str:
+        return f"LibrarySnapshot(version {self.version}, {len(self._games)} games)"
+
+
 class GameLibrary:
-    """Manages the collection of games."""
+    """Manages the collection of games.
+
+    Games are kept in insertion order in a dict keyed by the string form of
+    their ID, so lookups by ID don't scan the library. The name, search and
+    text indexes are built on first use and kept up to date from then on,
+    which keeps loading a large library cheap. Edit games through
+    ``update`` so the indexes follow the change. Names are not required to
+    be unique; when several games share a name, ``get_by_name`` returns the
+    one added first and ``find_by_name`` returns all of them.
+
+    Changes are made under a lock and bump ``version``. ``update`` replaces
+    a game with an edited copy rather than changing it in place, so other
+    threads can read a ``snapshot`` without taking the lock.
+    """
 
     def __init__(self, games: list[Game] | None = None):
-        self._games: list[Game] = games or []
+        self._games: dict[str, Game] = {}
+        self._by_name: dict[str, list[Game]] | None = None
+        self._search_index = TrigramIndex()
+        self._search_indexed = False
+        self._text_index: InvertedIndex | None = None
+        self._by_exe: dict[str, list[str]] | None = None
+        self._by_size: dict[int, list[str]] | None = None
+        self._exe_sizes: dict[str, int] = {}
+        self._snapshot: LibrarySnapshot | None = None
+        self._lock = threading.RLock()
+        self.version = 0
+        self._subscribers: list[Callable[[LibraryChange], None]] = []
+        self._batch_depth = 0
+        self._pending: dict[str, ChangeKind] = {}
+        for game in games or []:
+            self.add(game)
 
     def add(self, game: Game) -> None:
-        """Add a game to the library."""
-        self._games.append(game)
+        """Add a game to the library.
+
+        Raises:
+            ValidationError: If a game with the same ID is already present.
+        """
+        key = _id_key(game)
+        with self._lock:
+            if key in self._games:
+                raise ValidationError(f"Game with ID {key} already in library")
+            self._games[key] = game
+            self._changed()
+            if self._by_name is not None:
+                self._by_name.setdefault(game.name.casefold(), []).append(game)
+            if self._search_indexed:
+                self._search_index.add(key, game.name)
+            if self._text_index is not None:
+                self._text_index.add(key, game.name, game.tags, game.notes)
+            if self._by_exe is not None or self._by_size is not None:
+                self._index_exe(key, game.exe_path)
+            self._notify(ChangeKind.ADDED, key)
 
-    def remove(self, game_id: uuid.UUID) -> Game:
+    def remove(self, game_id: uuid.UUID | str) -> Game:
         """Remove a game by ID."""
-        for i, game in enumerate(self._games):
-            if game.id == game_id:
-                return self._games.pop(i)
-        raise GameNotFoundError(f"Game with ID {game_id} not found")
+        key = str(game_id)
+        with self._lock:
+            game = self._games.pop(key, None)
+            if game is None:
+                raise GameNotFoundError(f"Game with ID {game_id} not found")
+            self._changed()
+            if self._by_name is not None:
+                self._unindex_name(game, game.name)
+            self._search_index.remove(key)
+            if self._text_index is not None:
+                self._text_index.remove(key)
+            if self._by_exe is not None or self._by_size is not None:
+                self._unindex_exe(key, game.exe_path)
+            self._notify(ChangeKind.REMOVED, key)
+        return game
+
+    def update(self, game_id: uuid.UUID | str, **changes) -> Game:
+        """Replace a game with an edited copy and update the indexes to match.
+
+        The original game object is left untouched, so snapshots taken
+        earlier keep seeing the old values.
 
-    def get(self, game_id: uuid.UUID) -> Game | None:
+        Args:
+            game_id: ID of the game to change.
+            **changes: New values, keyed by field name (see UPDATABLE_FIELDS).
+
+        Returns:
+            The new game object.
+
+        Raises:
+            GameNotFoundError: If no game has the given ID.
+            ValidationError: If a field cannot be updated.
+        """
+        key = str(game_id)
+        for name in changes:
+            if name not in UPDATABLE_FIELDS:
+                raise ValidationError(f"Cannot update game field: {name}")
+        if "tags" in changes:
+            changes["tags"] = tuple(changes["tags"])
+
+        with self._lock:
+            old = self._games.get(key)
+            if old is None:
+                raise GameNotFoundError(f"Game with ID {game_id} not found")
+            game = replace(old, **changes)
+            self._replace(key, old, game)
+        return game
+
+    def sync(self, games: Iterable[Game], keep: Container[str] = ()) -> bool:
+        """Make the library hold ``games``, touching only the games that differ.
+
+        Games are matched by ID: new ones are added, missing ones removed,
+        and changed ones replaced, all in one batch, so subscribers hear
+        about just those. This is how changes another process saved are
+        brought into a library that is already on screen.
+
+        Args:
+            games: The games the library should hold.
+            keep: IDs of games to leave as they are, such as ones with
+                unsaved changes.
+
+        Returns:
+            Whether anything changed.
+        """
+        with self._lock, self.batch():
+            version = self.version
+            seen = set()
+            for game in games:
+                key = _id_key(game)
+                seen.add(key)
+                if key in keep:
+                    continue
+                current = self._games.get(key)
+                if current is None:
+                    self.add(game)
+                elif _differs(current, game):
+                    self._replace(key, current, game)
+            for key in [key for key in self._games if key not in seen and key not in keep]:
+                self.remove(key)
+            return self.version != version
+
+    def _replace(self, key: str, old: Game, game: Game) -> None:
+        """Put ``game`` in place of ``old`` and update the indexes to match."""
+        self._games[key] = game
+        self._changed()
+
+        if self._by_name is not None:
+            self._reindex_name(old, game)
+        if self._search_indexed and game.name != old.name:
+            self._search_index.add(key, game.name)
+        if self._text_index is not None:
+            self._text_index.add(key, game.name, game.tags, game.notes)
+        if self._by_exe is not None or self._by_size is not None:
+            if game.exe_path != old.exe_path:
+                self._unindex_exe(key, old.exe_path)
+                self._index_exe(key, game.exe_path)
+        self._notify(ChangeKind.UPDATED, key)
+
+    def subscribe(self, callback: Callable[[LibraryChange], None]) -> Callable[[], None]:
+        """Call ``callback`` with every change to the library.
+
+        Returns:
+            A function that cancels the subscription.
+        """
+        subscribers = self._subscribers
+        subscribers.append(callback)
+
+        # Refers to the list rather than the library, so holding on to it
+        # doesn't keep the library alive
+        def unsubscribe() -> None:
+            if callback in subscribers:
+                subscribers.remove(callback)
+
+        return unsubscribe
+
+    @contextmanager
+    def batch(self):
+        """Group changes into one notification per kind.
+
+        Changes made inside the block are coalesced per game, so a game
+        added and then removed produces no notification at all. Batches may
+        be nested; subscribers hear about the changes when the outermost
+        one ends.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._flush_changes()
+
+    def _changed(self) -> None:
+        """Start a new version, retiring the current snapshot."""
+        self.version += 1
+        self._snapshot = None
+
+    def _notify(self, kind: ChangeKind, key: str) -> None:
+        """Record a change and, outside a batch, tell subscribers now."""
+        if not self._subscribers and not self._batch_depth:
+            return
+        combined = _coalesce(self._pending.pop(key, None), kind)
+        if combined is not None:
+            self._pending[key] = combined
+        if not self._batch_depth:
+            self._flush_changes()
+
+    def _flush_changes(self) -> None:
+        """Deliver pending changes to subscribers, grouped by kind."""
+        pending, self._pending = self._pending, {}
+        for kind in ChangeKind:
+            ids = tuple(key for key, change in pending.items() if change is kind)
+            if ids:
+                change = LibraryChange(kind, ids)
+                for callback in list(self._subscribers):
+                    callback(change)
+
+    def _name_index(self) -> dict[str, list[Game]]:
+        """Get the casefolded name index, building it on first use."""
+        with self._lock:
+            if self._by_name is None:
+                by_name: dict[str, list[Game]] = {}
+                for game in self._games.values():
+                    by_name.setdefault(game.name.casefold(), []).append(game)
+                self._by_name = by_name
+        return self._by_name
+
+    def _indexed_search(self) -> TrigramIndex:
+        """Get the search index, filling it on first use."""
+        with self._lock:
+            if not self._search_indexed:
+                for key, game in self._games.items():
+                    self._search_index.add(key, game.name)
+                self._search_indexed = True
+        return self._search_index
+
+    def _unindex_name(self, game: Game, name: str) -> None:
+        """Drop a game from the name index entry for a name."""
+        key = name.casefold()
+        same_name = self._by_name.get(key, [])
+        for i, other in enumerate(same_name):
+            if other is game:
+                del same_name[i]
+                break
+        if not same_name:
+            self._by_name.pop(key, None)
+
+    def _reindex_name(self, old: Game, game: Game) -> None:
+        """Swap an edited copy of a game into the name index."""
+        same_name = self._by_name.get(old.name.casefold(), [])
+        if old.name.casefold() == game.name.casefold():
+            for i, other in enumerate(same_name):
+                if other is old:
+                    same_name[i] = game
+                    return
+        self._unindex_name(old, old.name)
+        self._by_name.setdefault(game.name.casefold(), []).append(game)
+
+    def _indexed_text(self) -> InvertedIndex:
+        """Get the tag and notes index, building it on first use."""
+        with self._lock:
+            if self._text_index is None:
+                index = InvertedIndex(self._field_text)
+                for key, game in self._games.items():
+                    index.add(key, game.name, game.tags, game.notes)
+                self._text_index = index
+        return self._text_index
+
+    def _exe_index(self) -> dict[str, list[str]]:
+        """Get the index of games by resolved executable path."""
+        with self._lock:
+            if self._by_exe is None:
+                self._by_exe = {}
+                for key, game in self._games.items():
+                    if game.exe_path:
+                        self._by_exe.setdefault(resolve_exe_path(game.exe_path), []).append(key)
+        return self._by_exe
+
+    def _size_index(self) -> dict[int, list[str]]:
+        """Get the index of games by executable size.
+
+        Only executables of the same size can have the same contents, so
+        content checks hash just those rather than the whole library.
+        """
+        with self._lock:
+            if self._by_size is None:
+                self._by_size = {}
+                for key, game in self._games.items():
+                    self._index_size(key, game.exe_path)
+        return self._by_size
+
+    def _index_size(self, key: str, exe_path: str) -> None:
+        """Add a game's executable to the size index."""
+        result = stat_cache.stat(exe_path) if exe_path else None
+        if result is not None:
+            self._exe_sizes[key] = result.st_size
+            self._by_size.setdefault(result.st_size, []).append(key)
+
+    def _exe_digest(self, key: str) -> str | None:
+        """Get the content hash of a game's executable, if it can be read."""
+        game = self._games.get(key)
+        return hash_cache.digest(game.exe_path) if game and game.exe_path else None
+
+    def _index_exe(self, key: str, exe_path: str) -> None:
+        """Add a game to whichever executable indexes have been built."""
+        if not exe_path:
+            return
+        if self._by_exe is not None:
+            self._by_exe.setdefault(resolve_exe_path(exe_path), []).append(key)
+        if self._by_size is not None:
+            self._index_size(key, exe_path)
+
+    def _unindex_exe(self, key: str, exe_path: str) -> None:
+        """Drop a game from the executable indexes."""
+        if self._by_exe is not None and exe_path:
+            _discard(self._by_exe, resolve_exe_path(exe_path), key)
+        size = self._exe_sizes.pop(key, None)
+        if size is not None:
+            _discard(self._by_size, size, key)
+
+    def _field_text(self, key: str, field_name: str) -> str:
+        """Get the text of a game's name or notes for phrase matching."""
+        return getattr(self._games[key], field_name)
+
+    def get(self, game_id: uuid.UUID | str) -> Game | None:
         """Get a game by ID."""
-        for game in self._games:
-            if game.id == game_id:
-                return game
-        return None
+        return self._games.get(str(game_id))
 
     def get_by_name(self, name: str) -> Game | None:
-        """Get a game by name (case-insensitive)."""
-        name_lower = name.lower()
-        for game in self._games:
-            if game.name.lower() == name_lower:
-                return game
-        return None
-
-    def search(self, query: str) -> list[Game]:
-        """Search games by name (case-insensitive)."""
-        query_lower = query.lower()
-        return [g for g in self._games if query_lower in g.name.lower()]
+        """Get a game by name (case-insensitive).
+
+        If several games share the name, the earliest added one is returned.
+        """
+        same_name = self._name_index().get(name.casefold())
+        return same_name[0] if same_name else None
+
+    def find_by_name(self, name: str) -> list[Game]:
+        """Get every game with the given name (case-insensitive)."""
+        return list(self._name_index().get(name.casefold(), []))
+
+    def search(self, query: str, limit: int | None = None, fuzzy: bool = True) -> list[Game]:
+        """Search games by name (case-insensitive), best matches first.
+
+        Args:
+            query: Text to look for in game names.
+            limit: Maximum number of results, or None for all of them.
+            fuzzy: If True, also return close matches for misspelled queries.
+        """
+        keys = self._indexed_search().search(query, limit=limit, fuzzy=fuzzy)
+        return [self._games[key] for key in keys]
+
+    def find_duplicate(self, exe_path: str, check_content: bool = False) -> Game | None:
+        """Find a game already in the library for the same executable.
+
+        Args:
+            exe_path: Executable of the game about to be added.
+            check_content: If True, also match executables at other paths
+                whose contents are identical.
+
+        Returns:
+            The earliest added matching game, or None.
+        """
+        if not exe_path:
+            return None
+        keys = self._exe_index().get(resolve_exe_path(exe_path))
+        if not keys and check_content:
+            result = stat_cache.stat(exe_path)
+            same_size = self._size_index().get(result.st_size) if result else None
+            digest = hash_cache.digest(exe_path) if same_size else None
+            if digest is not None:
+                keys = [key for key in list(same_size) if self._exe_digest(key) == digest]
+        return self._games[keys[0]] if keys else None
+
+    def validate_all(
+        self,
+        check_config_file: bool = True,
+        max_workers: int = VALIDATION_WORKERS,
+        cancel: threading.Event | None = None,
+    ) -> Iterator[ValidationReport]:
+        """Validate every game on a pool of threads.
+
+        Reports are yielded as games finish, not in library order. The
+        games are those in the library when iteration starts.
+
+        Args:
+            check_config_file: Passed on to ``Game.validate``.
+            max_workers: Number of threads to validate on.
+            cancel: Set, from any thread, to stop validating early.
+        """
+        return validate_games(self.snapshot(), check_config_file, max_workers, cancel, _id_key)
+
+    def find_duplicates(self, check_content: bool = False) -> list[list[Game]]:
+        """Report groups of games that share an executable.
+
+        Args:
+            check_content: If True, also group executables at different
+                paths whose contents are identical.
+
+        Returns:
+            Groups of two or more games, each in insertion order.
+        """
+        groups = [set(keys) for keys in self._exe_index().values() if len(keys) > 1]
+        if check_content:
+            for keys in list(self._size_index().values()):
+                by_digest: dict[str, set[str]] = {}
+                for key in list(keys) if len(keys) > 1 else ():
+                    digest = self._exe_digest(key)
+                    if digest is not None:
+                        by_digest.setdefault(digest, set()).add(key)
+                groups.extend(group for group in by_digest.values() if len(group) > 1)
+
+        # Merge groups that share a game, e.g. a path match and a hash match
+        merged: list[set[str]] = []
+        for group in groups:
+            for other in [m for m in merged if m & group]:
+                merged.remove(other)
+                group |= other
+            merged.append(group)
+
+        order = {key: i for i, key in enumerate(self._games)}
+        return [
+            [self._games[key] for key in sorted(group, key=order.__getitem__)] for group in merged
+        ]
+
+    def query(self, expression: str) -> list[Game]:
+        """Find games with a boolean query over names, tags and notes.
+
+        For example ``tag:rpg notes:"mt-32"`` finds RPGs whose notes mention
+        the MT-32, and ``tag:shooter OR tag:platformer -tag:demo`` finds
+        shooters and platformers that aren't demos.
+        """
+        keys = self._indexed_text().query(expression)
+        return [self._games[key] for key in keys]
+
+    def search_session(self, limit: int | None = None, fuzzy: bool = True) -> SearchSession:
+        """Start a search-as-you-type session over this library.
+
+        The session narrows from the results of earlier queries while the
+        user types, and returns the same games as ``search``.
+        """
+        return SearchSession(
+            self._indexed_search(), self._games.__getitem__, limit=limit, fuzzy=fuzzy
+        )
 
     def all(self) -> list[Game]:
-        """Get all games."""
-        return self._games.copy()
+        """Get all games as a new list.
+
+        Prefer ``view``, ``page`` or ``filter`` when the caller only reads.
+        """
+        return list(self._games.values())
+
+    def snapshot(self) -> LibrarySnapshot:
+        """Get an immutable snapshot of the library at its current version.
+
+        The snapshot is built once per version and shared by every caller
+        until the next change, and is safe to read from any thread. Building
+        it copies the whole library, so callers that run after every change
+        and only need a few games should use ``page`` or ``get`` instead.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                snapshot = self._snapshot
+                if snapshot is None:
+                    snapshot = LibrarySnapshot(self._games, self.version)
+                    self._snapshot = snapshot
+        return snapshot
+
+    def view(self) -> LibraryView:
+        """Get a read-only view of all games, in insertion order.
+
+        This is the current ``snapshot``, so it is unaffected by later
+        changes to the library.
+        """
+        return self.snapshot()
+
+    def page(self, offset: int, limit: int) -> list[Game]:
+        """Get up to ``limit`` games starting at position ``offset``.
+
+        Reads the current snapshot if there is one, and otherwise only the
+        games up to the end of the page, without building a snapshot.
+        """
+        if offset < 0 or limit < 0:
+            raise ValueError("offset and limit must not be negative")
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return list(snapshot._games[offset : offset + limit])
+        with self._lock:
+            return list(islice(self._games.values(), offset, offset + limit))
+
+    def filter(self, predicate: Callable[[Game], bool]) -> Iterator[Game]:
+        """Lazily iterate over the games matching a predicate."""
+        return (game for game in self.view() if predicate(game))
 
     def __len__(self) -> int:
         return len(self._games)
 
     def __iter__(self):
-        return iter(self._games)
+        return iter(self._games.values())
 
     def to_dict(self) -> dict:
-        """Serialize library to dictionary."""
-        return {"games": [g.to_dict() for g in self._games]}
+        """Serialize library to dictionary.
+
+        Directories are listed once under "paths" and the games refer to
+        them, which keeps large libraries small on disk.
+        """
+        paths = PathTable()
+        games = [g.to_dict(paths) for g in self.view()]
+        return {"paths": paths.dirs, "games": games}
 
     @classmethod
-    def from_dict(cls, data: dict) -> "GameLibrary":
-        """Create library from dictionary."""
-        games = [Game.from_dict(g) for g in data.get("games", [])]
-        return cls(games)
+    def from_dict(cls, data: dict, lazy: bool = False) -> "GameLibrary":
+        """Create library from dictionary.
+
+        Games without an ID, or with one an earlier game already has,
+        are given a new ID instead of failing the whole load.
+
+        Args:
+            data: Serialized library, as produced by ``to_dict``.
+            lazy: If True, games defer parsing their IDs and timestamps
+                until first accessed.
+        """
+        paths = PathTable(data.get("paths"))
+        library = cls()
+        for record in data.get("games", []):
+            game = Game.from_dict(record, lazy=lazy, paths=paths)
+            key = _id_key(game)
+            if not key or key in library._games:
+                # Hand-edited files may leave out IDs or repeat them; rather
+                # than refuse the whole file, such games get a new one
+                game.id = uuid.uuid4()
+            library.add(game)
+        return library
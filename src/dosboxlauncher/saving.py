@@ -0,0 +1,115 @@
+"""Background saving of the application configuration."""
+
+import threading
+from collections.abc import Callable
+from contextlib import contextmanager
+
+from .config import AppConfig, get_storage, save_app_config
+from .exceptions import ConfigError
+from .models import LibraryChange
+
+SAVE_DELAY = 0.5
+
+
+class SaveManager:
+    """Saves a config shortly after it changes, off the calling thread.
+
+    Every change to the config's library schedules a save ``delay``
+    seconds later, and each further change pushes it back, so a burst of
+    edits is written once. Call ``request`` after changing a setting, and
+    ``close`` when the application exits to write anything still pending.
+
+    Args:
+        config: The config to save.
+        delay: Seconds to wait for more changes before saving.
+        on_error: Called with the error when a background save fails. It
+            runs on the saving thread.
+    """
+
+    def __init__(
+        self,
+        config: AppConfig,
+        delay: float = SAVE_DELAY,
+        on_error: Callable[[ConfigError], None] | None = None,
+    ) -> None:
+        self.config = config
+        self.delay = delay
+        self.on_error = on_error
+        self._timer: threading.Timer | None = None
+        self._dirty = False
+        self._paused = False
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._unsubscribe = config.games.subscribe(self._on_library_changed)
+
+    def _on_library_changed(self, change: LibraryChange) -> None:
+        if not self._paused:
+            self.request()
+
+    @contextmanager
+    def paused(self):
+        """Don't save for library changes made inside the block.
+
+        For changes read from disk, which are already saved.
+        """
+        self._paused = True
+        try:
+            yield
+        finally:
+            self._paused = False
+
+    def request(self) -> None:
+        """Save the config after ``delay`` seconds without further requests."""
+        with self._lock:
+            self._dirty = True
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.delay, self._save_in_background)
+            self._timer.daemon = True
+            self._timer.start()
+
+    @property
+    def pending(self) -> bool:
+        """Whether there are changes that haven't been saved yet."""
+        return self._dirty
+
+    def _save_in_background(self) -> None:
+        try:
+            self._save()
+        except ConfigError as e:
+            if self.on_error:
+                self.on_error(e)
+
+    def _save(self) -> None:
+        """Save now if anything changed since the last save."""
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                self._dirty = False
+            try:
+                save_app_config(self.config)
+            except Exception as e:
+                with self._lock:
+                    self._dirty = True
+                if isinstance(e, ConfigError):
+                    raise
+                raise ConfigError(f"Failed to save config: {e}") from e
+
+    def flush(self) -> None:
+        """Save pending changes now and wait for the write to finish.
+
+        Raises:
+            ConfigError: If saving fails.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        self._save()
+        get_storage(self.config.storage).flush()
+
+    def close(self) -> None:
+        """Stop following the config, saving anything still pending."""
+        self._unsubscribe()
+        self.flush()
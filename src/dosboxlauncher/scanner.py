@@ -0,0 +1,259 @@
+"""Finding DOS games on disk.
+
+A scan walks one or more root directories on a pool of threads, one
+directory listing per task, and looks for DOS programs: ``.exe`` files
+with an MZ header that isn't the stub of a Windows program, ``.com``
+files small enough to be real COM programs, and batch files. Each
+directory holding programs becomes one proposed game, launched through
+its best ranked program; setup and installer programs rank last.
+"""
+
+import os
+import re
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+
+from .models import Game, GameLibrary
+from .validation import VALIDATION_WORKERS
+
+SCAN_WORKERS = VALIDATION_WORKERS
+SCAN_MAX_DEPTH = 8
+# Preference between program types, best first
+DOS_EXTENSIONS = {".exe": 3, ".com": 2, ".bat": 1}
+MZ_SIGNATURES = (b"MZ", b"ZM")
+# Largest possible COM program: a 64 KiB segment less the PSP
+MAX_COM_SIZE = 0xFF00
+
+# New-style executables behind an MZ stub that DOS can't run. LE and LX
+# are left out on purpose, as DOS extenders such as DOS/4GW use them.
+_WINDOWS_SIGNATURES = (b"PE\0\0", b"NE")
+# Whole names only, with an optional number, so SETTLERS or SOUNDFX still
+# count as games
+_HELPER_NAMES = re.compile(
+    r"(?:setup|instal|install|uninst|uninstal|uninstall|config|setsound|sndsetup|sound|"
+    r"soundset|setblast|patch|update|readme|help|regist|register|order|catalog|ipxsetup)\d*"
+)
+_LAUNCHER_NAMES = frozenset({"go", "start", "play", "run", "game"})
+
+
+@dataclass(frozen=True, slots=True)
+class Candidate:
+    """A DOS program found by a scan, with how likely it is to start the game."""
+
+    path: str
+    score: int
+
+
+@dataclass(frozen=True, slots=True)
+class Proposal:
+    """A game suggested by a scan.
+
+    Attributes:
+        name: Suggested name, from the game's directory.
+        directory: Directory the game's programs are in.
+        exe_path: The program most likely to start the game.
+        alternatives: The directory's other programs, best first.
+    """
+
+    name: str
+    directory: str
+    exe_path: str
+    alternatives: tuple[str, ...] = ()
+
+    def to_game(self, config_path: str) -> Game:
+        """Create the proposed game, with its DOSBox config in ``config_path``."""
+        return Game(name=self.name, exe_path=self.exe_path, config_path=config_path)
+
+
+@dataclass
+class ScanProgress:
+    """How far a scan has got.
+
+    ``known`` counts games found that were already in the library, and
+    ``errors`` directories that couldn't be read.
+    """
+
+    directories: int = 0
+    files: int = 0
+    found: int = 0
+    known: int = 0
+    errors: int = 0
+
+
+@dataclass(slots=True)
+class _Listing:
+    directory: str
+    candidates: list[Candidate]
+    subdirs: list[str]
+    files: int = 0
+    failed: bool = False
+
+
+def is_dos_program(path: str, size: int | None = None) -> bool:
+    """Tell whether a file looks like a program DOS can run.
+
+    Args:
+        path: The file to check.
+        size: The file's size, if already known.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".bat":
+        return True
+    if size is None:
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return False
+    if ext == ".com":
+        return 0 < size <= MAX_COM_SIZE
+    if ext != ".exe":
+        return False
+
+    try:
+        with open(path, "rb") as f:
+            header = f.read(64)
+            if header[:2] not in MZ_SIGNATURES:
+                return False
+            # Only new-style executables move the relocation table past
+            # the old header to make room for a pointer to the new one
+            if len(header) < 64 or int.from_bytes(header[0x18:0x1A], "little") < 0x40:
+                return True
+            offset = int.from_bytes(header[0x3C:0x40], "little")
+            if not 64 <= offset < size:
+                return True
+            f.seek(offset)
+            signature = f.read(4)
+    except OSError:
+        return False
+    return not signature.startswith(_WINDOWS_SIGNATURES)
+
+
+def _normalize(name: str) -> str:
+    return re.sub(r"[^a-z0-9]", "", name.lower())
+
+
+def rank(path: str, size: int = 0) -> int:
+    """Score a program by how likely it is to start the game in its directory.
+
+    Executables beat COM programs, which beat batch files. A name that
+    matches the directory's, or a common launcher name, scores higher;
+    setup, installer and other helper programs score below zero.
+    """
+    stem, ext = os.path.splitext(os.path.basename(path))
+    stem = _normalize(stem)
+    directory = _normalize(os.path.basename(os.path.dirname(path)))
+
+    score = DOS_EXTENSIONS.get(ext.lower(), 0) * 10
+    if stem and stem == directory:
+        score += 30
+    elif stem and directory and (directory.startswith(stem) or stem.startswith(directory)):
+        score += 15
+    if stem in _LAUNCHER_NAMES:
+        score += 5
+    if _HELPER_NAMES.fullmatch(stem):
+        score -= 100
+    # Main programs tend to be the bigger ones
+    return score + min(size // 100_000, 10)
+
+
+def _scan_directory(directory: str) -> _Listing:
+    """List one directory: its DOS programs, best first, and its subdirectories."""
+    listing = _Listing(directory, [], [])
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        listing.subdirs.append(entry.path)
+                        continue
+                    if not entry.is_file():
+                        continue
+                    listing.files += 1
+                    if os.path.splitext(entry.name)[1].lower() not in DOS_EXTENSIONS:
+                        continue
+                    size = entry.stat().st_size
+                except OSError:
+                    continue
+                if is_dos_program(entry.path, size):
+                    listing.candidates.append(Candidate(entry.path, rank(entry.path, size)))
+    except OSError:
+        listing.failed = True
+    listing.candidates.sort(key=lambda c: (-c.score, c.path))
+    listing.subdirs.sort()
+    return listing
+
+
+def _propose(listing: _Listing) -> Proposal | None:
+    """Turn a directory's programs into a game, unless they are all helpers."""
+    if not listing.candidates or listing.candidates[0].score < 0:
+        return None
+    name = os.path.basename(os.path.normpath(listing.directory)).replace("_", " ")
+    best, *others = listing.candidates
+    return Proposal(name, listing.directory, best.path, tuple(c.path for c in others))
+
+
+def scan_games(
+    roots: Iterable[str | os.PathLike],
+    library: GameLibrary | None = None,
+    max_workers: int = SCAN_WORKERS,
+    max_depth: int = SCAN_MAX_DEPTH,
+    cancel: threading.Event | None = None,
+    progress: Callable[[ScanProgress], None] | None = None,
+) -> Iterator[Proposal]:
+    """Walk directories on a pool of threads, yielding games as they are found.
+
+    Directories are listed as soon as their parent has been, so games
+    are yielded while the walk goes on, in no particular order. The
+    subdirectories of a game's directory aren't walked, except under the
+    roots themselves, so a menu program at the top of a collection
+    doesn't hide the games below it. Symlinked directories aren't
+    followed. Setting ``cancel``, or closing the iterator, stops the scan.
+
+    Args:
+        roots: Directories to scan.
+        library: If given, games whose program is already in it are
+            counted in ``ScanProgress.known`` instead of being yielded.
+        max_workers: Number of threads to list directories on.
+        max_depth: How many levels below the roots to walk.
+        cancel: Set to stop scanning early.
+        progress: Called with the running totals after each directory.
+    """
+    status = ScanProgress()
+    pending: dict[Future, int] = {}
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scan")
+
+    def cancelled() -> bool:
+        return cancel is not None and cancel.is_set()
+
+    try:
+        for root in roots:
+            pending[executor.submit(_scan_directory, os.fspath(root))] = 0
+        while pending and not cancelled():
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                depth = pending.pop(future)
+                listing = future.result()
+                status.directories += 1
+                status.files += listing.files
+                status.errors += listing.failed
+
+                proposal = _propose(listing)
+                found = proposal is not None
+                if found and library is not None and library.find_duplicate(proposal.exe_path):
+                    status.known += 1
+                    proposal = None
+
+                if depth < max_depth and (depth == 0 or not found):
+                    for subdir in listing.subdirs:
+                        pending[executor.submit(_scan_directory, subdir)] = depth + 1
+                if proposal is not None:
+                    status.found += 1
+                    yield proposal
+                if progress:
+                    progress(status)
+                if cancelled():
+                    return
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,461 @@
+"""Search indexes for the game library."""
+
+import heapq
+import math
+import re
+from array import array
+from collections import Counter, OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+
+# Minimum share of the query's trigrams a name must contain to count as a
+# typo-tolerant match.
+FUZZY_THRESHOLD = 0.5
+
+# Removed names are purged from the postings once there are more of them
+# than live names, and at least this many.
+COMPACT_MIN_DEAD = 1024
+
+# Words in names and notes; "mt-32" and "v1.2" stay single tokens.
+_TOKEN_RE = re.compile(r"\w+(?:[-.']\w+)*")
+_TOKEN_PART_RE = re.compile(r"[-.']")
+
+# One query term: optional "-", optional "field:", then a quoted phrase or a word.
+_QUERY_TERM_RE = re.compile(r'(-?)(?:([a-z]+):)?(?:"([^"]*)"?|(\S+))', re.IGNORECASE)
+
+QUERY_FIELDS = {"name": "name", "tag": "tag", "tags": "tag", "notes": "notes", "note": "notes"}
+
+
+def _spread(text: str) -> str:
+    """Double every space so word boundaries get their own trigrams.
+
+    Applying this to both names and queries keeps substring relationships
+    intact: if ``q`` is in ``name`` then ``_spread(q)`` is in ``_spread(name)``.
+    """
+    return text.replace(" ", "  ")
+
+
+def _trigrams(text: str) -> set[str]:
+    """Get the set of three-character grams in a string."""
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def _name_trigrams(folded: str) -> set[str]:
+    """Get the indexed trigrams of a casefolded name."""
+    return _trigrams(f"  {_spread(folded)} ")
+
+
+def _substring_rank(name: str, folded: str, pos: int) -> int:
+    """Rank a name containing a query at ``pos``: exact, prefix, word prefix or substring."""
+    if pos == 0:
+        return 0 if len(name) == len(folded) else 1
+    if name[pos - 1] == " " or f" {folded}" in name:
+        return 2
+    return 3
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into casefolded word tokens."""
+    return _TOKEN_RE.findall(text.casefold())
+
+
+def _index_terms(text: str) -> set[str]:
+    """Get the tokens of a text plus the parts of compound tokens."""
+    terms = set()
+    for token in tokenize(text):
+        terms.add(token)
+        if _TOKEN_PART_RE.search(token):
+            terms.update(part for part in _TOKEN_PART_RE.split(token) if part)
+    return terms
+
+
+def _contains_phrase(tokens: list[str], phrase: list[str]) -> bool:
+    """Check whether a token list contains a phrase as a contiguous run."""
+    size = len(phrase)
+    return any(tokens[i : i + size] == phrase for i in range(len(tokens) - size + 1))
+
+
+class TrigramIndex:
+    """Incrementally maintained trigram index over game names.
+
+    Each name is casefolded once on insert and broken into trigrams with
+    padded word boundaries. Substring queries intersect the postings of the
+    query's trigrams and only verify the surviving candidates; fuzzy
+    queries rank names by the share of query trigrams they contain.
+
+    Every indexed name gets a sequence number, and postings are compact
+    arrays of those numbers rather than sets of keys. Removed names are left
+    in the postings and skipped on lookup until enough have piled up to be
+    worth compacting.
+    """
+
+    def __init__(self) -> None:
+        self._records: dict[int, tuple[Hashable, str]] = {}
+        self._seqs: dict[Hashable, int] = {}
+        self._postings: dict[str, array] = {}
+        self._next_seq = 0
+        self._dead = 0
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def add(self, key: Hashable, name: str) -> None:
+        """Index a name under a key, replacing any previous name."""
+        if key in self._seqs:
+            self.remove(key)
+        folded = name.casefold()
+        seq = self._next_seq
+        self._next_seq += 1
+        self._records[seq] = (key, folded)
+        self._seqs[key] = seq
+        self.version += 1
+        postings = self._postings
+        for gram in _name_trigrams(folded):
+            posting = postings.get(gram)
+            if posting is None:
+                postings[gram] = array("I", (seq,))
+            else:
+                posting.append(seq)
+
+    def remove(self, key: Hashable) -> None:
+        """Drop a key from the index, if present."""
+        seq = self._seqs.pop(key, None)
+        if seq is None:
+            return
+        del self._records[seq]
+        self.version += 1
+        self._dead += 1
+        if self._dead > max(len(self._records), COMPACT_MIN_DEAD):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Drop removed sequence numbers from the postings."""
+        records = self._records
+        postings = {}
+        for gram, posting in self._postings.items():
+            live = array("I", (seq for seq in posting if seq in records))
+            if live:
+                postings[gram] = live
+        self._postings = postings
+        self._dead = 0
+
+    def search(self, query: str, limit: int | None = None, fuzzy: bool = True) -> list[Hashable]:
+        """Find keys whose names match a query, best matches first.
+
+        Substring matches come first, ranked exact, prefix, word prefix and
+        then plain substring. When ``fuzzy`` is set, names sharing enough
+        trigrams with the query follow, ranked by similarity. Ties keep
+        insertion order.
+        """
+        folded = query.casefold()
+        if not folded:
+            keys = list(self._seqs)
+            return keys if limit is None else keys[:limit]
+
+        return self._finish(folded, self._substring_matches(folded, limit), limit, fuzzy)
+
+    def _finish(
+        self,
+        folded: str,
+        matches: list[tuple[int, int, Hashable]],
+        limit: int | None,
+        fuzzy: bool,
+    ) -> list[Hashable]:
+        """Order substring matches and append fuzzy matches if room is left."""
+        if limit is not None and len(matches) > limit:
+            matches = heapq.nsmallest(limit, matches)
+        else:
+            matches = sorted(matches)
+        keys = [key for _, _, key in matches]
+        if fuzzy and len(folded) >= 3 and (limit is None or len(keys) < limit):
+            keys.extend(self._fuzzy_matches(folded, exclude={seq for _, seq, _ in matches}))
+        return keys if limit is None else keys[:limit]
+
+    def _substring_matches(
+        self, folded: str, limit: int | None = None, seqs: Iterable[int] | None = None
+    ) -> list[tuple[int, int, Hashable]]:
+        """Get ranked keys whose names contain an already casefolded query.
+
+        Each match is a ``(rank, seq, key)`` tuple where rank is 0 for an
+        exact match, 1 for a prefix, 2 for a word prefix and 3 otherwise.
+        Queries too short to form a trigram are answered from the word-start
+        postings first; with a ``limit`` the remaining scan stops as soon as
+        enough plain substring matches have been found. Passing ``seqs``
+        restricts the search to those sequence numbers instead.
+        """
+        records = self._records
+        grams = _trigrams(_spread(folded))
+        found = None
+        if seqs is not None:
+            candidates = seqs
+        elif grams:
+            candidates = self._candidates(grams)
+        else:
+            found = set(self._postings.get(f"  {folded}"[-3:], ()))
+            candidates = found
+
+        matches = []
+        for seq in candidates:
+            record = records.get(seq)
+            if record is None:
+                continue
+            key, name = record
+            pos = name.find(folded)
+            if pos >= 0:
+                matches.append((_substring_rank(name, folded, pos), seq, key))
+
+        if found is not None:
+            wanted = None if limit is None else max(limit - len(matches), 0)
+            for seq, (key, name) in records.items():
+                if wanted == 0:
+                    break
+                if seq in found:
+                    continue
+                pos = name.find(folded)
+                if pos < 0:
+                    continue
+                rank = _substring_rank(name, folded, pos)
+                matches.append((rank, seq, key))
+                # The limit counts plain substring matches; a word prefix
+                # found here still ranks above them
+                if wanted is not None and rank == 3:
+                    wanted -= 1
+        return matches
+
+    def _candidates(self, grams: set[str]) -> set[int]:
+        """Get sequence numbers whose names contain all of the given trigrams."""
+        postings = []
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if not posting:
+                return set()
+            postings.append(posting)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                break
+        return candidates
+
+    def _fuzzy_matches(self, folded: str, exclude: set[int]) -> list[Hashable]:
+        """Get keys sharing enough trigrams with the query, best first.
+
+        A name sharing at least ``needed`` of the query's ``n`` trigrams must
+        appear in one of the ``n - needed + 1`` shortest postings, so only
+        those are scanned for candidates.
+        """
+        grams = _name_trigrams(folded)
+        postings = sorted((self._postings.get(gram, ()) for gram in grams), key=len)
+        needed = math.ceil(FUZZY_THRESHOLD * len(postings))
+        candidates = set().union(*postings[: len(postings) - needed + 1]) - exclude
+
+        shared: Counter = Counter()
+        for posting in postings:
+            shared.update(candidates.intersection(posting))
+
+        records = self._records
+        scored = [
+            (-count, seq, records[seq][0])
+            for seq, count in shared.items()
+            if count >= needed and seq in records
+        ]
+        scored.sort(key=lambda item: item[:2])
+        return [key for _, _, key in scored]
+
+
+class SearchSession:
+    """Search-as-you-type over a TrigramIndex.
+
+    The session remembers the full substring match sets of recent queries.
+    When a new query contains a remembered one, as it does while the user
+    keeps typing or backspaces to an earlier prefix, only that remembered
+    set is filtered instead of searching the whole index. Results are the
+    same as ``TrigramIndex.search`` with the same arguments. Any change to
+    the index drops the remembered sets.
+    """
+
+    def __init__(
+        self,
+        index: TrigramIndex,
+        resolve: Callable[[Hashable], object] | None = None,
+        limit: int | None = None,
+        fuzzy: bool = True,
+        max_cached: int = 32,
+    ) -> None:
+        self._index = index
+        self._resolve = resolve
+        self.limit = limit
+        self.fuzzy = fuzzy
+        self.max_cached = max_cached
+        self._cache: OrderedDict[str, list[tuple[int, int, Hashable]]] = OrderedDict()
+        self._version = index.version
+
+    def search(self, query: str) -> list:
+        """Search for a query, reusing the results of earlier queries."""
+        index = self._index
+        if index.version != self._version:
+            self.reset()
+
+        folded = query.casefold()
+        if not folded:
+            keys = index.search("", limit=self.limit)
+        else:
+            keys = index._finish(folded, self._matches(folded), self.limit, self.fuzzy)
+        if self._resolve is None:
+            return keys
+        return [self._resolve(key) for key in keys]
+
+    def reset(self) -> None:
+        """Forget all remembered queries."""
+        self._cache.clear()
+        self._version = self._index.version
+
+    def _matches(self, folded: str) -> list[tuple[int, int, Hashable]]:
+        """Get the full substring match set for a query."""
+        cache = self._cache
+        matches = cache.get(folded)
+        if matches is not None:
+            cache.move_to_end(folded)
+            return matches
+
+        narrowest = None
+        for cached, cached_matches in cache.items():
+            if cached in folded and (narrowest is None or len(cached_matches) < len(narrowest)):
+                narrowest = cached_matches
+
+        if narrowest is None:
+            matches = self._index._substring_matches(folded)
+        else:
+            seqs = [seq for _, seq, _ in narrowest]
+            matches = self._index._substring_matches(folded, seqs=seqs)
+
+        cache[folded] = matches
+        if len(cache) > self.max_cached:
+            cache.popitem(last=False)
+        return matches
+
+
+class InvertedIndex:
+    """Inverted index over game names, tags and notes.
+
+    Answers boolean queries such as ``tag:rpg notes:"mt-32" -tag:demo``
+    from postings lists. Terms are ANDed together, ``OR`` separates
+    alternatives, and a leading ``-`` or ``NOT`` excludes matches. Terms
+    without a field match names, tags or notes. Tags match whole tag values;
+    quoted name and notes phrases are checked word by word against the
+    candidates' text, fetched through ``text(key, field)``.
+    """
+
+    def __init__(self, text: Callable[[Hashable, str], str]) -> None:
+        self._text = text
+        self._postings: dict[tuple[str, str], set[Hashable]] = {}
+        self._terms: dict[Hashable, tuple[tuple[str, str], ...]] = {}
+        self._seqs: dict[Hashable, int] = {}
+        self._next_seq = 0
+
+    def __len__(self) -> int:
+        return len(self._seqs)
+
+    def add(self, key: Hashable, name: str, tags: Iterable[str], notes: str) -> None:
+        """Index a game's text under a key, replacing any previous entry."""
+        if key in self._seqs:
+            self.remove(key)
+        terms = {("name", term) for term in _index_terms(name)}
+        terms.update(("tag", tag.casefold().strip()) for tag in tags)
+        terms.update(("notes", term) for term in _index_terms(notes))
+        self._terms[key] = tuple(terms)
+        self._seqs[key] = self._next_seq
+        self._next_seq += 1
+        for term in terms:
+            self._postings.setdefault(term, set()).add(key)
+
+    def remove(self, key: Hashable) -> None:
+        """Drop a key from the index, if present."""
+        if self._seqs.pop(key, None) is None:
+            return
+        for term in self._terms.pop(key):
+            posting = self._postings[term]
+            posting.discard(key)
+            if not posting:
+                del self._postings[term]
+
+    def query(self, expression: str) -> list[Hashable]:
+        """Get the keys matching a query expression, in insertion order."""
+        groups = self._parse(expression)
+        if not groups:
+            return list(self._seqs)
+
+        matches: set[Hashable] = set()
+        for group in groups:
+            matches |= self._match_group(group)
+        return sorted(matches, key=self._seqs.__getitem__)
+
+    def _parse(self, expression: str) -> list[list[tuple[bool, str | None, str]]]:
+        """Split a query into OR-separated groups of (negated, field, value) terms."""
+        groups: list[list[tuple[bool, str | None, str]]] = [[]]
+        negate_next = False
+        for match in _QUERY_TERM_RE.finditer(expression):
+            minus, field, phrase, word = match.groups()
+            value = phrase if phrase is not None else word
+            if field is None and phrase is None and not minus:
+                if word == "OR":
+                    groups.append([])
+                    continue
+                if word == "AND":
+                    continue
+                if word == "NOT":
+                    negate_next = True
+                    continue
+            if field is not None and field.lower() not in QUERY_FIELDS:
+                value = f"{field}:{value}"
+                field = None
+            field = QUERY_FIELDS[field.lower()] if field is not None else None
+            groups[-1].append((bool(minus) or negate_next, field, value))
+            negate_next = False
+        return [group for group in groups if group]
+
+    def _match_group(self, group: list[tuple[bool, str | None, str]]) -> set[Hashable]:
+        """Get the keys matching every term of an AND group."""
+        included = []
+        excluded = []
+        for negated, field, value in group:
+            (excluded if negated else included).append(self._match_term(field, value))
+
+        if included:
+            included.sort(key=len)
+            matches = set(included[0])
+            for keys in included[1:]:
+                matches &= keys
+        else:
+            matches = set(self._seqs)
+        for keys in excluded:
+            matches -= keys
+        return matches
+
+    def _match_term(self, field: str | None, value: str) -> set[Hashable]:
+        """Get the keys matching a single term."""
+        if field == "tag":
+            return self._postings.get(("tag", value.casefold().strip()), set())
+        if field is not None:
+            return self._match_words(field, value)
+        matches = set(self._postings.get(("tag", value.casefold().strip()), ()))
+        matches |= self._match_words("name", value)
+        matches |= self._match_words("notes", value)
+        return matches
+
+    def _match_words(self, field: str, value: str) -> set[Hashable]:
+        """Get the keys whose field contains all words of a value, in order."""
+        words = tokenize(value)
+        if not words:
+            return set(self._seqs)
+
+        postings = sorted((self._postings.get((field, word), set()) for word in words), key=len)
+        matches = set(postings[0])
+        for posting in postings[1:]:
+            matches &= posting
+        if len(words) > 1:
+            matches = {
+                key for key in matches if _contains_phrase(tokenize(self._text(key, field)), words)
+            }
+        return matches
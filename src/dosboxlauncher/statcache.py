@@ -0,0 +1,89 @@
+"""A process-wide cache of file system checks."""
+
+import os
+import stat
+import threading
+import time
+from collections.abc import Callable
+
+STAT_TTL = 5.0
+STAT_CACHE_SIZE = 65536
+
+
+class StatCache:
+    """Results of ``os.stat`` on paths, reused for ``ttl`` seconds.
+
+    Validating games checks the same executables and directories over
+    and over; within the TTL repeating a check costs no system call.
+    Missing paths are cached too. Code that creates, replaces or deletes
+    a file should call ``invalidate`` with its path so the next check
+    sees the change at once.
+
+    Args:
+        ttl: Seconds a result stays valid. Can be changed later through
+            the ``ttl`` attribute.
+        max_entries: Paths to remember; the oldest are dropped beyond it.
+        clock: Monotonic time source, replaceable for tests.
+    """
+
+    def __init__(
+        self,
+        ttl: float = STAT_TTL,
+        max_entries: int = STAT_CACHE_SIZE,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries: dict[str, tuple[float, os.stat_result | None]] = {}
+        self._lock = threading.Lock()
+
+    def stat(self, path: str | os.PathLike) -> os.stat_result | None:
+        """Get the stat of a path, following symlinks, or None if it doesn't exist."""
+        key = os.fspath(path)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        try:
+            result = os.stat(key)
+        except (OSError, ValueError):
+            result = None
+
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (now + self.ttl, result)
+            if len(self._entries) > self.max_entries:
+                del self._entries[next(iter(self._entries))]
+        return result
+
+    def exists(self, path: str | os.PathLike) -> bool:
+        """Cached ``os.path.exists``."""
+        return self.stat(path) is not None
+
+    def isdir(self, path: str | os.PathLike) -> bool:
+        """Cached ``os.path.isdir``."""
+        result = self.stat(path)
+        return result is not None and stat.S_ISDIR(result.st_mode)
+
+    def isfile(self, path: str | os.PathLike) -> bool:
+        """Cached ``os.path.isfile``."""
+        result = self.stat(path)
+        return result is not None and stat.S_ISREG(result.st_mode)
+
+    def invalidate(self, path: str | os.PathLike | None = None) -> None:
+        """Forget the cached result for a path, or for every path if None."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.fspath(path), None)
+
+
+stat_cache = StatCache()
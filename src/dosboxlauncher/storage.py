@@ -0,0 +1,1055 @@
+"""Storage backends for the application configuration."""
+
+import json
+import marshal
+import os
+import sqlite3
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import closing, contextmanager, nullcontext
+from pathlib import Path
+from typing import TYPE_CHECKING
+from weakref import WeakKeyDictionary
+
+import yaml
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+from .exceptions import ConfigError
+from .models import ChangeKind, Game, GameLibrary, LibraryChange, PathTable, _coalesce, _id_key
+
+if TYPE_CHECKING:
+    from .config import AppConfig
+
+SCHEMA_VERSION = 1
+MANIFEST_VERSION = 1
+JOURNAL_COMPACT_SIZE = 1024 * 1024
+CACHE_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS games (
+    id TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    exe_path TEXT NOT NULL,
+    config_path TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    notes TEXT NOT NULL,
+    tags TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_seq ON games (seq);
+CREATE INDEX IF NOT EXISTS games_name ON games (name COLLATE NOCASE);
+"""
+
+_GAME_COLUMNS = ("id", "name", "exe_path", "config_path", "created_at", "notes", "tags")
+
+_UPSERT_GAME = f"""
+INSERT INTO games (seq, {", ".join(_GAME_COLUMNS)})
+VALUES (?, {", ".join("?" for _ in _GAME_COLUMNS)})
+ON CONFLICT (id) DO UPDATE SET
+    {", ".join(f"{c} = excluded.{c}" for c in _GAME_COLUMNS[1:])}
+"""
+# Settings row holding the SQLite backend's generation number
+_GENERATION_KEY = "generation"
+_BUMP_GENERATION = """
+INSERT INTO settings (key, value) VALUES (?, '1')
+ON CONFLICT (key) DO UPDATE SET value = value + 1
+"""
+
+
+class ChangeTracker:
+    """Records which games of a library changed since it was last saved.
+
+    Backends can keep the settings and game names they last wrote in
+    ``settings`` and ``names``, to tell whether those need writing again.
+    ``generation`` marks the version of the file the library was last in
+    step with, and ``in_sync`` is cleared once another process's changes
+    have been merged into the file but not into the library.
+    """
+
+    def __init__(self, library: GameLibrary, target: Path) -> None:
+        self.target = target
+        self.pending: dict[str, ChangeKind] = {}
+        self.settings: dict | None = None
+        self.names: dict[str, str] = {}
+        self.generation = 0
+        self.in_sync = True
+        self._paused = False
+        self._lock = threading.Lock()
+        self._unsubscribe = library.subscribe(self._on_change)
+
+    def _on_change(self, change: LibraryChange) -> None:
+        if self._paused:
+            return
+        with self._lock:
+            for key in change.ids:
+                combined = _coalesce(self.pending.pop(key, None), change.kind)
+                if combined is not None:
+                    self.pending[key] = combined
+
+    def take(self) -> dict[str, ChangeKind]:
+        """Get the pending changes and start recording afresh."""
+        with self._lock:
+            pending, self.pending = self.pending, {}
+        return pending
+
+    def restore(self, pending: dict[str, ChangeKind]) -> None:
+        """Put back changes taken by a save that failed."""
+        with self._lock:
+            for key, kind in pending.items():
+                later = self.pending.pop(key, None)
+                combined = kind if later is None else _coalesce(kind, later)
+                if combined is not None:
+                    self.pending[key] = combined
+
+    @contextmanager
+    def paused(self):
+        """Ignore changes that bring the library in line with the file."""
+        self._paused = True
+        try:
+            yield
+        finally:
+            self._paused = False
+
+    def close(self) -> None:
+        """Stop recording changes."""
+        self._unsubscribe()
+
+
+_trackers: "WeakKeyDictionary[GameLibrary, ChangeTracker]" = WeakKeyDictionary()
+
+
+def track(library: GameLibrary, target: Path) -> ChangeTracker:
+    """Start recording the changes to a library that ``target`` lacks."""
+    tracker = _trackers.get(library)
+    if tracker is not None:
+        tracker.close()
+    tracker = _trackers[library] = ChangeTracker(library, target)
+    return tracker
+
+
+def tracker_for(library: GameLibrary, target: Path) -> ChangeTracker | None:
+    """Get the tracker of a library's changes against ``target``, if any."""
+    tracker = _trackers.get(library)
+    return tracker if tracker is not None and tracker.target == target else None
+
+
+@contextmanager
+def file_lock(path: Path):
+    """Hold an exclusive advisory lock on ``path``, shared with other processes.
+
+    Writers hold it only while they check the file on disk and replace it,
+    so two launcher windows or a script can save without losing changes.
+    """
+    if fcntl is None:
+        yield
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _changed_settings(settings: dict, saved: dict | None) -> dict:
+    """Get the settings that differ from the ones last saved."""
+    if saved is None:
+        return settings
+    return {key: value for key, value in settings.items() if saved.get(key) != value}
+
+
+def _merge_games(games: dict[str, dict], library: GameLibrary, pending) -> None:
+    """Apply a library's pending changes to serialized games, keyed by ID."""
+    for key in pending:
+        game = library.get(key)
+        if game is None:
+            games.pop(key, None)
+        else:
+            games[key] = game.to_dict()
+
+
+class StorageBackend(ABC):
+    """Where the application configuration is kept."""
+
+    name = ""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.lock_path = path.with_name(path.name + ".lock")
+
+    @property
+    def target(self) -> Path:
+        """The file loaded libraries are tracked against."""
+        return self.path
+
+    def exists(self) -> bool:
+        """Check whether the backing file has been created."""
+        return self.path.exists()
+
+    def watched_paths(self) -> list[Path]:
+        """Get the files that change when the configuration is saved."""
+        return [self.path]
+
+    def generation(self) -> int | None:
+        """Get a number that changes with every save, if it is cheap to read.
+
+        Returns None if the backend can't tell without loading everything.
+        """
+        return None
+
+    @abstractmethod
+    def load(self) -> "AppConfig":
+        """Read the configuration."""
+
+    @abstractmethod
+    def save(self, config: "AppConfig") -> None:
+        """Write the configuration."""
+
+    def flush(self) -> None:  # noqa: B027 - nothing to wait for by default
+        """Wait for any writes still running in the background."""
+
+
+class YamlStorage(StorageBackend):
+    """The whole configuration in a single YAML file."""
+
+    name = "yaml"
+
+    def __init__(self, path: Path) -> None:
+        super().__init__(path)
+        self.journal_path = path.with_name(path.name + ".journal")
+        self.previous_journal_path = path.with_name(path.name + ".journal.prev")
+        self.cache_path = path.with_name(path.name + ".cache")
+
+    def _read(self) -> dict:
+        """Parse the YAML file, or reuse the cached result of parsing it."""
+        try:
+            stat = os.stat(self.path)
+            data = _read_cache(self.cache_path, stat)
+            if data is not None:
+                return data
+            with open(self.path) as f:
+                data = yaml.safe_load(f) or {}
+        except yaml.YAMLError as e:
+            raise ConfigError(f"Invalid config file: {e}") from e
+        except Exception as e:
+            raise ConfigError(f"Failed to load config: {e}") from e
+
+        _write_cache(self.cache_path, stat, data)
+        return data
+
+    def generation(self) -> int | None:
+        return _read_generation(self.path)
+
+    def load(self) -> "AppConfig":
+        from .config import AppConfig
+
+        if not self.path.exists():
+            return AppConfig()
+
+        data = self._read()
+        try:
+            config = AppConfig.from_dict(data, lazy=True)
+        except Exception as e:
+            raise ConfigError(f"Failed to load config: {e}") from e
+        tracker = track(config.games, self.path)
+        tracker.settings = config.settings()
+        tracker.generation = data.get("generation", 0)
+        return config
+
+    def save(self, config: "AppConfig") -> None:
+        """Write the configuration.
+
+        config.yaml carries a generation number that every save bumps. If
+        it moved since this config was loaded, another process saved in
+        between, and only this config's changed games and settings are
+        merged into what's on disk instead of overwriting it.
+
+        The new file is written before taking the lock, which is held only
+        to check that the generation is still the one the file was built
+        from and to move it into place. If another save got in first, the
+        file is built again on top of that one.
+        """
+        library = config.games
+        settings = config.settings()
+        tracker = tracker_for(library, self.path)
+        if tracker is None:
+            tracker = track(library, self.path)
+            pending = None
+        else:
+            pending = tracker.take()
+
+        tmp_path = None
+        try:
+            while True:
+                generation = _read_generation(self.path)
+                in_sync = tracker.in_sync and tracker.generation == generation
+                overwrite = pending is None or in_sync or not self.path.exists()
+                tmp_path = _write_yaml(
+                    self.path,
+                    self._contents(config, settings, tracker, pending, overwrite, generation),
+                )
+                with file_lock(self.lock_path):
+                    if _read_generation(self.path) == generation:
+                        os.replace(tmp_path, self.path)
+                        tmp_path = None
+                        # A journal left from journal mode no longer applies to this file
+                        for path in (self.journal_path, self.previous_journal_path):
+                            path.unlink(missing_ok=True)
+                        break
+                tmp_path.unlink()
+                tmp_path = None
+        except BaseException as e:
+            if pending is None:
+                # Saving again must write the whole library, not an empty change set
+                tracker.close()
+                _trackers.pop(library, None)
+            else:
+                tracker.restore(pending)
+            if isinstance(e, OSError):
+                raise ConfigError(f"Failed to save config: {e}") from e
+            raise
+        finally:
+            if tmp_path is not None:
+                tmp_path.unlink(missing_ok=True)
+
+        tracker.generation = generation + 1
+        tracker.in_sync = overwrite
+        tracker.settings = settings
+
+    def _contents(
+        self,
+        config: "AppConfig",
+        settings: dict,
+        tracker: ChangeTracker,
+        pending: dict[str, ChangeKind] | None,
+        overwrite: bool,
+        generation: int,
+    ) -> dict:
+        """Build the data of a config.yaml that follows ``generation``."""
+        if overwrite:
+            data = config.to_dict()
+        else:
+            data = self._read()
+            # A config without games is valid, as when written by hand
+            saved = data.get("games") or {}
+            games = {g.get("id", ""): g for g in saved.get("games") or []}
+            _merge_games(games, config.games, pending)
+            data.update(_changed_settings(settings, tracker.settings))
+            # Games already on disk may refer to its path table
+            data["games"] = {**saved, "games": list(games.values())}
+            data.pop("journal", None)
+        # The generation read back from disk must not win over the new one
+        data.pop("generation", None)
+        return {"generation": generation + 1, **data}
+
+
+_journal_lock = threading.RLock()
+_compactions: dict[Path, threading.Thread] = {}
+
+
+class JournalStorage(YamlStorage):
+    """config.yaml plus a journal of the changes made since it was written.
+
+    Saving appends one JSON line per changed game, and a line for the
+    settings when they changed, so its cost doesn't depend on the size of
+    the library. Loading replays the journal over config.yaml. Once the
+    journal grows past JOURNAL_COMPACT_SIZE it is folded into a new
+    config.yaml in the background.
+
+    Each journal starts with a header naming the snapshot it applies to,
+    so a journal is never replayed over a config.yaml that already
+    contains its changes. A journal line torn by a crash is dropped, and
+    the next save writes a fresh snapshot.
+    """
+
+    name = "journal"
+
+    @property
+    def target(self) -> Path:
+        return self.journal_path
+
+    def exists(self) -> bool:
+        return self.journal_path.exists()
+
+    def watched_paths(self) -> list[Path]:
+        return [self.path, self.journal_path]
+
+    def generation(self) -> int | None:
+        return _file_size(self.journal_path)
+
+    def _replay(self) -> tuple[dict, bool]:
+        """Read config.yaml and replay the journal over it.
+
+        Returns:
+            The resulting config data, and whether a torn journal line was
+            dropped.
+        """
+        with _journal_lock:
+            data = self._read()
+            snapshot = data.pop("journal", None)
+            header, records, torn = _read_journal(self.journal_path)
+            if header.get("snapshot") != snapshot:
+                # Written while a compaction was running: the set-aside
+                # journal comes first, unless the new snapshot landed
+                previous_header, previous, previous_torn = _read_journal(self.previous_journal_path)
+                if header.get("after") == snapshot and previous_header.get("snapshot") == snapshot:
+                    records = previous + records
+                    torn = torn or previous_torn
+                else:
+                    records = []
+
+        data.pop("generation", None)
+        games = {game.get("id", ""): game for game in data.get("games", {}).get("games", [])}
+        for record in records:
+            if record["op"] == "put":
+                games[record["game"].get("id", "")] = record["game"]
+            elif record["op"] == "delete":
+                games.pop(record["id"], None)
+            elif record["op"] == "settings":
+                data.update(record["settings"])
+        data["games"] = {**data.get("games", {}), "games": list(games.values())}
+        return data, torn
+
+    def load(self) -> "AppConfig":
+        from .config import AppConfig
+
+        if not self.path.exists():
+            return AppConfig(storage=self.name)
+
+        size = _file_size(self.journal_path)
+        data, torn = self._replay()
+        try:
+            config = AppConfig.from_dict(data, lazy=True)
+        except Exception as e:
+            raise ConfigError(f"Failed to load config: {e}") from e
+        if not torn:
+            tracker = track(config.games, self.journal_path)
+            tracker.settings = config.settings()
+            tracker.generation = size
+        return config
+
+    def save(self, config: "AppConfig") -> None:
+        """Append this config's changes to the journal.
+
+        Other processes may append to the same journal; their records are
+        replayed along with ours. Once the journal holds records this
+        config hasn't seen, compaction rebuilds config.yaml from the files
+        rather than from this config's library.
+        """
+        library = config.games
+        settings = config.settings()
+        with file_lock(self.lock_path), _journal_lock:
+            tracker = tracker_for(library, self.journal_path)
+            if tracker is None:
+                self._compact(library, settings)
+                return
+            if tracker.generation != _file_size(self.journal_path):
+                tracker.in_sync = False
+            compacting = self.path in _compactions
+            # Left by a compaction that failed
+            leftover = self.previous_journal_path.exists() and not compacting
+            if leftover and tracker.in_sync:
+                self._compact(library, settings)
+                return
+
+            pending = tracker.take()
+            records = []
+            for key in pending:
+                # A game removed since the change was taken is recorded
+                # again by the tracker, so writing its removal now is safe
+                game = library.get(key)
+                if game is None:
+                    records.append({"op": "delete", "id": key})
+                else:
+                    records.append({"op": "put", "game": game.to_dict()})
+            changed = _changed_settings(settings, tracker.settings)
+            if changed:
+                records.append({"op": "settings", "settings": changed})
+            try:
+                size = _append_journal(self.journal_path, records)
+            except OSError as e:
+                tracker.restore(pending)
+                raise ConfigError(f"Failed to save config: {e}") from e
+            tracker.settings = settings
+            tracker.generation = size
+
+            if leftover or (size > JOURNAL_COMPACT_SIZE and not compacting):
+                if tracker.in_sync:
+                    self._compact_in_background(library, settings, tracker)
+                else:
+                    self._compact_from_disk(tracker)
+
+    def flush(self) -> None:
+        thread = _compactions.get(self.path)
+        if thread is not None:
+            thread.join()
+
+    def _compact(self, library: GameLibrary, settings: dict) -> None:
+        """Write a new config.yaml from a library and start an empty journal."""
+        # A running background compaction would write an older snapshot
+        _compactions.pop(self.path, None)
+        token = uuid.uuid4().hex
+        tracker = track(library, self.journal_path)
+        tracker.settings = settings
+        try:
+            os.replace(_write_snapshot(self.path, settings, library.snapshot(), token), self.path)
+            tracker.generation = _start_journal(self.journal_path, {"snapshot": token})
+            if self.previous_journal_path.exists():
+                self.previous_journal_path.unlink()
+        except OSError as e:
+            _trackers.pop(library, None)
+            tracker.close()
+            raise ConfigError(f"Failed to save config: {e}") from e
+
+    def _compact_from_disk(self, tracker: ChangeTracker) -> None:
+        """Fold the journal on disk into a new config.yaml and start afresh."""
+        _compactions.pop(self.path, None)
+        data, _ = self._replay()
+        token = uuid.uuid4().hex
+        try:
+            os.replace(_write_yaml(self.path, {**data, "journal": token}), self.path)
+            tracker.generation = _start_journal(self.journal_path, {"snapshot": token})
+            if self.previous_journal_path.exists():
+                self.previous_journal_path.unlink()
+        except OSError as e:
+            raise ConfigError(f"Failed to save config: {e}") from e
+
+    def _compact_in_background(
+        self, library: GameLibrary, settings: dict, tracker: ChangeTracker
+    ) -> None:
+        """Set the journal aside and fold it into config.yaml on a thread.
+
+        Changes saved while the thread runs go to a fresh journal, which
+        replays over either the old config.yaml and the set-aside journal,
+        or the new config.yaml, whichever is on disk.
+        """
+        header, _, _ = _read_journal(self.journal_path, header_only=True)
+        token = uuid.uuid4().hex
+        snapshot = library.snapshot()
+        os.replace(self.journal_path, self.previous_journal_path)
+        tracker.generation = _start_journal(
+            self.journal_path, {"snapshot": token, "after": header.get("snapshot")}
+        )
+
+        def compact() -> None:
+            try:
+                tmp_path = _write_snapshot(self.path, settings, snapshot, token)
+            except OSError:
+                tmp_path = None  # The set-aside journal is kept for the next save
+            with file_lock(self.lock_path), _journal_lock:
+                if _compactions.get(self.path) is not thread:
+                    if tmp_path is not None:
+                        tmp_path.unlink()
+                    return
+                # Stays registered until done, so flush() waits for the files
+                try:
+                    if tmp_path is not None:
+                        os.replace(tmp_path, self.path)
+                        self.previous_journal_path.unlink()
+                finally:
+                    del _compactions[self.path]
+
+        thread = _compactions[self.path] = threading.Thread(target=compact)
+        thread.start()
+
+
+class SqliteStorage(StorageBackend):
+    """Settings and games in an SQLite database, one row per game.
+
+    After the first save, saving writes only the games that changed since
+    the last one, in a single transaction. Every save also bumps a
+    generation number kept with the settings, so a process can tell
+    whether the database changed since it last read or wrote it.
+    """
+
+    name = "sqlite"
+
+    def watched_paths(self) -> list[Path]:
+        # Commits land in the write-ahead log until it is checkpointed
+        return [self.path, self.path.with_name(self.path.name + "-wal")]
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        if conn.execute("PRAGMA user_version").fetchone()[0] == 0:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.executescript(_SCHEMA)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        return conn
+
+    def generation(self) -> int | None:
+        try:
+            with closing(self._connect()) as conn:
+                return _read_db_generation(conn)
+        except (sqlite3.Error, ValueError):
+            return None
+
+    def load(self) -> "AppConfig":
+        from .config import AppConfig
+
+        if not self.path.exists():
+            return AppConfig(storage=self.name)
+
+        try:
+            with closing(self._connect()) as conn, conn:
+                # One transaction, so the generation matches what is read
+                conn.execute("BEGIN")
+                settings = {
+                    key: json.loads(value)
+                    for key, value in conn.execute("SELECT key, value FROM settings")
+                }
+                rows = conn.execute(f"SELECT {', '.join(_GAME_COLUMNS)} FROM games ORDER BY seq")
+                games = GameLibrary(_row_to_game(row) for row in rows)
+        except (sqlite3.Error, ValueError) as e:
+            raise ConfigError(f"Failed to load config: {e}") from e
+
+        generation = settings.pop(_GENERATION_KEY, 0)
+        config = AppConfig.from_dict(settings)
+        config.games = games
+        tracker = track(games, self.path)
+        tracker.settings = config.settings()
+        tracker.generation = generation
+        return config
+
+    def save(self, config: "AppConfig") -> None:
+        library = config.games
+        settings = config.settings()
+        tracker = tracker_for(library, self.path)
+        if tracker is None:
+            # Changes made from here on are caught by the next save
+            tracker = track(library, self.path)
+            pending = None
+        else:
+            pending = tracker.take()
+
+        try:
+            with closing(self._connect()) as conn, conn:
+                # Only changed settings, so as not to undo another process's
+                conn.executemany(
+                    "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+                    [
+                        (key, json.dumps(value))
+                        for key, value in _changed_settings(settings, tracker.settings).items()
+                    ],
+                )
+                if pending is None:
+                    conn.execute("DELETE FROM games")
+                    self._write_games(conn, library.view())
+                else:
+                    self._write_changes(conn, library, pending)
+                conn.execute(_BUMP_GENERATION, (_GENERATION_KEY,))
+                generation = _read_db_generation(conn)
+        except (sqlite3.Error, OSError, ValueError) as e:
+            if pending is None:
+                tracker.close()
+                _trackers.pop(library, None)
+            else:
+                tracker.restore(pending)
+            raise ConfigError(f"Failed to save config: {e}") from e
+        # Saved over another process's changes, which the library lacks
+        # until it is refreshed
+        tracker.in_sync = pending is None or (
+            tracker.in_sync and tracker.generation == generation - 1
+        )
+        tracker.generation = generation
+        tracker.settings = settings
+
+    def _write_changes(
+        self, conn: sqlite3.Connection, library: GameLibrary, pending: dict[str, ChangeKind]
+    ) -> None:
+        """Write the rows of games that changed and delete removed ones."""
+        removed = [(key,) for key, kind in pending.items() if kind is ChangeKind.REMOVED]
+        conn.executemany("DELETE FROM games WHERE id = ?", removed)
+        changed = [
+            library.get(key) for key, kind in pending.items() if kind is not ChangeKind.REMOVED
+        ]
+        self._write_games(conn, [game for game in changed if game is not None])
+
+    def _write_games(self, conn: sqlite3.Connection, games) -> None:
+        """Insert or update game rows, appending new games at the end."""
+        seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM games").fetchone()[0]
+        conn.executemany(
+            _UPSERT_GAME,
+            [(seq + i, *_game_to_row(game)) for i, game in enumerate(games, start=1)],
+        )
+
+
+class ShardedStorage(StorageBackend):
+    """One small JSON record per game, plus a manifest of IDs and names.
+
+    The records live in the games directory as ``<id>.json``, next to the
+    games' DOSBox configs when those use the default directory. Loading
+    reads only the manifest; each game reads its record the first time a
+    field other than its ID or name is needed. Saving writes the records
+    of the games that changed, and then the manifest.
+
+    The manifest carries a generation number that every save bumps, so
+    other processes see edits that only touch records; if another process
+    saved since, this config's changes are merged into the manifest
+    instead of replacing it.
+    """
+
+    name = "sharded"
+
+    def record_path(self, key: str) -> Path:
+        """Get the path of a game's record."""
+        return self.path.with_name(f"{key}.json")
+
+    def _read_record(self, key: str) -> dict:
+        try:
+            with open(self.record_path(key)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            # Leave the fields empty so validation reports the game as broken
+            return {}
+
+    def load(self) -> "AppConfig":
+        from .config import AppConfig
+
+        if not self.path.exists():
+            return AppConfig(storage=self.name)
+
+        try:
+            with open(self.path) as f:
+                manifest = json.load(f)
+            if manifest.get("version") != MANIFEST_VERSION:
+                raise ValueError(f"unsupported manifest version {manifest.get('version')}")
+            config = AppConfig.from_dict(manifest.get("settings", {}))
+            config.games = GameLibrary(
+                Game.from_record(key, name, self._read_record) for key, name in manifest["games"]
+            )
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            raise ConfigError(f"Failed to load config: {e}") from e
+
+        tracker = track(config.games, self.path)
+        tracker.settings = config.settings()
+        tracker.names = dict(manifest["games"])
+        tracker.generation = manifest.get("generation", 0)
+        return config
+
+    def generation(self) -> int | None:
+        return self._read_manifest().get("generation", 0)
+
+    def _read_manifest(self) -> dict:
+        """Read the manifest, or an empty one if it is missing or unreadable."""
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"games": []}
+
+    def save(self, config: "AppConfig") -> None:
+        library = config.games
+        settings = config.settings()
+        tracker = tracker_for(library, self.path)
+        if tracker is None:
+            tracker = track(library, self.path)
+            pending = None
+        else:
+            pending = tracker.take()
+
+        try:
+            with file_lock(self.lock_path):
+                if pending is None:
+                    self._write_all(library)
+                else:
+                    for key in pending:
+                        game = library.get(key)
+                        if game is None:
+                            self.record_path(key).unlink(missing_ok=True)
+                        else:
+                            _write_json(self.record_path(key), game.to_dict())
+                if pending is None or pending or settings != tracker.settings:
+                    self._write_manifest(library, settings, tracker, pending)
+        except OSError as e:
+            if pending is None:
+                tracker.close()
+                _trackers.pop(library, None)
+            else:
+                tracker.restore(pending)
+            raise ConfigError(f"Failed to save config: {e}") from e
+        tracker.settings = settings
+
+    def _write_manifest(
+        self, library: GameLibrary, settings: dict, tracker: ChangeTracker, pending
+    ) -> None:
+        """Write the manifest, merging with the one on disk if it moved on."""
+        current = self._read_manifest()
+        generation = current.get("generation", 0)
+        in_sync = tracker.in_sync and tracker.generation == generation
+        if pending is None or in_sync:
+            names = {_id_key(game): game.name for game in library.view()}
+        else:
+            names = dict(current["games"])
+            for key in pending:
+                game = library.get(key)
+                if game is None:
+                    names.pop(key, None)
+                else:
+                    names[key] = game.name
+            settings = {
+                **current.get("settings", {}),
+                **_changed_settings(settings, tracker.settings),
+            }
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "generation": generation + 1,
+            "settings": settings,
+            "games": list(names.items()),
+        }
+        _write_json(self.path, manifest)
+        tracker.names = names
+        tracker.generation = generation + 1
+        tracker.in_sync = pending is None or in_sync
+
+    def _write_all(self, library: GameLibrary) -> None:
+        """Write every game's record and delete records of other games."""
+        keys = set()
+        for game in library.view():
+            key = _id_key(game)
+            keys.add(key)
+            _write_json(self.record_path(key), game.to_dict())
+        for path in self.path.parent.glob("*.json"):
+            if path != self.path and path.stem not in keys and _is_record_name(path.stem):
+                path.unlink()
+
+
+def refresh(config: "AppConfig", storage: StorageBackend) -> bool:
+    """Bring a loaded config up to date with what another process saved.
+
+    The configuration is read again and only the games that differ are
+    changed in ``config``'s library. Games and settings changed here but
+    not saved yet are left alone, so the next save still writes them.
+
+    Returns:
+        Whether anything changed.
+
+    Raises:
+        ConfigError: If the configuration can't be read.
+    """
+    library = config.games
+    # Saves move complete files into place, so, as at startup, reading
+    # needs no lock and never waits for another process's save
+    if not storage.exists():
+        return False  # Deleted or being migrated; keep what's on screen
+    tracker = tracker_for(library, storage.target)
+    if tracker is not None and tracker.in_sync and storage.generation() == tracker.generation:
+        return False
+    fresh = storage.load()
+
+    fresh_tracker = _trackers.pop(fresh.games, None)
+    if fresh_tracker is not None:
+        fresh_tracker.close()
+    saved = tracker.settings if tracker is not None else None
+    unsaved = set(tracker.pending) if tracker is not None else set()
+
+    with tracker.paused() if tracker is not None else nullcontext():
+        changed = library.sync(fresh.games.view(), keep=unsaved)
+
+    for key, value in fresh.settings().items():
+        current = getattr(config, key)
+        if key != "storage" and current != value and (saved is None or saved.get(key) == current):
+            setattr(config, key, value)
+            changed = True
+
+    if tracker is not None and fresh_tracker is not None:
+        tracker.settings = fresh_tracker.settings
+        tracker.names = fresh_tracker.names
+        tracker.generation = fresh_tracker.generation
+        tracker.in_sync = True
+    return changed
+
+
+def _is_record_name(stem: str) -> bool:
+    """Check whether a file name could be a game record's."""
+    try:
+        return str(uuid.UUID(stem)) == stem
+    except ValueError:
+        return False
+
+
+def _write_json(path: Path, data) -> None:
+    """Write JSON to ``path`` through a synced temp file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _write_snapshot(path: Path, settings: dict, games, token: str) -> Path:
+    """Write a full config.yaml, tagged with its journal token, to a temp file.
+
+    Returns:
+        The temp file, to be moved over ``path``.
+    """
+    paths = PathTable()
+    library = [g.to_dict(paths) for g in games]
+    data = {**settings, "journal": token, "games": {"paths": paths.dirs, "games": library}}
+    return _write_yaml(path, data)
+
+
+def _read_generation(path: Path) -> int:
+    """Get the generation number from the first line of a config.yaml."""
+    try:
+        with open(path) as f:
+            key, _, value = f.readline().partition(":")
+        return int(value) if key == "generation" else 0
+    except (OSError, ValueError):
+        return 0
+
+
+def _write_yaml(path: Path, data: dict) -> Path:
+    """Write YAML to a synced temp file next to ``path`` and cache it.
+
+    The file is only complete once the caller moves it over ``path`` with
+    ``os.replace``, so a crash never leaves a half-written config behind.
+
+    Returns:
+        The temp file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, "w") as f:
+            yaml.dump(data, f, default_flow_style=False, sort_keys=False)
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    # Renaming keeps the size and mtime the cache is checked against
+    _write_cache(path.with_name(path.name + ".cache"), os.stat(tmp_path), data)
+    return tmp_path
+
+
+def _read_cache(path: Path, stat: os.stat_result) -> dict | None:
+    """Get the parsed config cached for a config.yaml with the given stat.
+
+    Returns None if there is no cache, or it was written by another
+    version, or for a different config.yaml.
+    """
+    try:
+        with open(path, "rb") as f:
+            version, mtime_ns, size, data = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if (version, mtime_ns, size) != (CACHE_VERSION, stat.st_mtime_ns, stat.st_size):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _write_cache(path: Path, stat: os.stat_result, data: dict) -> None:
+    """Cache parsed config, keyed by the stat of the config.yaml it came from.
+
+    The cache is plain data written with ``marshal``, so loading it can't
+    run code. Data that ``marshal`` can't write, such as timestamps parsed
+    from unquoted YAML, is not cached.
+    """
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            marshal.dump((CACHE_VERSION, stat.st_mtime_ns, stat.st_size, data), f)
+        os.replace(tmp_path, path)
+    except (OSError, ValueError):
+        tmp_path.unlink(missing_ok=True)
+
+
+def _start_journal(path: Path, header: dict) -> int:
+    """Create an empty journal with the given header and get its size."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w") as f:
+        f.write(json.dumps(header) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+        size = f.tell()
+    os.replace(tmp_path, path)
+    return size
+
+
+def _file_size(path: Path) -> int:
+    """Get the size of a file, or 0 if it doesn't exist."""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _append_journal(path: Path, records: list[dict]) -> int:
+    """Append records to a journal and get its new size."""
+    with open(path, "a") as f:
+        f.write("".join(json.dumps(record) + "\n" for record in records))
+        f.flush()
+        os.fsync(f.fileno())
+        return f.tell()
+
+
+def _read_journal(path: Path, header_only: bool = False) -> tuple[dict, list[dict], bool]:
+    """Read a journal.
+
+    Returns:
+        The header, the records, and whether the last record was torn.
+    """
+    try:
+        with open(path) as f:
+            lines = [f.readline()] if header_only else f.read().split("\n")
+    except FileNotFoundError:
+        return {}, [], False
+
+    records = []
+    torn = False
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            torn = True
+            break
+    if not records:
+        return {}, [], torn
+    return records[0], records[1:], torn
+
+
+def _game_to_row(game: Game) -> tuple:
+    """Convert a game to the values of its database row."""
+    data = game.to_dict()
+    data["tags"] = json.dumps(data["tags"])
+    return tuple(data[column] for column in _GAME_COLUMNS)
+
+
+def _read_db_generation(conn: sqlite3.Connection) -> int:
+    """Get the generation number kept in a database's settings table."""
+    row = conn.execute("SELECT value FROM settings WHERE key = ?", (_GENERATION_KEY,)).fetchone()
+    return json.loads(row[0]) if row else 0
+
+
+def _row_to_game(row: tuple) -> Game:
+    """Create a game from its database row, decoding fields lazily."""
+    data = dict(zip(_GAME_COLUMNS, row, strict=True))
+    data["tags"] = json.loads(data["tags"])
+    return Game.from_dict(data, lazy=True)
+
+
+BACKENDS: dict[str, type[StorageBackend]] = {
+    YamlStorage.name: YamlStorage,
+    JournalStorage.name: JournalStorage,
+    SqliteStorage.name: SqliteStorage,
+    ShardedStorage.name: ShardedStorage,
+}
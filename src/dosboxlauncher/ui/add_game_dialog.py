@@ -1,26 +1,36 @@
 """Add game dialog."""
 
-import os
+import threading
 from collections.abc import Callable
 
 import gi
 
 gi.require_version("Gtk", "3.0")
-from gi.repository import Gtk
+from gi.repository import GLib, Gtk
 
-from ..config import get_games_dir
+from ..config import AppConfig, create_game_config
 from ..config import load_app_config as load_config
 from ..config import save_app_config as save_config
 from ..models import Game
+from ..saving import SaveManager
+from ..statcache import stat_cache
 
 
 class AddGameDialog(Gtk.Dialog):
     """Dialog for adding a new game to the library."""
 
-    def __init__(self, parent: Gtk.Window, on_game_added: Callable[[], None] | None = None) -> None:
+    def __init__(
+        self,
+        parent: Gtk.Window,
+        on_game_added: Callable[[], None] | None = None,
+        config: AppConfig | None = None,
+        save_manager: SaveManager | None = None,
+    ) -> None:
         super().__init__(title="Add Game", transient_for=parent, flags=0)
 
         self.on_game_added = on_game_added
+        self.config = config
+        self.save_manager = save_manager
 
         builder = Gtk.Builder()
         builder.add_from_file("UI/addgamedlg.ui")
@@ -30,15 +40,17 @@ class AddGameDialog(Gtk.Dialog):
         self.exe_path_entry: Gtk.Entry = builder.get_object("exe_path_entry")
         self.config_path_entry: Gtk.Entry = builder.get_object("config_file_entry")
 
-        save_button = builder.get_object("save_button")
+        self.save_button: Gtk.Button = builder.get_object("save_button")
         cancel_button = builder.get_object("cancel_button")
         choose_exe_btn = builder.get_object("choose_exe_btn")
         choose_path_btn = builder.get_object("choose_path_btn")
 
-        save_button.connect("clicked", self._on_save_clicked)
+        self.save_button.connect("clicked", self._on_save_clicked)
         cancel_button.connect("clicked", self._on_cancel_clicked)
         choose_exe_btn.connect("clicked", self._on_choose_exe_clicked)
         choose_path_btn.connect("clicked", self._on_choose_path_clicked)
+        self._closed = False
+        self.dialog.connect("destroy", self._on_dialog_destroyed)
 
         self.dialog.show()
 
@@ -64,36 +76,67 @@ class AddGameDialog(Gtk.Dialog):
             self._show_error("Game name is required.")
             return
 
-        if not exe_path or not os.path.exists(exe_path):
+        if not exe_path or not stat_cache.exists(exe_path):
             self._show_error("Game executable not found. Please select a valid executable.")
             return
 
-        if not config_path or not os.path.isdir(config_path):
+        if not config_path or not stat_cache.isdir(config_path):
             self._show_error("Config directory not found. Please select a valid directory.")
             return
 
-        games_dir = get_games_dir()
+        config = self.config or load_config()
         game = Game(
             name=name,
             exe_path=exe_path,
             config_path=config_path,
         )
 
-        self._create_game_config(game, games_dir)
+        self.save_button.set_sensitive(False)
+        threading.Thread(
+            target=self._check_duplicate,
+            args=(config, game),
+            name="duplicate-check",
+            daemon=True,
+        ).start()
+
+    def _check_duplicate(self, config: AppConfig, game: Game) -> None:
+        """Look for the game's executable in the library, off the GTK thread.
+
+        Comparing contents stats the library's executables the first time,
+        and hashes those of the same size, which is slow on a network share.
+        """
+        duplicate = config.games.find_duplicate(game.exe_path, check_content=True)
+        GLib.idle_add(self._add_game, config, game, duplicate)
+
+    def _add_game(self, config: AppConfig, game: Game, duplicate: Game | None) -> bool:
+        """Add the game, unless it turned out to be in the library already."""
+        if self._closed:
+            return False  # Cancelled while the check ran
+        self.save_button.set_sensitive(True)
+        if duplicate:
+            self._show_error(f"This executable is already in the library as {duplicate.name}.")
+            return False
+
+        create_game_config(game)
 
-        config = load_config()
         config.games.add(game)
-        save_config(config)
+        if self.save_manager is None:
+            save_config(config)
 
         self.dialog.destroy()
 
         if self.on_game_added:
             self.on_game_added()
+        return False
 
     def _on_cancel_clicked(self, btn: Gtk.Button) -> None:
         """Close the dialog without saving."""
         self.dialog.destroy()
 
+    def _on_dialog_destroyed(self, _dialog: Gtk.Dialog) -> None:
+        """Drop a game still being checked when the dialog closes."""
+        self._closed = True
+
     def _on_choose_exe_clicked(self, btn: Gtk.Button) -> None:
         """Open file chooser for game executable."""
         chooser = Gtk.FileChooserDialog(
@@ -133,16 +176,3 @@ class AddGameDialog(Gtk.Dialog):
             if path:
                 self.config_path_entry.set_text(path)
         dialog.destroy()
-
-    def _create_game_config(self, game: Game, games_dir) -> None:
-        """Create default config file for the game."""
-        default_config_path = games_dir / "base-config.conf"
-        game_config_path = game.get_config_file_path()
-
-        if not default_config_path.exists():
-            default_config_path = "base-config.conf"
-
-        if os.path.exists(default_config_path):
-            with open(default_config_path) as reader:
-                with open(game_config_path, "w") as writer:
-                    writer.write(reader.read())
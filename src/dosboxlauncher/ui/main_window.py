@@ -1,16 +1,29 @@
 """Main window UI for DOSBox Launcher."""
 
 import subprocess
+import threading
+from collections.abc import Iterable, Iterator
+from itertools import islice
 
 import gi
 
 gi.require_version("Gdk", "3.0")
 gi.require_version("Gtk", "3.0")
-from gi.repository import Gdk, Gtk
+from gi.repository import Gdk, Gio, GLib, Gtk
 
-from ..config import load_app_config
+from ..config import get_storage, load_app_config, reload_app_config
 from ..exceptions import ConfigError
-from ..models import Game
+from ..health import HealthChecker
+from ..models import ChangeKind, Game, GameLibrary, LibraryChange, _id_key
+from ..saving import SaveManager
+from ..validation import LAUNCH_CHECK_TIMEOUT, LaunchCheck, ValidationReport, check_launch
+
+# Milliseconds to wait for a burst of file changes to settle before reloading
+RELOAD_DELAY = 250
+# Most games listed for a search; typing more narrows the rest down
+SEARCH_LIMIT = 50
+# Rows added to the game list at a time, as it is scrolled to the bottom
+LIST_PAGE = 200
 
 
 class MainWindow(Gtk.ApplicationWindow):
@@ -25,8 +38,22 @@ class MainWindow(Gtk.ApplicationWindow):
             self._show_error_dialog(f"Failed to load configuration: {e}")
             self.config = None
 
-        self.game_library = self.config.games if self.config else None
+        self.game_library: GameLibrary | None = None
+        self._search_session = None
+        self._unsubscribe_library = None
+        self._more_games: Iterator[Game] | None = None
+        self._rows: dict[str, Gtk.ListBoxRow] = {}
+        self.save_manager: SaveManager | None = None
+        self.health_checker: HealthChecker | None = None
+        self._config_monitors: list[Gio.FileMonitor] = []
+        self._reload_source: int | None = None
+        if self.config:
+            self._set_library(self.config.games)
+            self.save_manager = SaveManager(self.config, on_error=self._on_save_failed)
+            self._watch_config()
+            self._start_health_checker()
         self._is_launching = False
+        self._launch_cancel: threading.Event | None = None
 
         builder = Gtk.Builder()
         try:
@@ -49,16 +76,21 @@ class MainWindow(Gtk.ApplicationWindow):
 
         self.game_list: Gtk.ListBox = builder.get_object("game_list")
         self.add_game_btn: Gtk.Button = builder.get_object("addGameBtn")
+        self.scan_games_btn: Gtk.Button = builder.get_object("scan_games_btn")
         self.edit_config_btn: Gtk.Button = builder.get_object("edit_config_btn")
         self.launch_game_btn: Gtk.Button = builder.get_object("launch_game_btn")
         self.search_entry: Gtk.SearchEntry | None = builder.get_object("search_entry")
 
         self.add_game_btn.connect("clicked", self._on_add_game_clicked)
+        self.scan_games_btn.connect("clicked", self._on_scan_games_clicked)
         self.edit_config_btn.connect("clicked", self._on_edit_config_clicked)
         self.launch_game_btn.connect("clicked", self._on_launch_game_clicked)
         self.game_list.connect("button-press-event", self._on_game_list_button_press)
         if self.search_entry:
             self.search_entry.connect("search_changed", self._on_search_changed)
+        scrolled = self.game_list.get_ancestor(Gtk.ScrolledWindow)
+        if scrolled:
+            scrolled.get_vadjustment().connect("value-changed", self._on_list_scrolled)
 
         self._refresh_game_list()
 
@@ -88,23 +120,211 @@ class MainWindow(Gtk.ApplicationWindow):
 
     def _reload_config(self) -> None:
         """Reload configuration from disk."""
+        self.close_save_manager()
         self.config = load_app_config()
-        self.game_library = self.config.games
+        self._set_library(self.config.games)
+        self.save_manager = SaveManager(self.config, on_error=self._on_save_failed)
+        self._watch_config()
+        self._start_health_checker()
+
+    def _start_health_checker(self) -> None:
+        """Check the games in the background and badge the broken ones."""
+        self.stop_health_checker()
+        self.health_checker = HealthChecker(self.game_library, on_result=self._on_health_result)
+        self.health_checker.start()
+
+    def stop_health_checker(self) -> None:
+        """Stop checking games in the background."""
+        if self.health_checker is not None:
+            self.health_checker.stop()
+            self.health_checker = None
+
+    def _on_health_result(self, report: ValidationReport) -> None:
+        """Update a game's badge on the GTK thread, when it is otherwise idle."""
+        GLib.idle_add(self._show_health, report, priority=GLib.PRIORITY_LOW)
+
+    def _show_health(self, report: ValidationReport) -> bool:
+        """Show or hide the broken-game badge of a game's row."""
+        row = self._rows.get(report.game_id)
+        if row is not None:
+            self._set_badge(row, report)
+        return False
+
+    def _set_badge(self, row: Gtk.ListBoxRow, report: ValidationReport | None) -> None:
+        """Show a warning badge on a row if its game failed its last check."""
+        if report is None or report.is_valid:
+            row.badge.hide()
+        else:
+            row.badge.set_tooltip_text("\n".join(report.errors))
+            row.badge.show()
+
+    def _on_list_scrolled(self, adjustment: Gtk.Adjustment) -> None:
+        """List more games near the bottom and check the ones in view first."""
+        bottom = adjustment.get_value() + adjustment.get_page_size()
+        if bottom >= adjustment.get_upper() - adjustment.get_page_size():
+            self._show_more()
+        self._prioritize_visible()
+
+    def _prioritize_visible(self) -> None:
+        """Have the health checker check the games on screen next."""
+        scrolled = self.game_list.get_ancestor(Gtk.ScrolledWindow)
+        if self.health_checker is None or scrolled is None:
+            return
+        adjustment = scrolled.get_vadjustment()
+        top = self.game_list.get_row_at_y(int(adjustment.get_value()))
+        bottom = self.game_list.get_row_at_y(
+            int(adjustment.get_value() + adjustment.get_page_size()) - 1
+        )
+        if top is None:
+            return
+        last = bottom.get_index() if bottom is not None else len(self._rows) - 1
+        rows = (self.game_list.get_row_at_index(i) for i in range(top.get_index(), last + 1))
+        self.health_checker.prioritize(_id_key(row.game) for row in rows if hasattr(row, "game"))
+
+    def _watch_config(self) -> None:
+        """Follow changes other programs make to the configuration files."""
+        for monitor in self._config_monitors:
+            monitor.cancel()
+        self._config_monitors = []
+        try:
+            paths = get_storage(self.config.storage).watched_paths()
+        except ConfigError:
+            return
+        for path in paths:
+            try:
+                monitor = Gio.File.new_for_path(str(path)).monitor_file(
+                    Gio.FileMonitorFlags.WATCH_MOVES, None
+                )
+            except GLib.Error:
+                continue
+            monitor.connect("changed", self._on_config_file_changed)
+            self._config_monitors.append(monitor)
+
+    def _on_config_file_changed(
+        self,
+        _monitor: Gio.FileMonitor,
+        _file: Gio.File,
+        _other: Gio.File | None,
+        event: Gio.FileMonitorEvent,
+    ) -> None:
+        """Reload the configuration once a burst of file changes settles."""
+        if event in (Gio.FileMonitorEvent.ATTRIBUTE_CHANGED, Gio.FileMonitorEvent.PRE_UNMOUNT):
+            return
+        if self._reload_source is not None:
+            GLib.source_remove(self._reload_source)
+        self._reload_source = GLib.timeout_add(RELOAD_DELAY, self._apply_config_changes)
+
+    def _apply_config_changes(self) -> bool:
+        """Bring the library up to date with the files, changing only what differs.
+
+        Our own saves trigger this too; backends that keep a generation
+        number then see the files match the library without reading them.
+        """
+        self._reload_source = None
+        if self.config is None:
+            return False
+        try:
+            if self.save_manager is None:
+                reload_app_config(self.config)
+            else:
+                with self.save_manager.paused():
+                    reload_app_config(self.config)
+        except ConfigError as e:
+            self._show_error_dialog(f"Failed to reload configuration: {e}")
+        return False
 
-    def _refresh_game_list(self, games: list[Game] | None = None) -> None:
-        """Refresh the game list display."""
+    def close_save_manager(self) -> None:
+        """Write any pending changes and stop saving in the background."""
+        if self.save_manager is None:
+            return
+        try:
+            self.save_manager.close()
+        except ConfigError as e:
+            self._show_error_dialog(f"Failed to save configuration: {e}")
+        self.save_manager = None
+
+    def _on_save_failed(self, error: ConfigError) -> None:
+        """Report a failed background save on the GTK thread."""
+        GLib.idle_add(self._show_error_dialog, f"Failed to save configuration: {error}")
+
+    def _set_library(self, library: GameLibrary) -> None:
+        """Show a library and follow its changes."""
+        if self._unsubscribe_library:
+            self._unsubscribe_library()
+        self.game_library = library
+        # Built on the first search, as it builds the search index
+        self._search_session = None
+        self._more_games = None
+        self._unsubscribe_library = library.subscribe(self._on_library_changed)
+
+    def _refresh_game_list(self, games: Iterable[Game] | None = None) -> None:
+        """Refresh the game list display.
+
+        Rows are only created for the first page of games; the rest are
+        listed as the list is scrolled down.
+        """
         for child in self.game_list.get_children():
             self.game_list.remove(child)
-
-        games = games or self.game_library.all()
+        self._rows.clear()
+
+        # The whole library is paged from the library itself, so games
+        # added or removed meanwhile are picked up
+        self._more_games = iter(games) if games else None
+        self._show_more()
+        self._prioritize_visible()
+
+    def _show_more(self) -> None:
+        """Add the next page of games to the end of the list."""
+        if self._more_games is None:
+            games = self.game_library.page(len(self._rows), LIST_PAGE)
+        else:
+            games = islice(self._more_games, LIST_PAGE)
         for game in games:
-            row = Gtk.ListBoxRow()
-            label = Gtk.Label(label=game.name)
-            label.set_xalign(0)
-            row.add(label)
-            row.show_all()
-            row.game = game
-            self.game_list.add(row)
+            self._append_row(game)
+
+    def _append_row(self, game: Game) -> None:
+        """Add a row for a game to the end of the list."""
+        row = Gtk.ListBoxRow()
+        box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
+        row.label = Gtk.Label(label=game.name)
+        row.label.set_xalign(0)
+        box.pack_start(row.label, True, True, 0)
+        row.badge = Gtk.Image.new_from_icon_name("dialog-warning-symbolic", Gtk.IconSize.MENU)
+        row.badge.set_no_show_all(True)
+        box.pack_end(row.badge, False, False, 0)
+        row.add(box)
+        row.show_all()
+        row.game = game
+        self.game_list.add(row)
+        # Keyed without decoding lazily loaded IDs
+        key = _id_key(game)
+        self._rows[key] = row
+        if self.health_checker is not None:
+            self._set_badge(row, self.health_checker.status(key))
+
+    def _on_library_changed(self, change: LibraryChange) -> None:
+        """Apply a library change to the list rows it affects."""
+        if self.search_entry and self.search_entry.get_text():
+            self._on_search_changed(self.search_entry)
+            return
+
+        if change.kind is ChangeKind.ADDED:
+            # Games past the last listed page are listed on scrolling down
+            if len(self._rows) + len(change.ids) >= len(self.game_library):
+                for game_id in change.ids:
+                    self._append_row(self.game_library.get(game_id))
+            return
+
+        for game_id in change.ids:
+            row = self._rows.get(game_id)
+            if row is None:
+                continue
+            if change.kind is ChangeKind.REMOVED:
+                self.game_list.remove(row)
+                del self._rows[game_id]
+            else:
+                row.game = self.game_library.get(game_id)
+                row.label.set_text(row.game.name)
 
     def _on_game_list_button_press(self, _widget: Gtk.ListBox, event: Gdk.EventButton) -> bool:
         """Launch a game only on mouse double-click."""
@@ -126,8 +346,12 @@ class MainWindow(Gtk.ApplicationWindow):
         query = entry.get_text()
         if not self.search_entry:
             return
-        if query:
-            filtered = self.game_library.search(query)
+        if ":" in query:
+            self._refresh_game_list(self.game_library.query(query))
+        elif query:
+            if self._search_session is None:
+                self._search_session = self.game_library.search_session(limit=SEARCH_LIMIT)
+            filtered = self._search_session.search(query)
             self._refresh_game_list(filtered)
         else:
             self._refresh_game_list()
@@ -136,11 +360,42 @@ class MainWindow(Gtk.ApplicationWindow):
         """Open the add game dialog."""
         from .add_game_dialog import AddGameDialog
 
-        def on_game_added():
-            self._reload_config()
-            self._refresh_game_list()
+        if self.config is None:
+            AddGameDialog(self, on_game_added=self._on_game_added)
+        else:
+            # The new game reaches the list through the library change event
+            AddGameDialog(self, config=self.config, save_manager=self.save_manager)
+
+    def _on_scan_games_clicked(self, btn: Gtk.Button) -> None:
+        """Choose folders to scan for games."""
+        if self.config is None:
+            self._show_error_dialog("Cannot scan for games without a loaded configuration.")
+            return
+        chooser = Gtk.FileChooserDialog(
+            title="Select Folders to Scan",
+            parent=self,
+            action=Gtk.FileChooserAction.SELECT_FOLDER,
+        )
+        chooser.set_select_multiple(True)
+        chooser.add_button(Gtk.STOCK_CANCEL, Gtk.ResponseType.CANCEL)
+        chooser.add_button(Gtk.STOCK_OPEN, Gtk.ResponseType.ACCEPT)
+        chooser.connect("response", self._on_scan_folders_chosen)
+        chooser.show()
+
+    def _on_scan_folders_chosen(self, dialog: Gtk.FileChooserDialog, response_id: int) -> None:
+        """Scan the chosen folders for games."""
+        roots = dialog.get_filenames() if response_id == Gtk.ResponseType.ACCEPT else []
+        dialog.destroy()
+        if roots:
+            from .scan_dialog import ScanDialog
+
+            # Added games reach the list through the library change event
+            ScanDialog(self, roots, self.config, save_manager=self.save_manager)
 
-        AddGameDialog(self, on_game_added=on_game_added)
+    def _on_game_added(self) -> None:
+        """Pick up a game added without a loaded configuration."""
+        self._reload_config()
+        self._refresh_game_list()
 
     def _on_edit_config_clicked(self, btn: Gtk.Button) -> None:
         """Open the config editor for selected game."""
@@ -153,8 +408,9 @@ class MainWindow(Gtk.ApplicationWindow):
             self._show_error_dialog("Please select a game first.")
 
     def _on_launch_game_clicked(self, btn: Gtk.Button) -> None:
-        """Launch the selected game with DOSBox."""
+        """Launch the selected game with DOSBox, or cancel a launch in progress."""
         if self._is_launching:
+            self._cancel_launch()
             return
 
         selected = self.game_list.get_selected_row()
@@ -165,28 +421,69 @@ class MainWindow(Gtk.ApplicationWindow):
         self._launch_game(selected.game)
 
     def _launch_game(self, game: Game) -> None:
-        """Launch a specific game with DOSBox."""
+        """Check a game's files on a worker thread, then launch it with DOSBox.
+
+        The checks wait at most ``AppConfig.launch_timeout`` seconds, and
+        while they run the launch button cancels the launch.
+        """
         if self._is_launching:
             return
 
-        is_valid, errors = game.validate(check_config_file=False)
-
-        if not is_valid:
-            self._show_error_dialog(f"Cannot launch {game.name}:\n" + "\n".join(errors))
-            return
+        self._is_launching = True
+        cancel = threading.Event()
+        self._launch_cancel = cancel
+        self._launch_label = self.launch_game_btn.get_label()
+        self.launch_game_btn.set_label("Cancel Launch")
+        self.launch_game_btn.set_tooltip_text(f"Launching {game.name}...")
+
+        timeout = self.config.launch_timeout if self.config else LAUNCH_CHECK_TIMEOUT
+        threading.Thread(
+            target=self._check_before_launch,
+            args=(game, timeout, cancel),
+            name="launch",
+            daemon=True,
+        ).start()
+
+    def _check_before_launch(self, game: Game, timeout: float, cancel: threading.Event) -> None:
+        """Check a game's files, off the GTK thread, and finish the launch on it."""
+        result = check_launch(game, timeout, cancel)
+        GLib.idle_add(self._finish_launch, game, result, cancel)
+
+    def _cancel_launch(self) -> None:
+        """Stop a launch whose files are still being checked."""
+        if self._launch_cancel is not None:
+            self._launch_cancel.set()
+        self._end_launch()
+
+    def _end_launch(self) -> None:
+        """Leave the launching state."""
+        self._is_launching = False
+        self._launch_cancel = None
+        self.launch_game_btn.set_label(self._launch_label)
+        self.launch_game_btn.set_tooltip_text(None)
 
-        config_file = game.get_config_file_path()
+    def _finish_launch(self, game: Game, result: LaunchCheck, cancel: threading.Event) -> bool:
+        """Start DOSBox once a game's files have been checked."""
+        if cancel.is_set() or cancel is not self._launch_cancel:
+            return False
+        self._end_launch()
+
+        if not result.ok:
+            problems = list(result.errors)
+            if result.timed_out:
+                problems.append("Not responding (is a network drive unavailable?):")
+                problems.extend(f"  {path}" for path in result.timed_out)
+            self._show_error_dialog(f"Cannot launch {game.name}:\n" + "\n".join(problems))
+            return False
 
-        self._is_launching = True
-        self.launch_game_btn.set_sensitive(False)
+        if self.health_checker is not None:
+            self.health_checker.played(_id_key(game))
 
         try:
-            subprocess.Popen(["dosbox", "-conf", config_file])
+            subprocess.Popen(["dosbox", "-conf", game.get_config_file_path()])
         except FileNotFoundError:
             self._show_error_dialog(
                 "DOSBox is not installed or not found in PATH. "
                 "Please install DOSBox to launch games."
             )
-        finally:
-            self._is_launching = False
-            self.launch_game_btn.set_sensitive(True)
+        return False
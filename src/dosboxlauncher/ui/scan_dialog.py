@@ -0,0 +1,142 @@
+"""Scan for games dialog."""
+
+import dataclasses
+import threading
+
+import gi
+
+gi.require_version("Gtk", "3.0")
+from gi.repository import GLib, Gtk
+
+from ..config import AppConfig, create_game_config, get_games_dir, save_app_config
+from ..saving import SaveManager
+from ..scanner import Proposal, ScanProgress, scan_games
+
+# Milliseconds between moving newly found games into the list
+SCAN_REFRESH = 200
+
+
+class ScanDialog(Gtk.Dialog):
+    """Dialog that scans folders for DOS games and adds the chosen ones.
+
+    The scan runs on a background thread; games appear in the list while
+    it goes on and can be added before it finishes.
+    """
+
+    def __init__(
+        self,
+        parent: Gtk.Window,
+        roots: list[str],
+        config: AppConfig,
+        save_manager: SaveManager | None = None,
+    ) -> None:
+        super().__init__(title="Scan for Games", transient_for=parent, flags=0)
+        self.set_default_size(600, 400)
+
+        self.config = config
+        self.save_manager = save_manager
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._found: list[Proposal] = []
+        self._status = ScanProgress()
+        self._finished = False
+
+        self.status_label = Gtk.Label(label="Scanning...", xalign=0)
+        self.game_list = Gtk.ListBox()
+        self.game_list.set_selection_mode(Gtk.SelectionMode.NONE)
+        scrolled = Gtk.ScrolledWindow(vexpand=True)
+        scrolled.add(self.game_list)
+        content = self.get_content_area()
+        content.set_spacing(6)
+        content.pack_start(self.status_label, False, False, 0)
+        content.pack_start(scrolled, True, True, 0)
+
+        self.stop_button = self.add_button("Stop", Gtk.ResponseType.CANCEL)
+        self.add_button("Add Selected", Gtk.ResponseType.ACCEPT)
+        self.add_button("Close", Gtk.ResponseType.CLOSE)
+        self.connect("response", self._on_response)
+        self.connect("destroy", self._on_destroy)
+        self.show_all()
+
+        threading.Thread(target=self._scan, args=(roots,), name="scan", daemon=True).start()
+        self._refresh_source: int | None = GLib.timeout_add(SCAN_REFRESH, self._show_found)
+
+    def _scan(self, roots: list[str]) -> None:
+        """Walk the folders, off the GTK thread, collecting what is found."""
+
+        def report(status: ScanProgress) -> None:
+            with self._lock:
+                self._status = dataclasses.replace(status)
+
+        try:
+            for proposal in scan_games(
+                roots, library=self.config.games, cancel=self._cancel, progress=report
+            ):
+                with self._lock:
+                    self._found.append(proposal)
+        finally:
+            with self._lock:
+                self._finished = True
+
+    def _show_found(self) -> bool:
+        """Move the games found since the last call into the list."""
+        with self._lock:
+            found, self._found = self._found, []
+            status = self._status
+            finished = self._finished
+
+        for proposal in found:
+            self._append_row(proposal)
+
+        text = f"{status.directories} folders scanned, {status.found} games found"
+        if status.known:
+            text += f", {status.known} already in the library"
+        if not finished:
+            text = f"Scanning... {text}"
+        elif self._cancel.is_set():
+            text = f"Stopped. {text}"
+        self.status_label.set_text(text)
+        self.stop_button.set_sensitive(not finished and not self._cancel.is_set())
+        if finished:
+            self._refresh_source = None
+        return not finished
+
+    def _append_row(self, proposal: Proposal) -> None:
+        """Add a game to the list, ticked to be added."""
+        row = Gtk.ListBoxRow()
+        row.check = Gtk.CheckButton(label=proposal.name, active=True)
+        row.check.set_tooltip_text(proposal.exe_path)
+        row.add(row.check)
+        row.proposal = proposal
+        row.show_all()
+        self.game_list.add(row)
+
+    def _on_destroy(self, _dialog: Gtk.Dialog) -> None:
+        """Stop the scan along with the dialog."""
+        self._cancel.set()
+        if self._refresh_source is not None:
+            GLib.source_remove(self._refresh_source)
+            self._refresh_source = None
+
+    def _on_response(self, _dialog: Gtk.Dialog, response_id: int) -> None:
+        if response_id == Gtk.ResponseType.CANCEL:
+            self._cancel.set()
+            self.stop_button.set_sensitive(False)
+        elif response_id == Gtk.ResponseType.ACCEPT:
+            self._add_selected()
+        else:
+            self.destroy()
+
+    def _add_selected(self) -> None:
+        """Add the ticked games to the library and drop them from the list."""
+        config_dir = self.config.default_config_dir or str(get_games_dir())
+        rows = [row for row in self.game_list.get_children() if row.check.get_active()]
+        library = self.config.games
+        with library.batch():
+            for row in rows:
+                game = row.proposal.to_game(config_dir)
+                create_game_config(game)
+                library.add(game)
+                self.game_list.remove(row)
+        if self.save_manager is None:
+            save_app_config(self.config)
@@ -0,0 +1,171 @@
+"""Validating many games at once."""
+
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from .statcache import stat_cache
+
+if TYPE_CHECKING:
+    from .models import Game
+
+# File checks mostly wait on the disk or network, so more threads than
+# cores still help; the cap keeps a slow NAS from being flooded.
+VALIDATION_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+# Seconds to wait for a game's paths before launching it
+LAUNCH_CHECK_TIMEOUT = 3.0
+# How often a launch check waiting on slow paths looks at its cancel event
+LAUNCH_CHECK_POLL = 0.1
+
+
+@dataclass(frozen=True, slots=True)
+class ValidationReport:
+    """The outcome of validating one game.
+
+    Attributes:
+        game_id: Library key of the game.
+        game: The game that was validated.
+        errors: What is wrong with the game, empty if nothing is.
+    """
+
+    game_id: str
+    game: "Game"
+    errors: tuple[str, ...]
+
+    @property
+    def is_valid(self) -> bool:
+        """Whether the game passed every check."""
+        return not self.errors
+
+
+@dataclass(frozen=True, slots=True)
+class LaunchCheck:
+    """The outcome of checking a game's paths before launching it.
+
+    Attributes:
+        errors: What is wrong with the game, such as missing paths.
+        timed_out: Paths that didn't answer in time, such as ones on a
+            stale network mount. Whether they exist is unknown.
+    """
+
+    errors: tuple[str, ...]
+    timed_out: tuple[str, ...]
+
+    @property
+    def ok(self) -> bool:
+        """Whether the game can be launched."""
+        return not self.errors and not self.timed_out
+
+
+def check_launch(
+    game: "Game",
+    timeout: float = LAUNCH_CHECK_TIMEOUT,
+    cancel: threading.Event | None = None,
+) -> LaunchCheck:
+    """Check that a game's executable and config directory exist.
+
+    Each path is checked on its own daemon thread, and paths that don't
+    answer within ``timeout`` seconds are reported as timed out rather
+    than missing. A check stuck in the kernel can't be interrupted, so
+    its thread is left behind to finish on its own.
+
+    Args:
+        game: The game about to be launched.
+        timeout: Seconds to wait for all the paths together.
+        cancel: Set to stop waiting; paths not checked yet are reported
+            as timed out.
+    """
+    errors = []
+    if not game.name:
+        errors.append("Game name cannot be empty")
+    checks = [
+        (game.exe_path, stat_cache.exists, "Game executable not found: {}"),
+        (game.config_path, stat_cache.isdir, "Config directory not found: {}"),
+    ]
+
+    results: dict[int, bool] = {}
+    cond = threading.Condition()
+
+    def run(index: int, path: str, test: Callable[[str], bool]) -> None:
+        found = test(path)
+        with cond:
+            results[index] = found
+            cond.notify()
+
+    for index, (path, test, _) in enumerate(checks):
+        if not path:
+            results[index] = False
+            continue
+        thread = threading.Thread(
+            target=run, args=(index, path, test), name="launch-check", daemon=True
+        )
+        thread.start()
+
+    deadline = time.monotonic() + timeout
+    with cond:
+        while len(results) < len(checks):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or (cancel is not None and cancel.is_set()):
+                break
+            cond.wait(min(remaining, LAUNCH_CHECK_POLL))
+        finished = dict(results)
+
+    timed_out = []
+    for index, (path, _, message) in enumerate(checks):
+        if index not in finished:
+            timed_out.append(path)
+        elif not finished[index]:
+            errors.append(message.format(path))
+    return LaunchCheck(tuple(errors), tuple(timed_out))
+
+
+def validate_games(
+    games: Iterable["Game"],
+    check_config_file: bool = True,
+    max_workers: int = VALIDATION_WORKERS,
+    cancel: threading.Event | None = None,
+    key: Callable[["Game"], str] = lambda game: str(game.id),
+) -> Iterator[ValidationReport]:
+    """Validate games on a pool of threads, yielding reports as they finish.
+
+    At most ``2 * max_workers`` games are queued at a time, so memory
+    doesn't grow with the number of games. Setting ``cancel``, or closing
+    the iterator, stops validation: games not started yet are skipped,
+    and once the games already finished are reported no more follow.
+
+    Args:
+        games: The games to validate.
+        check_config_file: Passed on to ``Game.validate``.
+        max_workers: Number of threads to validate on.
+        cancel: Set to stop validating early.
+        key: Gets the ``game_id`` of a game's report.
+    """
+
+    def validate(game: "Game") -> ValidationReport:
+        _, errors = game.validate(check_config_file=check_config_file)
+        return ValidationReport(key(game), game, tuple(errors))
+
+    def cancelled() -> bool:
+        return cancel is not None and cancel.is_set()
+
+    pending: set[Future] = set()
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="validate")
+    try:
+        for game in games:
+            if cancelled():
+                return
+            pending.add(executor.submit(validate, game))
+            if len(pending) >= 2 * max_workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while pending and not cancelled():
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
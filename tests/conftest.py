@@ -30,7 +30,38 @@ def sample_game(tmp_path):
     )
 
 
+@pytest.fixture
+def config_path(tmp_path, monkeypatch):
+    """Point the app config and games directory into a temporary directory."""
+    import dosboxlauncher.cli as cli_module
+    import dosboxlauncher.config as config_module
+
+    path = tmp_path / "config.yaml"
+    games_dir = tmp_path / "games"
+    games_dir.mkdir()
+    monkeypatch.setattr(config_module, "get_config_path", lambda: path)
+    monkeypatch.setattr(config_module, "get_games_dir", lambda: games_dir)
+    monkeypatch.setattr(cli_module, "get_games_dir", lambda: games_dir)
+    return path
+
+
 @pytest.fixture
 def game_library():
     """Create a game library for testing."""
     return GameLibrary()
+
+
+@pytest.fixture
+def make_library(tmp_path):
+    """Create libraries of numbered games, with no executable for the ``broken`` ones."""
+
+    def make(count: int, broken: set[int] = frozenset()) -> GameLibrary:
+        games = []
+        for i in range(count):
+            exe = tmp_path / f"game{i}.exe"
+            if i not in broken:
+                exe.touch()
+            games.append(Game(name=f"Game {i}", exe_path=str(exe), config_path=str(tmp_path)))
+        return GameLibrary(games)
+
+    return make
@@ -0,0 +1,141 @@
+"""Tests for DOSBox Launcher bulk import and export."""
+
+import io
+import json
+
+import pytest
+
+from dosboxlauncher.bulk import export_games, format_for, game_from_record, import_games
+from dosboxlauncher.config import AppConfig, load_app_config
+from dosboxlauncher.exceptions import ValidationError
+from dosboxlauncher.models import Game, GameLibrary
+
+
+def _jsonl(*records) -> io.StringIO:
+    return io.StringIO("".join(json.dumps(record) + "\n" for record in records))
+
+
+def _games(count: int) -> list[Game]:
+    return [
+        Game(name=f"Game {i}", exe_path=f"/games/{i}.exe", config_path="/games", tags=["DOS"])
+        for i in range(count)
+    ]
+
+
+class TestExport:
+    @pytest.mark.parametrize("fmt", ["jsonl", "csv"])
+    def test_roundtrip(self, config_path, fmt):
+        games = _games(3)
+        games[0].tags = ("DOS", "Shooter")
+        games[1].notes = 'Has "quotes", commas\nand lines'
+        out = io.StringIO()
+
+        assert export_games(GameLibrary(games), out, fmt) == 3
+
+        config = AppConfig()
+        result = import_games(config, io.StringIO(out.getvalue()), fmt)
+        assert (result.added, result.rejected) == (3, 0)
+        assert [g.to_dict() for g in config.games] == [g.to_dict() for g in games]
+
+    def test_reports_progress(self):
+        counts = []
+
+        export_games(GameLibrary(_games(5)), io.StringIO(), "jsonl", counts.append, 2)
+
+        assert counts == [2, 4, 5]
+
+    def test_unknown_format(self):
+        with pytest.raises(ValidationError):
+            export_games(GameLibrary(), io.StringIO(), "xml")
+
+
+class TestImport:
+    def test_saves_in_batches(self, config_path):
+        records = [{"name": f"Game {i}", "exe_path": f"/games/{i}.exe"} for i in range(5)]
+        saved = []
+
+        def progress(result):
+            saved.append((result.processed, len(load_app_config().games)))
+
+        result = import_games(AppConfig(), _jsonl(*records), "jsonl", 2, progress=progress)
+
+        assert result.added == 5
+        assert saved == [(2, 2), (4, 4), (5, 5)]
+
+    def test_rejects_bad_records_and_keeps_going(self, config_path):
+        file = io.StringIO(
+            '{"name": "Doom", "exe_path": "/games/doom.exe"}\n'
+            "not json\n"
+            "\n"
+            '{"exe_path": "/games/nameless.exe"}\n'
+            '{"name": "Doom again", "exe_path": "/games/doom.exe"}\n'
+            '{"name": "Quake", "tags": "FPS"}\n'
+            '{"name": "Keen", "id": "not-a-uuid"}\n'
+            '["Hexen"]\n'
+            '{"name": "Heretic"}\n'
+        )
+
+        result = import_games(AppConfig(), file, "jsonl", batch_size=3)
+
+        assert (result.added, result.rejected) == (2, 6)
+        errors = dict(result.errors)
+        assert sorted(errors) == [2, 4, 5, 6, 7, 8]
+        assert errors[5] == "Executable already in the library as Doom"
+        assert [g.name for g in load_app_config().games] == ["Doom", "Heretic"]
+
+    def test_existing_id_updates_game(self, config_path):
+        game = Game(name="Doom", exe_path="/games/doom.exe", config_path="/games")
+        config = AppConfig(games=GameLibrary([game]))
+        record = {**game.to_dict(), "name": "Doom II", "notes": "Sequel"}
+
+        result = import_games(config, _jsonl(record), "jsonl")
+
+        assert (result.added, result.updated) == (0, 1)
+        assert config.games.get(game.id).name == "Doom II"
+        assert load_app_config().games.get(game.id).notes == "Sequel"
+
+    def test_check_files(self, config_path, tmp_path):
+        exe = tmp_path / "game.exe"
+        exe.touch()
+        records = [
+            {"name": "Present", "exe_path": str(exe), "config_path": str(tmp_path)},
+            {"name": "Missing", "exe_path": str(tmp_path / "gone.exe")},
+        ]
+
+        result = import_games(AppConfig(), _jsonl(*records), "jsonl", check_files=True)
+
+        assert (result.added, result.rejected) == (1, 1)
+        assert "not found" in result.errors[0][1]
+
+    def test_creates_config_files(self, config_path, tmp_path):
+        (tmp_path / "games" / "base-config.conf").write_text("[cpu]\ncycles=max\n")
+        exe = tmp_path / "game.exe"
+        exe.touch()
+        record = {"name": "Doom", "exe_path": str(exe), "config_path": str(tmp_path)}
+
+        import_games(config := AppConfig(), _jsonl(record), "jsonl")
+
+        game = config.games.get_by_name("Doom")
+        assert (tmp_path / f"{game.id}.conf").read_text() == "[cpu]\ncycles=max\n"
+        assert game.validate() == (True, [])
+
+    def test_csv_tags(self, config_path):
+        file = io.StringIO("name,exe_path,tags\nDoom,/games/doom.exe,DOS; Shooter\n")
+
+        import_games(config := AppConfig(), file, "csv")
+
+        assert config.games.get_by_name("Doom").tags == ("DOS", "Shooter")
+
+
+class TestRecords:
+    def test_game_from_record_defaults(self):
+        game = game_from_record({"name": " Doom "})
+
+        assert game.name == "Doom"
+        assert (game.exe_path, game.config_path, game.notes, game.tags) == ("", "", "", ())
+
+    def test_format_for(self):
+        assert format_for("games.JSONL") == "jsonl"
+        assert format_for("games.csv") == "csv"
+        with pytest.raises(ValidationError):
+            format_for("games.txt")
@@ -0,0 +1,82 @@
+"""Tests for DOSBox Launcher command line tools."""
+
+import json
+
+from dosboxlauncher.cli import main
+from dosboxlauncher.config import load_app_config
+
+
+class TestCli:
+    def test_import_then_export(self, config_path, tmp_path, capsys):
+        source = tmp_path / "games.csv"
+        source.write_text("name,exe_path\nDoom,/games/doom.exe\nQuake,/games/quake.exe\n")
+        target = tmp_path / "library.jsonl"
+
+        assert main(["import", str(source)]) == 0
+        assert main(["export", str(target), "--quiet"]) == 0
+
+        assert [json.loads(line)["name"] for line in target.read_text().splitlines()] == [
+            "Doom",
+            "Quake",
+        ]
+        err = capsys.readouterr().err
+        assert "2 records read: 2 added, 0 updated, 0 rejected" in err
+        assert "games written" not in err
+
+    def test_import_reports_rejected_records(self, config_path, tmp_path, capsys):
+        source = tmp_path / "games.jsonl"
+        source.write_text('{"name": "Doom"}\n{"name": ""}\n')
+
+        assert main(["import", str(source), "-q"]) == 1
+
+        assert f"{source}:2: Game name cannot be empty" in capsys.readouterr().err
+        assert [g.name for g in load_app_config().games] == ["Doom"]
+
+    def test_unknown_extension(self, config_path, tmp_path, capsys):
+        assert main(["export", str(tmp_path / "library.txt")]) == 2
+        assert "Unknown file format" in capsys.readouterr().err
+
+    def test_validate_lists_broken_games(self, config_path, tmp_path, capsys):
+        from dosboxlauncher.config import save_app_config
+        from dosboxlauncher.models import Game
+
+        exe = tmp_path / "doom.exe"
+        exe.touch()
+        config = load_app_config()
+        config.games.add(Game(name="Doom", exe_path=str(exe), config_path=str(tmp_path)))
+        config.games.add(Game(name="Quake", exe_path=str(tmp_path / "gone.exe"), config_path=""))
+        save_app_config(config)
+
+        assert main(["validate", "--skip-config-file"]) == 1
+
+        out, err = capsys.readouterr()
+        assert out.startswith("Quake (")
+        assert "Doom" not in out
+        assert "2 games checked, 1 with problems" in err
+
+    def test_scan_lists_and_adds_games(self, config_path, tmp_path, capsys):
+        exe = tmp_path / "dos" / "DOOM" / "DOOM.EXE"
+        exe.parent.mkdir(parents=True)
+        exe.write_bytes(b"MZ" + bytes(62))
+
+        assert main(["scan", str(tmp_path / "dos"), "--add"]) == 0
+        assert main(["scan", str(tmp_path / "dos")]) == 0
+
+        out, err = capsys.readouterr()
+        assert out == f"DOOM\t{exe}\n"
+        assert "1 games found, 0 already in the library" in err
+        assert "0 games found, 1 already in the library" in err
+        assert [(g.name, g.exe_path) for g in load_app_config().games] == [("DOOM", str(exe))]
+
+    def test_scan_creates_game_configs(self, config_path, tmp_path):
+        games_dir = tmp_path / "games"
+        (games_dir / "base-config.conf").write_text("[cpu]\ncycles=max\n")
+        exe = tmp_path / "dos" / "SETTLERS" / "SETTLERS.EXE"
+        exe.parent.mkdir(parents=True)
+        exe.write_bytes(b"MZ" + bytes(62))
+
+        assert main(["scan", str(tmp_path / "dos"), "--add", "-q"]) == 0
+
+        (game,) = load_app_config().games
+        assert game.name == "SETTLERS"
+        assert (games_dir / f"{game.id}.conf").read_text() == "[cpu]\ncycles=max\n"
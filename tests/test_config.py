@@ -12,6 +12,7 @@ from dosboxlauncher.config import (
     save_app_config,
 )
 from dosboxlauncher.models import Game, GameLibrary
+from dosboxlauncher.validation import LAUNCH_CHECK_TIMEOUT
 
 
 class TestAppConfig:
@@ -126,6 +127,15 @@ class TestLoadSaveConfig:
 
         assert nested_path.exists()
 
+    def test_launch_timeout_roundtrip(self, tmp_path, monkeypatch):
+        import dosboxlauncher.config as config_module
+
+        monkeypatch.setattr(config_module, "get_config_path", lambda: tmp_path / "config.yaml")
+
+        assert load_app_config().launch_timeout == LAUNCH_CHECK_TIMEOUT
+        save_app_config(AppConfig(launch_timeout=0.5))
+        assert load_app_config().launch_timeout == 0.5
+
 
 class TestConfigErrors:
     def test_load_config_invalid_yaml(self, tmp_path, monkeypatch):
@@ -212,3 +222,78 @@ class TestMigrateFromJson:
         config = config_module.migrate_from_json(str(json_path))
 
         assert isinstance(config, AppConfig)
+
+    def test_migrate_from_json_twice_skips_existing(self, tmp_path, monkeypatch):
+        import dosboxlauncher.config as config_module
+
+        config_path = tmp_path / "config.yaml"
+        monkeypatch.setattr(config_module, "get_config_path", lambda: config_path)
+
+        json_path = tmp_path / "games.json"
+        json_path.write_text(
+            '[{"name": "Game1", "config_file": "/path/to/config1"}, '
+            '{"name": "Game2", "config_file": "/path/to/config2"}]'
+        )
+
+        config_module.migrate_from_json(str(json_path))
+        config = config_module.migrate_from_json(str(json_path))
+
+        assert len(config.games) == 2
+
+    def test_migrate_from_json_resumes_after_interruption(self, tmp_path, monkeypatch):
+        import json
+
+        import dosboxlauncher.config as config_module
+        from dosboxlauncher.exceptions import ConfigError
+
+        config_path = tmp_path / "config.yaml"
+        monkeypatch.setattr(config_module, "get_config_path", lambda: config_path)
+        monkeypatch.setattr(config_module, "get_games_dir", lambda: tmp_path / "games")
+
+        json_path = tmp_path / "games.json"
+        json_path.write_text(
+            json.dumps([{"name": f"Game{i}", "config_file": f"/path/{i}"} for i in range(5)])
+        )
+        save = config_module.save_app_config
+        saves = []
+
+        def interrupted_save(config):
+            saves.append(len(config.games))
+            if len(saves) == 2:
+                raise ConfigError("disk full")
+            save(config)
+
+        monkeypatch.setattr(config_module, "save_app_config", interrupted_save)
+        with pytest.raises(ConfigError):
+            config_module.migrate_from_json(str(json_path), batch_size=2)
+        checkpoint = json.loads((tmp_path / "games.json.checkpoint").read_text())
+        assert checkpoint["done"] == 2
+
+        config = config_module.migrate_from_json(str(json_path), batch_size=2)
+
+        assert saves == [2, 4, 4, 5]
+        assert [g.name for g in config.games] == [f"Game{i}" for i in range(5)]
+        assert not (tmp_path / "games.json.checkpoint").exists()
+        assert not (tmp_path / "games.json.errors").exists()
+
+    def test_migrate_from_json_reports_bad_records(self, tmp_path, monkeypatch):
+        import json
+
+        import dosboxlauncher.config as config_module
+
+        config_path = tmp_path / "config.yaml"
+        monkeypatch.setattr(config_module, "get_config_path", lambda: config_path)
+        monkeypatch.setattr(config_module, "get_games_dir", lambda: tmp_path / "games")
+
+        json_path = tmp_path / "games.json"
+        json_path.write_text(
+            '[{"name": "Game1", "config_file": "/path/1"}, "Game2", '
+            '{"name": 3}, {"name": "Game4", "config_file": "/path/4"}, {"name": "Game5"'
+        )
+
+        config = config_module.migrate_from_json(str(json_path), batch_size=2)
+
+        assert [g.name for g in config.games] == ["Game1", "Game4"]
+        report = [json.loads(line) for line in (tmp_path / "games.json.errors").open()]
+        assert [entry["record"] for entry in report] == [1, 2, None]
+        assert "Invalid JSON file" in report[2]["error"]
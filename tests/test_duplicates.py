@@ -0,0 +1,125 @@
+"""Tests for DOSBox Launcher duplicate detection."""
+
+import os
+
+from dosboxlauncher.duplicates import HashCache, resolve_exe_path
+from dosboxlauncher.models import Game, GameLibrary
+
+
+def _exe(path, content: bytes = b"MZ"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    return str(path)
+
+
+class TestHashCache:
+    def test_digest_is_cached_by_signature(self, tmp_path, monkeypatch):
+        exe = _exe(tmp_path / "GAME.EXE", b"MZ one")
+        cache = HashCache()
+        first = cache.digest(exe)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("file was reread")
+
+        monkeypatch.setattr("builtins.open", fail)
+
+        assert cache.digest(exe) == first
+
+    def test_digest_changes_with_content(self, tmp_path):
+        exe = tmp_path / "GAME.EXE"
+        cache = HashCache()
+        first = cache.digest(_exe(exe, b"MZ one"))
+
+        exe.write_bytes(b"MZ two, longer")
+
+        assert cache.digest(str(exe)) != first
+
+    def test_missing_file(self, tmp_path):
+        assert HashCache().digest(str(tmp_path / "missing.exe")) is None
+
+
+class TestLibraryDuplicates:
+    def test_find_duplicate_by_resolved_path(self, tmp_path):
+        exe = _exe(tmp_path / "doom" / "DOOM.EXE")
+        link = tmp_path / "link"
+        os.symlink(tmp_path / "doom", link)
+        game = Game(name="Doom", exe_path=exe, config_path="")
+        library = GameLibrary([game])
+
+        assert library.find_duplicate(str(link / "DOOM.EXE")) is game
+        assert library.find_duplicate(str(tmp_path / "doom" / ".." / "doom" / "DOOM.EXE")) is game
+        assert library.find_duplicate(str(tmp_path / "other.exe")) is None
+        assert library.find_duplicate("") is None
+
+    def test_find_duplicate_by_content(self, tmp_path):
+        exe = _exe(tmp_path / "a" / "DOOM.EXE", b"MZ doom")
+        copy = _exe(tmp_path / "b" / "DOOM.EXE", b"MZ doom")
+        game = Game(name="Doom", exe_path=exe, config_path="")
+        library = GameLibrary([game])
+
+        assert library.find_duplicate(copy) is None
+        assert library.find_duplicate(copy, check_content=True) is game
+
+    def test_index_follows_changes(self, tmp_path):
+        exe = _exe(tmp_path / "DOOM.EXE", b"MZ doom")
+        other = _exe(tmp_path / "QUAKE.EXE", b"MZ quake")
+        game = Game(name="Doom", exe_path=exe, config_path="")
+        library = GameLibrary([game])
+        library.find_duplicate(exe, check_content=True)
+
+        updated = library.update(game.id, exe_path=other)
+        assert library.find_duplicate(exe, check_content=True) is None
+        assert library.find_duplicate(other) is updated
+
+        library.remove(game.id)
+        assert library.find_duplicate(other, check_content=True) is None
+
+        new_game = Game(name="Doom", exe_path=exe, config_path="")
+        library.add(new_game)
+        assert library.find_duplicate(exe) is new_game
+
+    def test_content_check_only_hashes_same_size_files(self, tmp_path, monkeypatch):
+        import dosboxlauncher.models as models
+
+        games = [
+            Game(
+                name=f"Game {i}",
+                exe_path=_exe(tmp_path / f"G{i}.EXE", b"MZ" * (i + 1)),
+                config_path="",
+            )
+            for i in range(50)
+        ]
+        library = GameLibrary(games)
+        hashed = []
+        digest = models.hash_cache.digest
+        monkeypatch.setattr(models.hash_cache, "digest", lambda p: hashed.append(p) or digest(p))
+
+        new = _exe(tmp_path / "NEW.EXE", b"MZ" * 100)
+        assert library.find_duplicate(new, check_content=True) is None
+        library.add(Game(name="New", exe_path=new, config_path=""))
+        assert hashed == []
+
+        same_size = _exe(tmp_path / "OTHER.EXE", b"ZM" * 3)
+        assert library.find_duplicate(same_size, check_content=True) is None
+        assert sorted(hashed) == sorted([same_size, games[2].exe_path])
+
+    def test_find_duplicates_report(self, tmp_path):
+        exe = _exe(tmp_path / "a" / "DOOM.EXE", b"MZ doom")
+        copy = _exe(tmp_path / "b" / "DOOM.EXE", b"MZ doom")
+        quake = _exe(tmp_path / "QUAKE.EXE", b"MZ quake")
+        games = [
+            Game(name="Doom", exe_path=exe, config_path=""),
+            Game(name="Quake", exe_path=quake, config_path=""),
+            Game(name="Doom again", exe_path=exe, config_path=""),
+            Game(name="Doom copy", exe_path=copy, config_path=""),
+            Game(name="Unset", exe_path="", config_path=""),
+            Game(name="Unset too", exe_path="", config_path=""),
+        ]
+        library = GameLibrary(games)
+
+        assert library.find_duplicates() == [[games[0], games[2]]]
+        assert library.find_duplicates(check_content=True) == [[games[0], games[2], games[3]]]
+
+    def test_resolve_exe_path(self, tmp_path):
+        assert resolve_exe_path("") == ""
+        assert resolve_exe_path(str(tmp_path / "x" / ".." / "y")) == str(tmp_path / "y")
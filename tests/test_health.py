@@ -0,0 +1,85 @@
+"""Tests for DOSBox Launcher background health checks."""
+
+import threading
+
+from dosboxlauncher.health import HealthChecker
+from dosboxlauncher.statcache import stat_cache
+
+
+class TestHealthChecker:
+    def test_checks_library_in_slices(self, make_library):
+        library = make_library(5, broken={1})
+        results = []
+        checker = HealthChecker(library, on_result=results.append, slice_size=2)
+        games = library.all()
+
+        assert len(checker.check_next()) == 2
+        assert len(checker.check_next()) == 2
+        assert len(checker.check_next()) == 1
+        assert checker.check_next() == []
+
+        assert checker.status(str(games[0].id)).is_valid
+        assert not checker.status(str(games[1].id)).is_valid
+        assert [r.game.name for r in results] == ["Game 1"]
+        checker.stop()
+
+    def test_prioritized_and_played_games_go_first(self, make_library):
+        library = make_library(6)
+        games = library.all()
+        checker = HealthChecker(library, slice_size=2)
+        checker.played(str(games[5].id))
+        checker.check_next()
+
+        checker.prioritize([str(games[3].id), str(games[2].id)])
+        checker.interval = 0
+        first = [r.game for r in checker.check_next()]
+        rest = [r.game for r in checker.check_next()]
+
+        assert first == [games[3], games[2]]
+        assert rest == [games[5], games[0]]
+        checker.stop()
+
+    def test_reports_only_changes(self, tmp_path, make_library):
+        library = make_library(1)
+        game = library.all()[0]
+        results = []
+        checker = HealthChecker(library, on_result=results.append, interval=0)
+        checker.check_next()
+
+        (tmp_path / "game0.exe").unlink()
+        stat_cache.invalidate()
+        checker.check_next()
+        checker.check_next()
+
+        assert [(r.game_id, r.is_valid) for r in results] == [(str(game.id), False)]
+        checker.stop()
+
+    def test_follows_library_changes(self, tmp_path, make_library):
+        library = make_library(2)
+        first, second = library.all()
+        checker = HealthChecker(library)
+        checker.check_next()
+
+        library.remove(first.id)
+        library.update(second.id, exe_path=str(tmp_path / "gone.exe"))
+
+        assert checker.status(str(first.id)) is None
+        assert [r.game.name for r in checker.check_next()] == ["Game 1"]
+        assert not checker.status(str(second.id)).is_valid
+        checker.stop()
+
+    def test_background_thread(self, make_library):
+        library = make_library(3, broken={2})
+        reported = threading.Event()
+        threads = []
+
+        def on_result(report):
+            threads.append(threading.current_thread())
+            reported.set()
+
+        checker = HealthChecker(library, on_result=on_result, rate=1000)
+        checker.start()
+
+        assert reported.wait(2)
+        checker.stop()
+        assert threads[0] is not threading.current_thread()
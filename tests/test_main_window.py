@@ -3,6 +3,7 @@
 from unittest.mock import MagicMock
 
 import gi
+import pytest
 
 gi.require_version("Gdk", "3.0")
 gi.require_version("Gtk", "3.0")
@@ -90,3 +91,184 @@ class TestMainWindowLaunchBehavior:
 
         assert handled is False
         window._launch_game.assert_not_called()
+
+    def _launching_window(self):
+        window = MainWindow.__new__(MainWindow)
+        window._is_launching = False
+        window._launch_cancel = None
+        window.config = None
+        window.health_checker = None
+        window.launch_game_btn = MagicMock()
+        window.launch_game_btn.get_label.return_value = "Launch Game"
+        window._show_error_dialog = MagicMock()
+        return window
+
+    def test_launch_checks_files_off_the_gtk_thread(self, sample_game, monkeypatch):
+        import dosboxlauncher.ui.main_window as main_window
+
+        thread = MagicMock()
+        monkeypatch.setattr(main_window.threading, "Thread", thread)
+        window = self._launching_window()
+
+        window._launch_game(sample_game)
+
+        assert window._is_launching
+        thread.return_value.start.assert_called_once()
+        window.launch_game_btn.set_label.assert_called_with("Cancel Launch")
+
+    def test_launch_reports_timed_out_paths(self, sample_game, monkeypatch):
+        import dosboxlauncher.ui.main_window as main_window
+        from dosboxlauncher.validation import LaunchCheck
+
+        popen = MagicMock()
+        monkeypatch.setattr(main_window.subprocess, "Popen", popen)
+        monkeypatch.setattr(main_window.threading, "Thread", MagicMock())
+        window = self._launching_window()
+        window._launch_game(sample_game)
+
+        result = LaunchCheck(("Config directory not found: /gone",), ("/mnt/nas/game.exe",))
+        window._finish_launch(sample_game, result, window._launch_cancel)
+
+        message = window._show_error_dialog.call_args.args[0]
+        assert "Config directory not found: /gone" in message
+        assert "Not responding" in message
+        assert "/mnt/nas/game.exe" in message
+        popen.assert_not_called()
+        assert not window._is_launching
+        window.launch_game_btn.set_label.assert_called_with("Launch Game")
+
+    def test_cancelled_launch_is_not_started(self, sample_game, monkeypatch):
+        import dosboxlauncher.ui.main_window as main_window
+        from dosboxlauncher.validation import LaunchCheck
+
+        popen = MagicMock()
+        monkeypatch.setattr(main_window.subprocess, "Popen", popen)
+        monkeypatch.setattr(main_window.threading, "Thread", MagicMock())
+        window = self._launching_window()
+        window._launch_game(sample_game)
+        cancel = window._launch_cancel
+
+        window._on_launch_game_clicked(MagicMock())
+        window._finish_launch(sample_game, LaunchCheck((), ()), cancel)
+
+        assert cancel.is_set()
+        assert not window._is_launching
+        popen.assert_not_called()
+        window._show_error_dialog.assert_not_called()
+
+
+class TestMainWindowSearch:
+    def test_search_uses_session(self, sample_game):
+        window = MainWindow.__new__(MainWindow)
+        entry = MagicMock()
+        entry.get_text.return_value = "test"
+
+        window.search_entry = entry
+        window._search_session = MagicMock()
+        window._search_session.search.return_value = [sample_game]
+        window._refresh_game_list = MagicMock()
+
+        window._on_search_changed(entry)
+
+        window._search_session.search.assert_called_once_with("test")
+        window._refresh_game_list.assert_called_once_with([sample_game])
+
+    def test_session_starts_on_first_search(self, sample_game):
+        from dosboxlauncher.models import GameLibrary
+        from dosboxlauncher.ui.main_window import SEARCH_LIMIT
+
+        window = MainWindow.__new__(MainWindow)
+        entry = MagicMock()
+        entry.get_text.return_value = "test"
+        window.search_entry = entry
+        window._unsubscribe_library = None
+        window._set_library(GameLibrary([sample_game]))
+        window._refresh_game_list = MagicMock()
+        assert window._search_session is None
+
+        window._on_search_changed(entry)
+
+        assert window._search_session.limit == SEARCH_LIMIT
+        window._refresh_game_list.assert_called_once_with([sample_game])
+
+    def test_field_search_uses_query(self, sample_game):
+        window = MainWindow.__new__(MainWindow)
+        entry = MagicMock()
+        entry.get_text.return_value = "tag:rpg"
+
+        window.search_entry = entry
+        window.game_library = MagicMock()
+        window.game_library.query.return_value = [sample_game]
+        window._search_session = MagicMock()
+        window._refresh_game_list = MagicMock()
+
+        window._on_search_changed(entry)
+
+        window.game_library.query.assert_called_once_with("tag:rpg")
+        window._search_session.search.assert_not_called()
+        window._refresh_game_list.assert_called_once_with([sample_game])
+
+
+class TestMainWindowLibraryChanges:
+    @pytest.fixture(autouse=True)
+    def _fake_rows(self, monkeypatch):
+        import dosboxlauncher.ui.main_window as main_window
+
+        monkeypatch.setattr(main_window.Gtk, "ListBoxRow", MagicMock)
+        monkeypatch.setattr(main_window.Gtk, "Label", MagicMock)
+        monkeypatch.setattr(main_window.Gtk, "Box", MagicMock)
+        monkeypatch.setattr(main_window.Gtk, "Image", MagicMock())
+
+    def _window(self, library):
+        window = MainWindow.__new__(MainWindow)
+        window.game_list = MagicMock()
+        window.search_entry = None
+        window._rows = {}
+        window.health_checker = None
+        window._search_session = None
+        window._unsubscribe_library = None
+        window._set_library(library)
+        return window
+
+    def test_added_game_appends_row(self, sample_game):
+        from dosboxlauncher.models import GameLibrary
+
+        library = GameLibrary()
+        window = self._window(library)
+
+        library.add(sample_game)
+
+        window.game_list.add.assert_called_once()
+        assert str(sample_game.id) in window._rows
+
+    def test_removed_game_drops_row(self, sample_game):
+        from dosboxlauncher.models import GameLibrary
+
+        library = GameLibrary()
+        window = self._window(library)
+        library.add(sample_game)
+        row = window._rows[str(sample_game.id)]
+
+        library.remove(sample_game.id)
+
+        window.game_list.remove.assert_called_once_with(row)
+        assert window._rows == {}
+
+    def test_lists_one_page_at_a_time(self):
+        from dosboxlauncher.models import Game, GameLibrary
+        from dosboxlauncher.ui.main_window import LIST_PAGE
+
+        games = [Game(name=f"Game {i}", exe_path="", config_path="") for i in range(LIST_PAGE + 1)]
+        library = GameLibrary(games)
+        window = self._window(library)
+        window.game_list.get_children.return_value = []
+        window._prioritize_visible = MagicMock()
+
+        window._refresh_game_list()
+        assert len(window._rows) == LIST_PAGE
+
+        library.add(Game(name="Added", exe_path="", config_path=""))
+        assert len(window._rows) == LIST_PAGE
+
+        window._show_more()
+        assert len(window._rows) == LIST_PAGE + 2
@@ -1,10 +1,14 @@
 """Tests for DOSBox Launcher models."""
 
+import sys
+import threading
 import uuid
+from datetime import datetime
 
 import pytest
+import yaml
 
-from dosboxlauncher.models import Game, GameLibrary
+from dosboxlauncher.models import Game, GameLibrary, _id_key
 
 
 class TestGame:
@@ -476,6 +480,27 @@ class TestGameEdgeCases:
         restored = GameLibrary.from_dict(data)
         assert len(restored) == 1
 
+    @pytest.mark.parametrize("lazy", [False, True])
+    def test_library_from_dict_missing_and_repeated_ids(self, lazy):
+        game_id = str(uuid.uuid4())
+        data = {
+            "games": [
+                {"name": "Doom"},
+                {"name": "Quake", "id": None, "created_at": None},
+                {"name": "Heretic", "id": game_id},
+                {"name": "Hexen", "id": game_id},
+                {"name": "Strife", "id": 5},
+            ]
+        }
+
+        library = GameLibrary.from_dict(data, lazy=lazy)
+
+        assert [g.name for g in library] == ["Doom", "Quake", "Heretic", "Hexen", "Strife"]
+        assert all(isinstance(g.id, uuid.UUID) for g in library)
+        assert len({str(g.id) for g in library}) == 5
+        assert all(library.get(g.id) is g for g in library)
+        assert library.get(game_id).name == "Heretic"
+
     def test_library_all(self, tmp_path):
         config_path = tmp_path / "config"
         config_path.mkdir()
@@ -537,3 +562,715 @@ class TestGameEdgeCases:
         is_valid, errors = game.validate(check_config_file=False)
         assert is_valid is True
         assert len(errors) == 0
+
+
+class _CountingName(str):
+    """A str whose case-folding calls are counted."""
+
+    calls = 0
+
+    def lower(self):
+        _CountingName.calls += 1
+        return super().lower()
+
+    def casefold(self):
+        _CountingName.calls += 1
+        return super().casefold()
+
+
+def _make_library(size: int) -> GameLibrary:
+    library = GameLibrary()
+    for i in range(size):
+        library.add(Game(name=_CountingName(f"Game {i}"), exe_path="", config_path=""))
+    return library
+
+
+class TestGameLibraryIndexes:
+    def test_add_duplicate_id_raises(self):
+        from dosboxlauncher.exceptions import ValidationError
+
+        game = Game(name="Doom", exe_path="", config_path="")
+        library = GameLibrary([game])
+
+        with pytest.raises(ValidationError, match="already in library"):
+            library.add(Game(name="Doom II", exe_path="", config_path="", id=game.id))
+        assert len(library) == 1
+
+    def test_duplicate_names_return_first_added(self):
+        first = Game(name="Doom", exe_path="a", config_path="")
+        second = Game(name="DOOM", exe_path="b", config_path="")
+        library = GameLibrary([first, second])
+
+        assert library.get_by_name("doom") is first
+        assert library.find_by_name("Doom") == [first, second]
+
+        library.remove(first.id)
+        assert library.get_by_name("doom") is second
+
+        library.remove(second.id)
+        assert library.get_by_name("doom") is None
+        assert library.find_by_name("doom") == []
+
+    def test_get_by_name_casefolds(self):
+        game = Game(name="Straße", exe_path="", config_path="")
+        library = GameLibrary([game])
+
+        assert library.get_by_name("STRASSE") is game
+
+    def test_remove_keeps_insertion_order(self):
+        games = [Game(name=f"Game {i}", exe_path="", config_path="") for i in range(5)]
+        library = GameLibrary(games)
+
+        library.remove(games[2].id)
+
+        assert [g.name for g in library] == ["Game 0", "Game 1", "Game 3", "Game 4"]
+
+    @pytest.mark.parametrize("size", [10, 1000])
+    def test_get_cost_is_flat(self, size, monkeypatch):
+        library = _make_library(size)
+        target = library.all()[-1]
+        comparisons = 0
+        original_eq = uuid.UUID.__eq__
+
+        def counting_eq(self, other):
+            nonlocal comparisons
+            comparisons += 1
+            return original_eq(self, other)
+
+        monkeypatch.setattr(uuid.UUID, "__eq__", counting_eq)
+
+        assert library.get(uuid.UUID(str(target.id))) is target
+        assert library.remove(uuid.UUID(str(target.id))) is target
+        assert comparisons <= 2
+
+    @pytest.mark.parametrize("size", [10, 1000])
+    def test_get_by_name_cost_is_flat(self, size):
+        library = _make_library(size)
+        library.get_by_name("warm up the index")
+
+        _CountingName.calls = 0
+        found = library.get_by_name(f"GAME {size - 1}")
+
+        assert found is not None
+        assert _CountingName.calls == 0
+
+
+def _bytes_per_item(build, count: int) -> float:
+    import tracemalloc
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert kept is not None
+    return (after - before) / count
+
+
+class TestGameMemory:
+    def test_game_has_no_instance_dict(self):
+        game = Game(name="Doom", exe_path="", config_path="")
+
+        assert not hasattr(game, "__dict__")
+        with pytest.raises(AttributeError):
+            game.unknown_field = 1
+
+    def test_from_dict_shares_config_path(self):
+        first = Game.from_dict({"name": "A", "config_path": "/data/" + "games"})
+        second = Game.from_dict({"name": "B", "config_path": "/data/" + "games"})
+
+        assert first.config_path is second.config_path
+
+    def test_bytes_per_game(self):
+        records = [
+            Game(name=f"Game {i}", exe_path=f"/dos/GAME{i}/GAME.EXE", config_path="/c").to_dict()
+            for i in range(5000)
+        ]
+
+        per_game = _bytes_per_item(lambda: [Game.from_dict(r) for r in records], len(records))
+
+        # A dict-backed instance alone used to cost about 280 bytes.
+        assert per_game < 250
+
+    def test_bytes_per_library_entry(self):
+        games = [
+            Game(name=f"Some Game Title {i}", exe_path="", config_path="") for i in range(5000)
+        ]
+
+        def build():
+            library = GameLibrary(games)
+            library.search("game")
+            return library
+
+        per_game = _bytes_per_item(build, len(games))
+
+        # Set-based search postings used to cost over 2 KB per game.
+        assert per_game < 800
+
+
+class TestLazyLoading:
+    def _record(self, **overrides) -> dict:
+        game = Game(name="Doom", exe_path="/dos/DOOM.EXE", config_path="/c", notes="shareware")
+        data = game.to_dict()
+        data.update(overrides)
+        return data
+
+    def test_lazy_game_defers_decoding(self, monkeypatch):
+        data = self._record()
+        calls = []
+        monkeypatch.setattr(uuid, "UUID", lambda value: calls.append(value) or value)
+
+        game = Game.from_dict(data, lazy=True)
+
+        assert game.name == "Doom"
+        assert game.notes == "shareware"
+        assert calls == []
+
+        assert game.id == data["id"]
+        assert calls == [data["id"]]
+        assert game.id == data["id"]
+        assert calls == [data["id"]]
+
+    def test_lazy_game_decodes_on_access(self):
+        data = self._record()
+
+        game = Game.from_dict(data, lazy=True)
+
+        assert game.id == uuid.UUID(data["id"])
+        assert game.created_at.isoformat() == data["created_at"]
+        assert game._raw is None
+        assert game == Game.from_dict(data)
+
+    def test_lazy_game_serializes_without_decoding(self):
+        data = self._record()
+
+        game = Game.from_dict(data, lazy=True)
+
+        assert game.to_dict() == data
+        assert game._raw == (data["id"], data["created_at"])
+
+    def test_lazy_game_serializes_parsed_timestamps(self):
+        created_at = datetime(1993, 12, 10, 12, 0)
+        data = self._record(created_at=created_at)
+
+        game = Game.from_dict(data, lazy=True)
+
+        assert game.to_dict()["created_at"] == created_at.isoformat()
+        assert game.created_at == created_at
+
+    def test_record_game_loads_fields_on_first_access(self):
+        data = self._record(tags=["FPS"])
+        loads = []
+
+        def load(key):
+            loads.append(key)
+            return data
+
+        game = Game.from_record(data["id"], "Doom", load)
+        library = GameLibrary([game])
+
+        assert library.get(data["id"]) is game
+        assert library.search("doom", fuzzy=False) == [game]
+        assert loads == []
+
+        assert game.exe_path == "/dos/DOOM.EXE"
+        assert game.tags == ("FPS",)
+        assert loads == [data["id"]]
+        assert game.to_dict() == data
+        assert game == Game.from_dict(data)
+        assert loads == [data["id"]]
+
+    def test_lazy_games_shared_between_threads(self):
+        records = [self._record(name=f"Game {i}", id=str(uuid.uuid4())) for i in range(300)]
+        games = [Game.from_record(r["id"], r["name"], lambda key, r=r: r) for r in records]
+        games += [Game.from_dict(r, lazy=True) for r in records]
+        start = threading.Barrier(4)
+        errors = []
+
+        def read(order):
+            start.wait()
+            try:
+                for game in order:
+                    _id_key(game)
+                    game.to_dict()
+                    _ = (game.exe_path, game.created_at, game.id)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=read, args=(games[::step],)) for step in (1, -1, 1, -1)]
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        assert errors == []
+        assert [g.to_dict() for g in games] == records * 2
+
+    def test_lazy_game_assignment_wins(self):
+        game = Game.from_dict(self._record(), lazy=True)
+        new_id = uuid.uuid4()
+
+        game.id = new_id
+
+        assert game.id == new_id
+        assert game.to_dict()["id"] == str(new_id)
+
+    def test_lazy_game_unknown_attribute(self):
+        game = Game.from_dict(self._record(), lazy=True)
+
+        with pytest.raises(AttributeError, match="unknown"):
+            _ = game.unknown
+
+    def test_lazy_library_lookups(self):
+        data = {"games": [self._record(name=f"Game {i}", id=str(uuid.uuid4())) for i in range(3)]}
+
+        library = GameLibrary.from_dict(data, lazy=True)
+        target = data["games"][1]
+
+        assert library.get(uuid.UUID(target["id"])).name == "Game 1"
+        assert library.get(target["id"]).name == "Game 1"
+        assert library.get_by_name("game 2").name == "Game 2"
+        assert [g.name for g in library.search("game 0", fuzzy=False)] == ["Game 0"]
+        assert all(g._raw is not None for g in library)
+
+        removed = library.remove(uuid.UUID(target["id"]))
+        assert removed.name == "Game 1"
+        assert len(library) == 2
+
+    def test_lazy_library_accepts_uppercase_ids(self):
+        game_id = uuid.uuid4()
+        data = {"games": [self._record(id=str(game_id).upper())]}
+
+        library = GameLibrary.from_dict(data, lazy=True)
+
+        assert library.get(game_id) is not None
+
+    def test_lazy_library_roundtrip(self):
+        data = {"games": [self._record(name=f"Game {i}", id=str(uuid.uuid4())) for i in range(3)]}
+
+        library = GameLibrary.from_dict(data, lazy=True)
+        reloaded = GameLibrary.from_dict(library.to_dict(), lazy=True)
+
+        assert [g.to_dict() for g in reloaded] == data["games"]
+
+
+class TestLibraryViews:
+    def _library(self, count: int) -> GameLibrary:
+        games = [Game(name=f"Game {i}", exe_path="", config_path="") for i in range(count)]
+        return GameLibrary(games)
+
+    def test_view_is_read_only_sequence(self):
+        library = self._library(3)
+
+        view = library.view()
+
+        assert len(view) == 3
+        assert [g.name for g in view] == ["Game 0", "Game 1", "Game 2"]
+        assert view[-1].name == "Game 2"
+        assert [g.name for g in view[1:]] == ["Game 1", "Game 2"]
+        assert not hasattr(view, "append")
+        with pytest.raises(TypeError):
+            view[0] = None
+
+    def test_views_share_ordering_until_changed(self):
+        library = self._library(3)
+
+        first = library.view()
+        second = library.view()
+        assert first._games is second._games
+
+        library.add(Game(name="Game 3", exe_path="", config_path=""))
+        third = library.view()
+
+        assert third._games is not first._games
+        assert len(first) == 3
+        assert len(third) == 4
+
+    def test_view_unaffected_by_removal(self):
+        library = self._library(3)
+        view = library.view()
+
+        library.remove(view[0].id)
+
+        assert len(view) == 3
+        assert len(library.view()) == 2
+
+    def test_page(self):
+        library = self._library(10)
+
+        assert [g.name for g in library.page(8, 5)] == ["Game 8", "Game 9"]
+        assert [g.name for g in library.page(2, 2)] == ["Game 2", "Game 3"]
+        assert library.page(20, 5) == []
+        with pytest.raises(ValueError):
+            library.page(-1, 5)
+
+    def test_page_after_change_skips_snapshot(self):
+        library = self._library(10)
+        library.view()
+
+        library.remove(library.page(0, 1)[0].id)
+
+        assert [g.name for g in library.page(0, 2)] == ["Game 1", "Game 2"]
+        assert library._snapshot is None
+
+    def test_filter_is_lazy(self):
+        library = self._library(5)
+        seen = []
+
+        def even(game):
+            seen.append(game.name)
+            return int(game.name[-1]) % 2 == 0
+
+        matches = library.filter(even)
+        assert seen == []
+
+        assert next(matches).name == "Game 0"
+        assert next(matches).name == "Game 2"
+        assert seen == ["Game 0", "Game 1", "Game 2"]
+
+
+class TestLibraryUpdates:
+    def _library(self) -> tuple[GameLibrary, Game]:
+        game = Game(name="Ultima VII", exe_path="", config_path="", tags=["RPG"], notes="MT-32")
+        other = Game(name="Doom", exe_path="", config_path="", tags=["Shooter"])
+        return GameLibrary([game, other]), game
+
+    def test_tags_roundtrip(self):
+        game = Game(name="Doom", exe_path="", config_path="", tags=["Shooter", "Classic"])
+
+        data = game.to_dict()
+
+        assert data["tags"] == ["Shooter", "Classic"]
+        assert Game.from_dict(data).tags == ("Shooter", "Classic")
+        assert Game.from_dict(data, lazy=True).tags == ("Shooter", "Classic")
+        assert Game.from_dict({"name": "Old"}).tags == ()
+
+    def test_query(self):
+        library, game = self._library()
+
+        assert library.query('tag:rpg notes:"mt-32"') == [game]
+
+    def test_update_reindexes(self):
+        library, game = self._library()
+        library.query("tag:rpg")
+        library.get_by_name("ultima vii")
+        library.search("ultima")
+
+        updated = library.update(game.id, name="Ultima 7", tags=["RPG", "Classic"], notes="")
+
+        assert updated is not game
+        assert updated.id == game.id
+        assert updated.tags == ("RPG", "Classic")
+        assert game.tags == ("RPG",)
+        assert library.get(game.id) is updated
+        assert library.query("tag:classic") == [updated]
+        assert library.query("notes:mt-32") == []
+        assert library.get_by_name("ultima vii") is None
+        assert library.get_by_name("ultima 7") is updated
+        assert library.search("ultima 7", fuzzy=False) == [updated]
+        assert library.search("ultima vii", fuzzy=False) == []
+
+    def test_update_unknown_game(self):
+        library, _ = self._library()
+        from dosboxlauncher.exceptions import GameNotFoundError
+
+        with pytest.raises(GameNotFoundError):
+            library.update(uuid.uuid4(), name="Nope")
+
+    def test_update_rejects_unknown_fields(self):
+        library, game = self._library()
+        from dosboxlauncher.exceptions import ValidationError
+
+        with pytest.raises(ValidationError, match="id"):
+            library.update(game.id, id=uuid.uuid4())
+        with pytest.raises(ValidationError, match="bogus"):
+            library.update(game.id, name="Changed", bogus=1)
+        assert game.name == "Ultima VII"
+
+    def test_removed_games_leave_query_results(self):
+        library, game = self._library()
+        library.query("tag:rpg")
+
+        library.remove(game.id)
+
+        assert library.query("tag:rpg") == []
+
+
+class TestLibrarySnapshots:
+    def _library(self, count: int) -> GameLibrary:
+        games = [Game(name=f"Game {i}", exe_path="", config_path="") for i in range(count)]
+        return GameLibrary(games)
+
+    def test_version_counts_changes(self):
+        library = self._library(2)
+        start = library.version
+        game = library.view()[0]
+
+        library.update(game.id, notes="Edited")
+        library.remove(game.id)
+        library.add(Game(name="New", exe_path="", config_path=""))
+
+        assert library.version == start + 3
+
+    def test_failed_changes_keep_version(self):
+        library = self._library(1)
+        game = library.view()[0]
+        start = library.version
+        from dosboxlauncher.exceptions import GameNotFoundError, ValidationError
+
+        with pytest.raises(ValidationError):
+            library.add(game)
+        with pytest.raises(GameNotFoundError):
+            library.remove(uuid.uuid4())
+
+        assert library.version == start
+
+    def test_snapshot_shared_until_changed(self):
+        library = self._library(3)
+
+        first = library.snapshot()
+        assert library.snapshot() is first
+        assert first.version == library.version
+
+        library.add(Game(name="Game 3", exe_path="", config_path=""))
+
+        assert library.snapshot() is not first
+        assert library.snapshot().version == first.version + 1
+
+    def test_snapshot_isolated_from_updates(self):
+        library = self._library(2)
+        snapshot = library.snapshot()
+        game = snapshot[0]
+
+        library.update(game.id, name="Renamed", tags=["New"])
+        library.remove(snapshot[1].id)
+
+        assert snapshot[0].name == "Game 0"
+        assert snapshot.get(game.id).tags == ()
+        assert len(snapshot) == 2
+        assert snapshot[1] in snapshot
+        assert library.get(game.id).name == "Renamed"
+        assert library.version != snapshot.version
+
+    def test_snapshot_lookup_is_read_only(self):
+        library = self._library(1)
+        snapshot = library.snapshot()
+        game = snapshot[0]
+
+        assert snapshot.get(game.id) is game
+        assert snapshot.get(str(game.id)) is game
+        assert snapshot.get(uuid.uuid4()) is None
+        with pytest.raises(TypeError):
+            snapshot._by_id["x"] = game
+
+    def test_concurrent_readers(self):
+        import threading
+
+        library = self._library(200)
+        errors = []
+        done = threading.Event()
+
+        def reader():
+            while not done.is_set():
+                snapshot = library.snapshot()
+                names = [game.name for game in snapshot]
+                if len(names) != len(snapshot) or any(
+                    snapshot.get(game.id) is not game for game in snapshot
+                ):
+                    errors.append(snapshot.version)
+
+        threads = [threading.Thread(target=reader) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for i in range(300):
+            game = library.view()[0]
+            library.update(game.id, notes=str(i))
+            library.remove(game.id)
+            library.add(game)
+        done.set()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert len(library) == 200
+
+
+class TestLibraryEvents:
+    def _library(self) -> tuple[GameLibrary, list]:
+        library = GameLibrary()
+        changes = []
+        library.subscribe(changes.append)
+        return library, changes
+
+    def test_add_remove_update_events(self):
+        from dosboxlauncher.models import ChangeKind, LibraryChange
+
+        library, changes = self._library()
+        game = Game(name="Doom", exe_path="", config_path="")
+        key = str(game.id)
+
+        library.add(game)
+        library.update(game.id, name="Doom II")
+        library.remove(game.id)
+
+        assert changes == [
+            LibraryChange(ChangeKind.ADDED, (key,)),
+            LibraryChange(ChangeKind.UPDATED, (key,)),
+            LibraryChange(ChangeKind.REMOVED, (key,)),
+        ]
+
+    def test_batch_groups_changes_by_kind(self):
+        from dosboxlauncher.models import ChangeKind
+
+        library, changes = self._library()
+        existing = Game(name="Quake", exe_path="", config_path="")
+        library.add(existing)
+        changes.clear()
+        games = [Game(name=f"Game {i}", exe_path="", config_path="") for i in range(3)]
+
+        with library.batch():
+            for game in games:
+                library.add(game)
+            library.update(existing.id, notes="Classic")
+            assert changes == []
+
+        assert [(c.kind, c.ids) for c in changes] == [
+            (ChangeKind.ADDED, tuple(str(g.id) for g in games)),
+            (ChangeKind.UPDATED, (str(existing.id),)),
+        ]
+
+    def test_batch_coalesces_per_game(self):
+        from dosboxlauncher.models import ChangeKind
+
+        library, changes = self._library()
+        removed = Game(name="Quake", exe_path="", config_path="")
+        library.add(removed)
+        changes.clear()
+        transient = Game(name="Doom", exe_path="", config_path="")
+        kept = Game(name="Keen", exe_path="", config_path="")
+
+        with library.batch():
+            library.add(transient)
+            library.update(transient.id, name="Doom II")
+            library.remove(transient.id)
+            library.add(kept)
+            library.update(kept.id, name="Commander Keen")
+            with library.batch():
+                library.update(removed.id, name="Quake II")
+                library.remove(removed.id)
+
+        assert [(c.kind, c.ids) for c in changes] == [
+            (ChangeKind.ADDED, (str(kept.id),)),
+            (ChangeKind.REMOVED, (str(removed.id),)),
+        ]
+
+    def test_unsubscribe(self):
+        library, changes = self._library()
+        other = []
+        unsubscribe = library.subscribe(other.append)
+
+        unsubscribe()
+        unsubscribe()
+        library.add(Game(name="Doom", exe_path="", config_path=""))
+
+        assert len(changes) == 1
+        assert other == []
+
+    def test_sync_applies_only_differences(self):
+        from dataclasses import replace
+
+        from dosboxlauncher.models import ChangeKind
+
+        library, changes = self._library()
+        kept, edited, removed = (
+            Game(name=name, exe_path="", config_path="") for name in ("Doom", "Quake", "Keen")
+        )
+        for game in (kept, edited, removed):
+            library.add(game)
+        changes.clear()
+        added = Game(name="Hexen", exe_path="", config_path="")
+        reloaded = [replace(kept), replace(edited, notes="Classic"), added]
+
+        assert library.sync(reloaded)
+
+        assert [(c.kind, c.ids) for c in changes] == [
+            (ChangeKind.ADDED, (str(added.id),)),
+            (ChangeKind.REMOVED, (str(removed.id),)),
+            (ChangeKind.UPDATED, (str(edited.id),)),
+        ]
+        assert library.get(kept.id) is kept
+        assert library.get(edited.id).notes == "Classic"
+        assert not library.sync(reloaded)
+
+    def test_sync_keeps_listed_games(self):
+        library, changes = self._library()
+        game = Game(name="Doom", exe_path="", config_path="")
+        library.add(game)
+
+        assert not library.sync([], keep={str(game.id)})
+        assert library.get(game.id) is game
+
+
+class TestPathTable:
+    def test_roundtrip_is_lossless(self):
+        from dosboxlauncher.models import PathTable
+
+        paths = [
+            "/games/doom/DOOM.EXE",
+            "/games/doom/SETUP.EXE",
+            "/games//odd/",
+            "C:\\GAMES\\KEEN\\KEEN4.EXE",
+            "relative.exe",
+            "/",
+            "",
+        ]
+        games = [Game(name=p or "Empty", exe_path=p, config_path="/games/conf") for p in paths]
+        table = PathTable()
+
+        packed = [g.to_dict(table) for g in games]
+        table = PathTable(list(table.dirs))
+        restored = [Game.from_dict(d, paths=table) for d in packed]
+
+        assert [g.exe_path for g in restored] == paths
+        assert [g.to_dict() for g in restored] == [g.to_dict() for g in games]
+        assert table.dirs == [
+            "/games/doom/",
+            "/games/conf",
+            "/games//odd/",
+            "C:\\GAMES\\KEEN\\",
+            "/",
+        ]
+
+    def test_library_stores_shared_directories_once(self):
+        games = [
+            Game(
+                name=f"Game {i}",
+                exe_path=f"/home/user/dos/games/{i}/GAME.EXE",
+                config_path="/home/user/dos/conf",
+            )
+            for i in range(100)
+        ]
+        library = GameLibrary(games)
+
+        data = library.to_dict()
+        plain = {"games": [g.to_dict() for g in games]}
+        reloaded = GameLibrary.from_dict(data, lazy=True)
+
+        assert len(yaml.dump(data)) < len(yaml.dump(plain))
+        assert [g.to_dict() for g in reloaded] == plain["games"]
+        shared = {id(g.config_path) for g in reloaded}
+        assert len(shared) == 1
+
+    def test_reads_libraries_without_a_table(self):
+        game = Game(name="Doom", exe_path="/games/DOOM.EXE", config_path="/games")
+
+        library = GameLibrary.from_dict({"games": [game.to_dict()]})
+
+        assert library.get(game.id).exe_path == "/games/DOOM.EXE"
@@ -0,0 +1,137 @@
+"""Tests for DOSBox Launcher background saving."""
+
+import threading
+
+import pytest
+
+from dosboxlauncher.config import AppConfig, load_app_config, save_app_config
+from dosboxlauncher.exceptions import ConfigError
+from dosboxlauncher.models import Game, GameLibrary
+from dosboxlauncher.saving import SaveManager
+
+
+class _Saves(list):
+    """Threads that saved, and an event set by the first save."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.saved = threading.Event()
+
+
+@pytest.fixture
+def saves(monkeypatch):
+    import dosboxlauncher.saving as saving_module
+
+    calls = _Saves()
+
+    def save(config):
+        calls.append(threading.current_thread())
+        calls.saved.set()
+
+    monkeypatch.setattr(saving_module, "save_app_config", save)
+    return calls
+
+
+def _game(name: str) -> Game:
+    return Game(name=name, exe_path="", config_path="")
+
+
+class TestSaveManager:
+    def test_coalesces_burst_into_one_save(self, config_path, saves):
+        config = AppConfig()
+        manager = SaveManager(config, delay=0.05)
+
+        with config.games.batch():
+            config.games.add(_game("Doom"))
+        for name in ("Quake", "Heretic", "Hexen"):
+            config.games.add(_game(name))
+
+        assert saves.saved.wait(2)
+        manager.close()
+        assert len(saves) == 1
+        assert saves[0] is not threading.current_thread()
+
+    def test_flush_saves_now(self, config_path, saves):
+        config = AppConfig()
+        manager = SaveManager(config, delay=60)
+        config.games.add(_game("Doom"))
+
+        assert manager.pending
+        manager.flush()
+
+        assert len(saves) == 1
+        assert not manager.pending
+        manager.flush()
+        assert len(saves) == 1
+
+    def test_request_for_settings(self, config_path, saves):
+        config = AppConfig()
+        manager = SaveManager(config, delay=60)
+
+        config.dosbox_path = "/usr/bin/dosbox"
+        manager.request()
+        manager.close()
+
+        assert len(saves) == 1
+
+    def test_close_stops_following_changes(self, config_path, saves):
+        config = AppConfig()
+        manager = SaveManager(config, delay=60)
+        manager.close()
+
+        config.games.add(_game("Doom"))
+
+        assert not manager.pending
+
+    def test_writes_config(self, config_path):
+        config = AppConfig(games=GameLibrary([_game("Doom")]))
+        manager = SaveManager(config, delay=60)
+
+        config.games.add(_game("Quake"))
+        manager.close()
+
+        assert [g.name for g in load_app_config().games] == ["Doom", "Quake"]
+
+    def test_failed_background_save_is_reported_and_kept(self, config_path, monkeypatch):
+        import dosboxlauncher.saving as saving_module
+
+        errors = []
+        reported = threading.Event()
+
+        def fail(config):
+            raise ConfigError("disk full")
+
+        def on_error(error):
+            errors.append(error)
+            reported.set()
+
+        monkeypatch.setattr(saving_module, "save_app_config", fail)
+        config = AppConfig()
+        manager = SaveManager(config, delay=0.01, on_error=on_error)
+        config.games.add(_game("Doom"))
+
+        assert reported.wait(2)
+        assert str(errors[0]) == "disk full"
+        assert manager.pending
+
+        monkeypatch.setattr(saving_module, "save_app_config", lambda config: None)
+        manager.close()
+        assert not manager.pending
+
+
+class TestAtomicSave:
+    def test_failed_write_keeps_old_file(self, config_path, monkeypatch):
+        save_app_config(AppConfig(games=GameLibrary([_game("Doom")])))
+        original = config_path.read_text()
+
+        import yaml
+
+        def fail(*args, **kwargs):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(yaml, "dump", fail)
+        with pytest.raises(ConfigError, match="disk full"):
+            save_app_config(AppConfig(games=GameLibrary([_game("Quake")])))
+
+        assert config_path.read_text() == original
+        assert [p.name for p in config_path.parent.iterdir() if p.suffix == ".tmp"] == []
@@ -0,0 +1,136 @@
+"""Tests for DOSBox Launcher game discovery."""
+
+import threading
+
+from dosboxlauncher.models import Game, GameLibrary
+from dosboxlauncher.scanner import ScanProgress, is_dos_program, rank, scan_games
+
+
+def _dos_exe(path, size: int = 1024):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    header = bytearray(size)
+    header[:2] = b"MZ"
+    header[0x18:0x1A] = (0x1C).to_bytes(2, "little")
+    path.write_bytes(bytes(header))
+    return path
+
+
+def _windows_exe(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = bytearray(256)
+    data[:2] = b"MZ"
+    data[0x18:0x1A] = (0x40).to_bytes(2, "little")
+    data[0x3C:0x40] = (0x80).to_bytes(4, "little")
+    data[0x80:0x84] = b"PE\0\0"
+    path.write_bytes(bytes(data))
+    return path
+
+
+class TestIsDosProgram:
+    def test_mz_executables(self, tmp_path):
+        assert is_dos_program(str(_dos_exe(tmp_path / "doom.exe")))
+        assert not is_dos_program(str(_windows_exe(tmp_path / "win.exe")))
+
+        fake = tmp_path / "fake.exe"
+        fake.write_bytes(b"#!/bin/sh\n")
+        assert not is_dos_program(str(fake))
+
+    def test_extended_executables_are_dos(self, tmp_path):
+        path = tmp_path / "game.exe"
+        data = bytearray(_windows_exe(path).read_bytes())
+        data[0x80:0x84] = b"LE\0\0"
+        path.write_bytes(bytes(data))
+
+        assert is_dos_program(str(path))
+
+    def test_com_and_batch_files(self, tmp_path):
+        com = tmp_path / "game.com"
+        com.write_bytes(b"\xb4\x4c\xcd\x21")
+        big = tmp_path / "big.com"
+        big.write_bytes(bytes(0x10000))
+        bat = tmp_path / "go.bat"
+        bat.write_text("game.exe\r\n")
+
+        assert is_dos_program(str(com))
+        assert not is_dos_program(str(big))
+        assert is_dos_program(str(bat))
+
+
+class TestRank:
+    def test_main_program_beats_setup(self):
+        assert rank("/games/DOOM/DOOM.EXE") > rank("/games/DOOM/GAME.EXE")
+        assert rank("/games/DOOM/GAME.EXE") > rank("/games/DOOM/PLAY.BAT") > 0
+        assert rank("/games/DOOM/SETUP.EXE") < 0
+        assert rank("/games/DOOM/INSTALL.EXE") < 0
+        assert rank("/games/KEEN4/KEEN4E.EXE") > rank("/games/KEEN4/MAIN.EXE")
+
+    def test_helper_names_match_whole_names(self):
+        assert rank("/games/SETUP2.EXE") < 0
+        assert rank("/games/SNDSETUP.EXE") < 0
+        assert rank("/games/SETTLERS/SETTLERS.EXE") > 0
+        assert rank("/games/SOUNDFX.EXE") > 0
+
+
+class TestScanGames:
+    def test_proposes_one_game_per_directory(self, tmp_path):
+        _dos_exe(tmp_path / "DOOM" / "SETUP.EXE", size=200_000)
+        _dos_exe(tmp_path / "DOOM" / "DOOM.EXE")
+        _dos_exe(tmp_path / "ACTION" / "Duke_Nukem" / "DUKE.EXE")
+        _dos_exe(tmp_path / "INSTALLERS" / "INSTALL.EXE")
+        _windows_exe(tmp_path / "WINGAME" / "WINGAME.EXE")
+
+        proposals = sorted(scan_games([tmp_path], max_workers=2), key=lambda p: p.name)
+
+        assert [(p.name, p.exe_path) for p in proposals] == [
+            ("DOOM", str(tmp_path / "DOOM" / "DOOM.EXE")),
+            ("Duke Nukem", str(tmp_path / "ACTION" / "Duke_Nukem" / "DUKE.EXE")),
+        ]
+        assert proposals[0].alternatives == (str(tmp_path / "DOOM" / "SETUP.EXE"),)
+
+    def test_does_not_walk_into_games(self, tmp_path):
+        _dos_exe(tmp_path / "MENU.EXE")
+        _dos_exe(tmp_path / "ULTIMA" / "ULTIMA.EXE")
+        _dos_exe(tmp_path / "ULTIMA" / "TOOLS" / "EDITOR.EXE")
+
+        names = {p.name for p in scan_games([tmp_path])}
+
+        assert names == {tmp_path.name.replace("_", " "), "ULTIMA"}
+
+    def test_skips_games_in_library(self, tmp_path):
+        exe = _dos_exe(tmp_path / "DOOM" / "DOOM.EXE")
+        _dos_exe(tmp_path / "QUAKE" / "QUAKE.EXE")
+        library = GameLibrary([Game(name="Doom", exe_path=str(exe), config_path="")])
+        statuses = []
+
+        proposals = list(scan_games([tmp_path], library=library, progress=statuses.append))
+
+        assert [p.name for p in proposals] == ["QUAKE"]
+        status = statuses[-1]
+        assert isinstance(status, ScanProgress)
+        assert (status.directories, status.found, status.known) == (3, 1, 1)
+
+    def test_max_depth(self, tmp_path):
+        _dos_exe(tmp_path / "a" / "b" / "GAME.EXE")
+
+        assert list(scan_games([tmp_path], max_depth=1)) == []
+        assert len(list(scan_games([tmp_path], max_depth=2))) == 1
+
+    def test_cancel_stops_early(self, tmp_path):
+        for i in range(50):
+            _dos_exe(tmp_path / f"GAME{i}" / f"GAME{i}.EXE")
+        cancel = threading.Event()
+
+        found = []
+        for proposal in scan_games([tmp_path], max_workers=2, cancel=cancel):
+            found.append(proposal)
+            cancel.set()
+
+        assert len(found) == 1
+
+    def test_proposal_to_game(self, tmp_path):
+        exe = _dos_exe(tmp_path / "DOOM" / "DOOM.EXE")
+        (proposal,) = scan_games([tmp_path])
+
+        game = proposal.to_game(str(tmp_path))
+
+        assert (game.name, game.exe_path, game.config_path) == ("DOOM", str(exe), str(tmp_path))
@@ -0,0 +1,269 @@
+"""Tests for DOSBox Launcher search indexes."""
+
+import random
+import time
+
+from dosboxlauncher.models import Game, GameLibrary
+from dosboxlauncher.search import InvertedIndex, TrigramIndex, tokenize
+
+FRAME_BUDGET = 1 / 60
+
+
+def _index(*names: str) -> TrigramIndex:
+    index = TrigramIndex()
+    for i, name in enumerate(names):
+        index.add(i, name)
+    return index
+
+
+class TestTrigramIndex:
+    def test_substring_match(self):
+        index = _index("Doom", "Duke Nukem", "Wolfenstein 3D")
+
+        assert index.search("nuke", fuzzy=False) == [1]
+        assert index.search("STEIN", fuzzy=False) == [2]
+
+    def test_match_across_words(self):
+        index = _index("Duke Nukem", "Commander Keen")
+
+        assert index.search("e nu", fuzzy=False) == [0]
+
+    def test_short_query(self):
+        index = _index("Doom", "Duke Nukem", "Quake")
+
+        assert index.search("k", fuzzy=False) == [1, 2]
+
+    def test_short_query_ranks_word_prefixes(self):
+        index = _index("Zak", "Bad Mojo", "The Adventure", "Alone in the Dark", "Sam and Max")
+
+        assert index.search("a", fuzzy=False) == [3, 2, 4, 0, 1]
+        assert index.search("a", limit=3, fuzzy=False) == [3, 2, 4]
+
+    def test_ranking(self):
+        index = _index("The Doom Saga", "Doomsday", "Ultimate Doom", "Doom", "Kaboom")
+
+        assert index.search("doom", fuzzy=False) == [3, 1, 0, 2]
+
+    def test_typo_tolerant(self):
+        index = _index("Doom", "Duke Nukem", "Wolfenstein 3D")
+
+        assert index.search("wolfenstien") == [2]
+        assert index.search("nuken") == [1]
+
+    def test_fuzzy_matches_follow_substring_matches(self):
+        index = _index("Doon", "Doom II")
+
+        assert index.search("doom") == [1, 0]
+
+    def test_unrelated_names_do_not_match(self):
+        index = _index("Doom", "Duke Nukem", "Wolfenstein 3D")
+
+        assert index.search("doom") == [0]
+        assert index.search("xyzzy") == []
+
+    def test_limit(self):
+        index = _index("Doom", "Doom II", "Final Doom")
+
+        assert index.search("doom", limit=2) == [0, 1]
+
+    def test_empty_query_returns_everything(self):
+        index = _index("Doom", "Quake")
+
+        assert index.search("") == [0, 1]
+
+    def test_remove(self):
+        index = _index("Doom", "Doom II")
+
+        index.remove(0)
+        index.remove(42)
+
+        assert index.search("doom") == [1]
+        assert len(index) == 1
+
+    def test_compaction_after_many_removals(self, monkeypatch):
+        monkeypatch.setattr("dosboxlauncher.search.COMPACT_MIN_DEAD", 2)
+        index = _index("Doom", "Doom II", "Final Doom", "Quake")
+
+        for key in (0, 1, 2):
+            index.remove(key)
+
+        assert index._dead == 0
+        assert all(len(posting) == 1 for posting in index._postings.values())
+        assert index.search("doom") == []
+        assert index.search("quake") == [3]
+
+    def test_readd_replaces_name(self):
+        index = _index("Doom")
+
+        index.add(0, "Quake")
+
+        assert index.search("doom", fuzzy=False) == []
+        assert index.search("quake") == [0]
+
+
+class TestLibrarySearch:
+    def test_search_returns_games(self):
+        doom = Game(name="Doom", exe_path="", config_path="")
+        quake = Game(name="Quake", exe_path="", config_path="")
+        library = GameLibrary([doom, quake])
+
+        assert library.search("quak") == [quake]
+        assert library.search("quaek") == [quake]
+        assert library.search("quaek", fuzzy=False) == []
+
+    def test_removed_games_are_not_found(self):
+        doom = Game(name="Doom", exe_path="", config_path="")
+        library = GameLibrary([doom])
+
+        library.remove(doom.id)
+
+        assert library.search("doom") == []
+
+    def test_search_large_library_within_frame_budget(self):
+        rng = random.Random(1)
+        letters = "abcdefghijklmnopqrstuvwxyz"
+        library = GameLibrary()
+        for i in range(50_000):
+            words = ("".join(rng.choices(letters, k=rng.randint(3, 9))) for _ in range(3))
+            library.add(Game(name=" ".join(words) + f" {i}", exe_path="", config_path=""))
+        library.add(Game(name="Jazz Jackrabbit", exe_path="", config_path=""))
+        library.add(Game(name="Tyrian 2000", exe_path="", config_path=""))
+
+        for query in ("jackrab", "tyrain", "an", "er"):
+            best = min(_timed(library.search, query, 50) for _ in range(5))
+            assert best < FRAME_BUDGET, f"{query!r} took {best * 1000:.1f} ms"
+
+
+def _timed(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+class TestSearchSession:
+    def _library(self, *names: str) -> GameLibrary:
+        return GameLibrary([Game(name=name, exe_path="", config_path="") for name in names])
+
+    def test_matches_library_search(self):
+        library = self._library("Doom", "Doom II", "Final Doom", "Duke Nukem", "Doon")
+        session = library.search_session()
+
+        for query in ("d", "do", "doo", "doom", "doom ", "doom i", "doo", "d", "", "duke"):
+            assert session.search(query) == library.search(query), query
+
+    def test_narrows_from_previous_query(self, monkeypatch):
+        library = self._library("Doom", "Doom II", "Duke Nukem")
+        session = library.search_session(fuzzy=False)
+        session.search("do")
+
+        def fail(*args, **kwargs):
+            raise AssertionError("searched the whole index")
+
+        monkeypatch.setattr(TrigramIndex, "_candidates", fail)
+
+        assert [g.name for g in session.search("doom")] == ["Doom", "Doom II"]
+        assert [g.name for g in session.search("doom ii")] == ["Doom II"]
+        assert [g.name for g in session.search("doom")] == ["Doom", "Doom II"]
+
+    def test_library_changes_reset_cache(self):
+        library = self._library("Doom")
+        session = library.search_session(fuzzy=False)
+        assert [g.name for g in session.search("doom")] == ["Doom"]
+
+        doom2 = Game(name="Doom II", exe_path="", config_path="")
+        library.add(doom2)
+
+        assert [g.name for g in session.search("doom ii")] == ["Doom II"]
+        library.remove(doom2.id)
+        assert session.search("doom ii") == []
+
+    def test_limit(self):
+        library = self._library("Doom", "Doom II", "Final Doom")
+        session = library.search_session(limit=2)
+
+        assert [g.name for g in session.search("doom")] == ["Doom", "Doom II"]
+
+    def test_cache_is_bounded(self):
+        library = self._library("Doom")
+        session = library.search_session()
+        session.max_cached = 2
+
+        for query in ("a", "b", "c", "d"):
+            session.search(query)
+
+        assert list(session._cache) == ["c", "d"]
+
+
+GAMES = {
+    "doom": ("Doom", ("Shooter",), "Runs fine with Sound Blaster."),
+    "monkey": ("Monkey Island", ("Adventure",), "Use the Roland MT-32 for music."),
+    "ultima": ("Ultima VII", ("RPG", "turn based"), "Needs MT-32; EMS off."),
+    "keen": ("Commander Keen", ("Platformer", "demo"), ""),
+}
+
+
+def _text_index() -> InvertedIndex:
+    index = InvertedIndex(lambda key, field: {"name": GAMES[key][0], "notes": GAMES[key][2]}[field])
+    for key, (name, tags, notes) in GAMES.items():
+        index.add(key, name, tags, notes)
+    return index
+
+
+class TestInvertedIndex:
+    def test_tokenize_keeps_compound_words(self):
+        assert tokenize("Roland MT-32, v1.2!") == ["roland", "mt-32", "v1.2"]
+
+    def test_tag_query(self):
+        index = _text_index()
+
+        assert index.query("tag:rpg") == ["ultima"]
+        assert index.query('tag:"Turn Based"') == ["ultima"]
+        assert index.query("tag:turn") == []
+
+    def test_notes_query(self):
+        index = _text_index()
+
+        assert index.query('notes:"mt-32"') == ["monkey", "ultima"]
+        assert index.query("notes:mt") == ["monkey", "ultima"]
+        assert index.query('notes:"roland mt-32"') == ["monkey"]
+        assert index.query('notes:"mt-32 roland"') == []
+
+    def test_terms_are_anded(self):
+        index = _text_index()
+
+        assert index.query('tag:rpg notes:"mt-32"') == ["ultima"]
+        assert index.query("tag:adventure tag:rpg") == []
+
+    def test_or_and_not(self):
+        index = _text_index()
+
+        assert index.query("tag:shooter OR tag:platformer") == ["doom", "keen"]
+        assert index.query("tag:shooter OR tag:platformer -tag:demo") == ["doom"]
+        assert index.query("tag:platformer -tag:demo") == []
+        assert index.query("NOT tag:demo") == ["doom", "monkey", "ultima"]
+
+    def test_bare_terms_match_any_field(self):
+        index = _text_index()
+
+        assert index.query("keen") == ["keen"]
+        assert index.query("adventure") == ["monkey"]
+        assert index.query("blaster") == ["doom"]
+
+    def test_unknown_field_is_plain_text(self):
+        index = _text_index()
+
+        assert index.query("foo:doom") == []
+
+    def test_empty_query_matches_everything(self):
+        assert _text_index().query("") == list(GAMES)
+
+    def test_readd_and_remove(self):
+        index = _text_index()
+
+        index.add("doom", "Doom", ("Shooter", "Classic"), "")
+        index.remove("keen")
+
+        assert index.query("tag:classic") == ["doom"]
+        assert index.query("blaster") == []
+        assert index.query("keen") == []
+        assert len(index) == 3
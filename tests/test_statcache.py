@@ -0,0 +1,82 @@
+"""Tests for DOSBox Launcher stat cache."""
+
+import os
+
+from dosboxlauncher.models import Game
+from dosboxlauncher.statcache import StatCache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestStatCache:
+    def test_repeated_checks_hit_the_cache(self, tmp_path, monkeypatch):
+        cache = StatCache(ttl=10, clock=_Clock())
+        path = tmp_path / "game.exe"
+        path.touch()
+        calls = []
+        real_stat = os.stat
+        monkeypatch.setattr(os, "stat", lambda p: calls.append(p) or real_stat(p))
+
+        assert cache.exists(path)
+        assert cache.isfile(path)
+        assert not cache.isdir(path)
+        assert not cache.exists(tmp_path / "missing.exe")
+        assert not cache.exists(tmp_path / "missing.exe")
+
+        assert len(calls) == 2
+        assert (cache.hits, cache.misses) == (3, 2)
+
+    def test_results_expire(self, tmp_path):
+        clock = _Clock()
+        cache = StatCache(ttl=5, clock=clock)
+        path = tmp_path / "game.exe"
+
+        assert not cache.exists(path)
+        path.touch()
+        clock.now = 4.9
+        assert not cache.exists(path)
+        clock.now = 5.0
+        assert cache.exists(path)
+
+    def test_invalidate(self, tmp_path):
+        cache = StatCache(clock=_Clock())
+        path = tmp_path / "game.exe"
+        assert not cache.exists(path)
+        assert cache.isdir(tmp_path)
+
+        path.touch()
+        cache.invalidate(path)
+        assert cache.exists(path)
+
+        path.unlink()
+        cache.invalidate()
+        assert not cache.exists(path)
+        assert cache.misses == 4
+
+    def test_size_is_bounded(self, tmp_path):
+        cache = StatCache(max_entries=2, clock=_Clock())
+
+        for name in ("a", "b", "c"):
+            cache.exists(tmp_path / name)
+        cache.exists(tmp_path / "a")
+
+        assert cache.misses == 4
+
+    def test_validating_unchanged_game_costs_no_syscalls(self, tmp_path, monkeypatch):
+        exe = tmp_path / "game.exe"
+        exe.touch()
+        game = Game(name="Doom", exe_path=str(exe), config_path=str(tmp_path))
+        (tmp_path / f"{game.id}.conf").touch()
+        assert game.validate() == (True, [])
+
+        def fail(path):
+            raise AssertionError(f"stat of {path}")
+
+        monkeypatch.setattr(os, "stat", fail)
+        assert game.validate() == (True, [])
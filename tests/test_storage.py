@@ -0,0 +1,618 @@
+"""Tests for DOSBox Launcher storage backends."""
+
+import json
+import sqlite3
+
+import pytest
+
+from dosboxlauncher.config import (
+    AppConfig,
+    get_storage,
+    load_app_config,
+    reload_app_config,
+    save_app_config,
+)
+from dosboxlauncher.models import ChangeKind, Game, GameLibrary
+from dosboxlauncher.storage import (
+    ChangeTracker,
+    JournalStorage,
+    ShardedStorage,
+    SqliteStorage,
+    YamlStorage,
+)
+
+
+def _games(count: int) -> list[Game]:
+    return [
+        Game(name=f"Game {i}", exe_path=f"/games/{i}.exe", config_path="/games", tags=["DOS"])
+        for i in range(count)
+    ]
+
+
+def _raise_os_error(*args):
+    raise OSError("disk full")
+
+
+def _sqlite_config(count: int) -> AppConfig:
+    return AppConfig(
+        dosbox_path="/usr/bin/dosbox", games=GameLibrary(_games(count)), storage="sqlite"
+    )
+
+
+class TestChangeTracker:
+    def test_coalesces_changes(self):
+        games = _games(3)
+        library = GameLibrary(games[:2])
+        tracker = ChangeTracker(library, None)
+
+        library.update(games[0].id, name="Renamed")
+        library.add(games[2])
+        library.remove(games[2].id)
+        library.remove(games[1].id)
+
+        assert tracker.take() == {
+            str(games[0].id): ChangeKind.UPDATED,
+            str(games[1].id): ChangeKind.REMOVED,
+        }
+        assert tracker.take() == {}
+
+    def test_restore_merges_later_changes(self):
+        games = _games(2)
+        library = GameLibrary(games[:1])
+        tracker = ChangeTracker(library, None)
+        library.add(games[1])
+        taken = tracker.take()
+
+        library.remove(games[1].id)
+        tracker.restore(taken)
+
+        assert tracker.take() == {}
+
+    def test_tracked_libraries_are_freed(self, config_path):
+        import gc
+        import weakref
+
+        from dosboxlauncher import storage
+
+        save_app_config(AppConfig(games=GameLibrary(_games(2))))
+        libraries = [weakref.ref(load_app_config().games) for _ in range(5)]
+        gc.collect()
+
+        assert all(ref() is None for ref in libraries)
+        assert len(storage._trackers) <= 1
+
+
+class TestSqliteStorage:
+    def test_roundtrip(self, config_path):
+        config = _sqlite_config(3)
+        config.games.update(config.games.view()[1].id, notes="MT-32", tags=["RPG", "DOS"])
+
+        save_app_config(config)
+        loaded = load_app_config()
+
+        assert config_path.with_name("config.db").exists()
+        assert not config_path.exists()
+        assert loaded.storage == "sqlite"
+        assert loaded.dosbox_path == "/usr/bin/dosbox"
+        assert [g.to_dict() for g in loaded.games] == [g.to_dict() for g in config.games]
+
+    def test_saves_only_changed_rows(self, config_path):
+        save_app_config(_sqlite_config(3))
+        config = load_app_config()
+        first, second, third = config.games.view()
+
+        # Edit a row behind the library's back; a full rewrite would undo it
+        database = config_path.with_name("config.db")
+        with sqlite3.connect(database) as conn:
+            conn.execute("UPDATE games SET notes = 'external' WHERE id = ?", (str(third.id),))
+
+        config.games.update(first.id, name="Renamed")
+        config.games.remove(second.id)
+        config.games.add(Game(name="New", exe_path="", config_path=""))
+        save_app_config(config)
+
+        loaded = load_app_config()
+        assert [g.name for g in loaded.games] == ["Renamed", "Game 2", "New"]
+        assert loaded.games.get(third.id).notes == "external"
+
+    def test_failed_save_keeps_changes(self, config_path, monkeypatch):
+        save_app_config(_sqlite_config(1))
+        config = load_app_config()
+        game = config.games.view()[0]
+        config.games.update(game.id, notes="Edited")
+
+        def fail(self, *args):
+            raise sqlite3.OperationalError("disk I/O error")
+
+        from dosboxlauncher.exceptions import ConfigError
+
+        with monkeypatch.context() as m:
+            m.setattr(SqliteStorage, "_write_changes", fail)
+            with pytest.raises(ConfigError, match="Failed to save config"):
+                save_app_config(config)
+        save_app_config(config)
+
+        assert load_app_config().games.get(game.id).notes == "Edited"
+
+    def test_migrates_from_yaml(self, config_path):
+        save_app_config(AppConfig(games=GameLibrary(_games(2))))
+        assert isinstance(get_storage(), YamlStorage)
+
+        config = load_app_config()
+        config.storage = "sqlite"
+        save_app_config(config)
+
+        assert isinstance(get_storage(), SqliteStorage)
+        assert not config_path.exists()
+        assert config_path.with_name("config.yaml.bak").exists()
+        assert [g.name for g in load_app_config().games] == ["Game 0", "Game 1"]
+
+    def test_migrates_on_load_when_yaml_asks_for_sqlite(self, config_path):
+        config_path.write_text("storage: sqlite\ngames:\n  games:\n  - name: Doom\n")
+
+        config = load_app_config()
+
+        assert config.storage == "sqlite"
+        assert config_path.with_name("config.db").exists()
+        assert [g.name for g in load_app_config().games] == ["Doom"]
+
+    def test_unknown_storage(self, config_path):
+        from dosboxlauncher.exceptions import ConfigError
+
+        with pytest.raises(ConfigError, match="Unknown config storage"):
+            save_app_config(AppConfig(storage="floppy"))
+
+
+class TestJournalStorage:
+    def _saved(self, count: int) -> AppConfig:
+        save_app_config(AppConfig(games=GameLibrary(_games(count)), storage="journal"))
+        return load_app_config()
+
+    def test_appends_changes(self, config_path):
+        config = self._saved(3)
+        snapshot = config_path.read_bytes()
+        first, second, _ = config.games.view()
+
+        config.games.update(first.id, name="Renamed")
+        config.games.remove(second.id)
+        config.games.add(Game(name="New", exe_path="", config_path=""))
+        config.dosbox_path = "/opt/dosbox"
+        save_app_config(config)
+
+        assert config_path.read_bytes() == snapshot
+        journal = config_path.with_name("config.yaml.journal").read_text().splitlines()
+        assert len(journal) == 5
+        loaded = load_app_config()
+        assert loaded.storage == "journal"
+        assert loaded.dosbox_path == "/opt/dosbox"
+        assert [g.name for g in loaded.games] == ["Renamed", "Game 2", "New"]
+
+    def test_stale_journal_is_ignored(self, config_path):
+        config = self._saved(1)
+        journal_path = config_path.with_name("config.yaml.journal")
+        stale = journal_path.read_text()
+        config.games.update(config.games.view()[0].id, name="Renamed")
+        save_app_config(config)
+        stale += journal_path.read_text().splitlines()[1] + "\n"
+
+        # Compacting folds the journal into config.yaml; its old header no
+        # longer matches
+        JournalStorage(config_path)._compact(config.games, config.settings())
+        journal_path.write_text(stale)
+
+        assert [g.name for g in load_app_config().games] == ["Renamed"]
+
+    def test_torn_record_is_dropped(self, config_path):
+        config = self._saved(1)
+        game = config.games.view()[0]
+        config.games.update(game.id, name="Renamed")
+        save_app_config(config)
+        journal_path = config_path.with_name("config.yaml.journal")
+        with open(journal_path, "a") as f:
+            f.write('{"op": "put", "ga')
+
+        config = load_app_config()
+        assert [g.name for g in config.games] == ["Renamed"]
+
+        # The next save starts over from a full snapshot
+        config.games.update(game.id, name="Again")
+        save_app_config(config)
+        assert len(journal_path.read_text().splitlines()) == 1
+        assert [g.name for g in load_app_config().games] == ["Again"]
+
+    def test_background_compaction(self, config_path, monkeypatch):
+        import dosboxlauncher.storage as storage_module
+
+        monkeypatch.setattr(storage_module, "JOURNAL_COMPACT_SIZE", 1)
+        config = self._saved(2)
+        first, second = config.games.view()
+
+        config.games.update(first.id, name="Renamed")
+        save_app_config(config)
+        config.games.update(second.id, name="Also renamed")
+        save_app_config(config)
+        get_storage().flush()
+
+        assert not config_path.with_name("config.yaml.journal.prev").exists()
+        assert "Renamed" in config_path.read_text()
+        assert [g.name for g in load_app_config().games] == ["Renamed", "Also renamed"]
+
+    def test_replays_set_aside_journal(self, config_path):
+        config = self._saved(2)
+        first, second = config.games.view()
+        journal_path = config_path.with_name("config.yaml.journal")
+        previous_path = config_path.with_name("config.yaml.journal.prev")
+
+        # As if a background compaction died before writing config.yaml
+        config.games.update(first.id, name="Renamed")
+        save_app_config(config)
+        header = journal_path.read_text().splitlines()[0]
+        journal_path.rename(previous_path)
+        snapshot = json.loads(header)["snapshot"]
+        journal_path.write_text(json.dumps({"snapshot": "next", "after": snapshot}) + "\n")
+
+        config = load_app_config()
+        assert [g.name for g in config.games] == ["Renamed", "Game 1"]
+
+        config.games.update(second.id, name="Also renamed")
+        save_app_config(config)
+        assert not previous_path.exists()
+        assert [g.name for g in load_app_config().games] == ["Renamed", "Also renamed"]
+
+    def test_switching_back_to_yaml_drops_journal(self, config_path):
+        config = self._saved(1)
+        config.storage = "yaml"
+        save_app_config(config)
+
+        assert not config_path.with_name("config.yaml.journal").exists()
+        assert isinstance(get_storage(), YamlStorage)
+        assert len(load_app_config().games) == 1
+
+
+class TestStartupCache:
+    def _fail_parsing(self, monkeypatch):
+        import yaml
+
+        def fail(stream):
+            raise AssertionError("config.yaml was parsed")
+
+        monkeypatch.setattr(yaml, "safe_load", fail)
+
+    def test_save_writes_cache(self, config_path, monkeypatch):
+        save_app_config(AppConfig(dosbox_path="/usr/bin/dosbox", games=GameLibrary(_games(2))))
+
+        assert config_path.with_name("config.yaml.cache").exists()
+        self._fail_parsing(monkeypatch)
+        config = load_app_config()
+        assert config.dosbox_path == "/usr/bin/dosbox"
+        assert [g.name for g in config.games] == ["Game 0", "Game 1"]
+
+    def test_load_writes_cache(self, config_path, monkeypatch):
+        config_path.write_text("dosbox_path: /usr/bin/dosbox\ngames:\n  games:\n  - name: Doom\n")
+
+        load_app_config()
+        self._fail_parsing(monkeypatch)
+
+        assert [g.name for g in load_app_config().games] == ["Doom"]
+
+    def test_changed_file_is_reparsed(self, config_path):
+        save_app_config(AppConfig(games=GameLibrary(_games(1))))
+
+        config_path.write_text("games:\n  games:\n  - name: Edited elsewhere\n")
+
+        assert [g.name for g in load_app_config().games] == ["Edited elsewhere"]
+
+    def test_bad_cache_falls_back_to_yaml(self, config_path):
+        save_app_config(AppConfig(games=GameLibrary(_games(1))))
+        cache_path = config_path.with_name("config.yaml.cache")
+
+        cache_path.write_bytes(b"not marshal data")
+        assert [g.name for g in load_app_config().games] == ["Game 0"]
+
+        import marshal
+
+        stat = config_path.stat()
+        cache_path.write_bytes(marshal.dumps((0, stat.st_mtime_ns, stat.st_size, {})))
+        assert [g.name for g in load_app_config().games] == ["Game 0"]
+        assert marshal.loads(cache_path.read_bytes())[0] != 0
+
+    def test_journal_snapshot_is_cached(self, config_path, monkeypatch):
+        save_app_config(AppConfig(games=GameLibrary(_games(1)), storage="journal"))
+        config = load_app_config()
+        config.games.update(config.games.view()[0].id, name="Renamed")
+        save_app_config(config)
+
+        self._fail_parsing(monkeypatch)
+        assert [g.name for g in load_app_config().games] == ["Renamed"]
+
+
+class TestShardedStorage:
+    def _saved(self, count: int) -> AppConfig:
+        save_app_config(AppConfig(games=GameLibrary(_games(count)), storage="sharded"))
+        return load_app_config()
+
+    def test_roundtrip(self, config_path):
+        config = _sqlite_config(2)
+        config.storage = "sharded"
+        save_app_config(config)
+
+        loaded = load_app_config()
+
+        assert isinstance(get_storage(), ShardedStorage)
+        assert config_path.with_name("games").joinpath("library.json").exists()
+        assert loaded.dosbox_path == "/usr/bin/dosbox"
+        assert [g.to_dict() for g in loaded.games] == [g.to_dict() for g in config.games]
+
+    def test_loads_only_the_manifest(self, config_path, monkeypatch):
+        config = self._saved(2)
+        storage = get_storage()
+        first, second = config.games.view()
+        reads = []
+        read_record = ShardedStorage._read_record
+        monkeypatch.setattr(
+            ShardedStorage,
+            "_read_record",
+            lambda self, key: reads.append(key) or read_record(self, key),
+        )
+
+        config = load_app_config()
+        first, second = config.games.view()
+        assert [g.name for g in config.games] == ["Game 0", "Game 1"]
+        assert reads == []
+
+        assert second.exe_path == "/games/1.exe"
+        assert second.tags == ("DOS",)
+        assert reads == [str(second.id)]
+        assert storage.record_path(str(second.id)).exists()
+
+    def test_edit_writes_one_record(self, config_path):
+        config = self._saved(3)
+        games_dir = config_path.with_name("games")
+        manifest = json.loads((games_dir / "library.json").read_bytes())
+        first, second, third = config.games.view()
+        before = {p.name: p.stat().st_mtime_ns for p in games_dir.iterdir()}
+
+        config.games.update(second.id, notes="MT-32")
+        save_app_config(config)
+
+        after = {p.name: p.stat().st_mtime_ns for p in games_dir.iterdir()}
+        changed = [name for name in after if after[name] != before.get(name)]
+        assert sorted(changed) == sorted([f"{second.id}.json", "library.json"])
+        written = json.loads((games_dir / "library.json").read_bytes())
+        assert written["games"] == manifest["games"]
+        assert written["generation"] == manifest["generation"] + 1
+        assert load_app_config().games.get(second.id).notes == "MT-32"
+
+    def test_add_remove_and_rename_update_manifest(self, config_path):
+        config = self._saved(3)
+        first, second, _ = config.games.view()
+
+        config.games.update(first.id, name="Renamed")
+        config.games.remove(second.id)
+        config.games.add(Game(name="New", exe_path="", config_path=""))
+        save_app_config(config)
+
+        assert not get_storage().record_path(str(second.id)).exists()
+        assert [g.name for g in load_app_config().games] == ["Renamed", "Game 2", "New"]
+
+    def test_missing_record_leaves_fields_empty(self, config_path):
+        config = self._saved(1)
+        game = config.games.view()[0]
+        get_storage().record_path(str(game.id)).unlink()
+
+        game = load_app_config().games.view()[0]
+
+        assert game.name == "Game 0"
+        assert game.exe_path == ""
+        assert not game.validate()[0]
+
+    def test_migrates_from_yaml(self, config_path):
+        save_app_config(AppConfig(games=GameLibrary(_games(2))))
+        config = load_app_config()
+        config.storage = "sharded"
+        save_app_config(config)
+
+        assert config_path.with_name("config.yaml.bak").exists()
+        assert [g.name for g in load_app_config().games] == ["Game 0", "Game 1"]
+
+
+class TestConcurrentWriters:
+    @pytest.mark.parametrize("storage", ["yaml", "journal", "sharded", "sqlite"])
+    def test_writers_merge_changes(self, config_path, monkeypatch, storage):
+        import dosboxlauncher.storage as storage_module
+
+        # Compact on every journal save, the riskiest case for merging
+        monkeypatch.setattr(storage_module, "JOURNAL_COMPACT_SIZE", 1)
+        save_app_config(AppConfig(games=GameLibrary(_games(2)), storage=storage))
+        first = load_app_config()
+        second = load_app_config()
+        kept, removed = first.games.view()
+
+        first.games.add(Game(name="From first", exe_path="", config_path=""))
+        first.dosbox_path = "/usr/bin/dosbox"
+        save_app_config(first)
+        get_storage(storage).flush()
+        second.games.add(Game(name="From second", exe_path="", config_path=""))
+        second.games.remove(removed.id)
+        second.default_config_dir = "/dos"
+        save_app_config(second)
+        get_storage(storage).flush()
+
+        # A later save from a writer that is behind must not drop anything
+        second.games.update(kept.id, notes="Edited")
+        save_app_config(second)
+        get_storage(storage).flush()
+
+        loaded = load_app_config()
+        assert sorted(g.name for g in loaded.games) == ["From first", "From second", "Game 0"]
+        assert loaded.games.get(kept.id).notes == "Edited"
+        assert loaded.dosbox_path == "/usr/bin/dosbox"
+        assert loaded.default_config_dir == "/dos"
+
+    def test_yaml_generation(self, config_path):
+        save_app_config(AppConfig())
+        config = load_app_config()
+        save_app_config(config)
+
+        assert config_path.read_text().splitlines()[0] == "generation: 2"
+
+    def test_merged_save_bumps_generation(self, config_path):
+        save_app_config(AppConfig(games=GameLibrary([Game(name="A", exe_path="", config_path="")])))
+        a = load_app_config()
+        b = load_app_config()
+        (game,) = a.games
+
+        b.games.add(Game(name="B", exe_path="", config_path=""))
+        save_app_config(b)
+        a.games.update(game.id, name="A2")
+        save_app_config(a)
+        assert reload_app_config(b)
+        b.games.add(Game(name="C", exe_path="", config_path=""))
+        save_app_config(b)
+
+        assert sorted(g.name for g in load_app_config().games) == ["A2", "B", "C"]
+        assert config_path.read_text().splitlines()[0] == "generation: 4"
+
+    @pytest.mark.parametrize("games", ["", "games: null\n"])
+    def test_merges_into_config_without_games(self, config_path, games):
+        save_app_config(AppConfig(games=GameLibrary(_games(1))))
+        config = load_app_config()
+        config_path.write_text(f"generation: 7\ndosbox_path: /usr/bin/dosbox\n{games}")
+
+        config.games.add(Game(name="Added", exe_path="", config_path=""))
+        save_app_config(config)
+
+        loaded = load_app_config()
+        assert [g.name for g in loaded.games] == ["Added"]
+        assert loaded.dosbox_path == "/usr/bin/dosbox"
+
+    def test_failed_first_save_writes_everything_on_retry(self, config_path, monkeypatch):
+        import dosboxlauncher.storage as storage_module
+        from dosboxlauncher.exceptions import ConfigError
+
+        save_app_config(AppConfig(games=GameLibrary(_games(1))))
+        other = load_app_config()
+        save_app_config(other)
+        config = AppConfig(games=GameLibrary([Game(name="Mine", exe_path="", config_path="")]))
+
+        with monkeypatch.context() as m:
+            m.setattr(storage_module, "_write_yaml", _raise_os_error)
+            with pytest.raises(ConfigError, match="Failed to save config"):
+                save_app_config(config)
+        save_app_config(config)
+
+        assert [g.name for g in load_app_config().games] == ["Mine"]
+
+    def test_fresh_config_overwrites(self, config_path):
+        save_app_config(AppConfig(games=GameLibrary(_games(2))))
+
+        save_app_config(AppConfig(games=GameLibrary(_games(1))))
+
+        assert len(load_app_config().games) == 1
+
+    def test_file_lock_excludes_other_holders(self, tmp_path):
+        import threading
+
+        from dosboxlauncher.storage import file_lock
+
+        lock_path = tmp_path / "config.yaml.lock"
+        acquired = threading.Event()
+
+        def other_writer():
+            with file_lock(lock_path):
+                acquired.set()
+
+        with file_lock(lock_path):
+            thread = threading.Thread(target=other_writer)
+            thread.start()
+            assert not acquired.wait(0.1)
+        thread.join(2)
+
+        assert acquired.is_set()
+
+
+class TestLiveReload:
+    @pytest.mark.parametrize("storage", ["yaml", "journal", "sharded", "sqlite"])
+    def test_applies_other_writers_changes(self, config_path, storage):
+        from dosboxlauncher.config import reload_app_config
+
+        save_app_config(AppConfig(games=GameLibrary(_games(3)), storage=storage))
+        shown = load_app_config()
+        other = load_app_config()
+        kept, edited, removed = other.games.view()
+        changes = []
+        shown.games.subscribe(changes.append)
+
+        other.games.update(edited.id, name="Edited")
+        other.games.remove(removed.id)
+        other.games.add(Game(name="Added", exe_path="", config_path=""))
+        other.dosbox_path = "/usr/bin/dosbox"
+        save_app_config(other)
+
+        assert reload_app_config(shown)
+        assert [g.name for g in shown.games] == ["Game 0", "Edited", "Added"]
+        assert shown.dosbox_path == "/usr/bin/dosbox"
+        assert sorted(c.kind.value for c in changes) == ["added", "removed", "updated"]
+        assert all(len(c.ids) == 1 for c in changes)
+
+        # Reloaded changes are already saved, so saving again loses nothing
+        shown.games.update(kept.id, notes="Local")
+        save_app_config(shown)
+        loaded = load_app_config()
+        assert [g.name for g in loaded.games] == ["Game 0", "Edited", "Added"]
+        assert loaded.games.get(kept.id).notes == "Local"
+
+    @pytest.mark.parametrize("storage", ["yaml", "journal", "sharded", "sqlite"])
+    def test_skips_reading_when_nothing_changed(self, config_path, monkeypatch, storage):
+        from dosboxlauncher.config import reload_app_config
+
+        save_app_config(AppConfig(games=GameLibrary(_games(2)), storage=storage))
+        config = load_app_config()
+        config.games.add(Game(name="Added", exe_path="", config_path=""))
+        save_app_config(config)
+
+        def fail(self):
+            raise AssertionError("config was read")
+
+        monkeypatch.setattr(type(get_storage(storage)), "load", fail)
+        assert not reload_app_config(config)
+
+    @pytest.mark.parametrize("storage", ["yaml", "journal", "sharded", "sqlite"])
+    def test_applies_other_writers_record_edits(self, config_path, storage):
+        save_app_config(AppConfig(games=GameLibrary(_games(2)), storage=storage))
+        shown = load_app_config()
+        other = load_app_config()
+        first, second = shown.games.view()
+        assert first.exe_path == "/games/0.exe"
+
+        other.games.update(first.id, exe_path="/games/moved.exe")
+        other.games.update(second.id, notes="Edited")
+        save_app_config(other)
+
+        assert reload_app_config(shown)
+        assert shown.games.get(first.id).exe_path == "/games/moved.exe"
+        assert shown.games.get(second.id).notes == "Edited"
+
+    def test_keeps_unsaved_changes(self, config_path):
+        from dosboxlauncher.config import reload_app_config
+
+        save_app_config(AppConfig(games=GameLibrary(_games(2))))
+        shown = load_app_config()
+        other = load_app_config()
+        first, second = shown.games.view()
+        shown.games.update(first.id, name="Unsaved")
+        shown.default_config_dir = "/dos"
+
+        other.games.update(first.id, name="Theirs")
+        other.games.update(second.id, name="Also theirs")
+        other.default_config_dir = "/theirs"
+        save_app_config(other)
+
+        assert reload_app_config(shown)
+        assert [g.name for g in shown.games] == ["Unsaved", "Also theirs"]
+        assert shown.default_config_dir == "/dos"
+
+        save_app_config(shown)
+        loaded = load_app_config()
+        assert [g.name for g in loaded.games] == ["Unsaved", "Also theirs"]
+        assert loaded.default_config_dir == "/dos"
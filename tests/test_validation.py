@@ -0,0 +1,112 @@
+"""Tests for DOSBox Launcher batch validation."""
+
+import threading
+
+from dosboxlauncher.models import Game
+from dosboxlauncher.statcache import stat_cache
+from dosboxlauncher.validation import check_launch, validate_games
+
+
+class TestValidateAll:
+    def test_reports_every_game(self, tmp_path, make_library):
+        library = make_library(20, broken={3, 7})
+
+        reports = list(library.validate_all(check_config_file=False, max_workers=4))
+
+        assert sorted(r.game_id for r in reports) == sorted(str(g.id) for g in library)
+        invalid = sorted(r.game.name for r in reports if not r.is_valid)
+        assert invalid == ["Game 3", "Game 7"]
+        report = next(r for r in reports if r.game.name == "Game 3")
+        assert report.errors == (f"Game executable not found: {tmp_path / 'game3.exe'}",)
+
+    def test_runs_on_worker_threads(self, make_library, monkeypatch):
+        threads = set()
+        original = Game.validate
+
+        def validate(self, check_config_file=True):
+            threads.add(threading.current_thread())
+            return original(self, check_config_file)
+
+        monkeypatch.setattr(Game, "validate", validate)
+        list(make_library(10).validate_all(max_workers=2))
+
+        assert threading.current_thread() not in threads
+        assert 1 <= len(threads) <= 2
+
+    def test_bounds_games_in_flight(self, make_library):
+        library = make_library(50)
+        taken = 0
+
+        def games():
+            nonlocal taken
+            for game in library:
+                taken += 1
+                yield game
+
+        reports = validate_games(games(), max_workers=2)
+        next(reports)
+
+        assert taken <= 4
+        reports.close()
+
+    def test_cancel_stops_early(self, make_library):
+        library = make_library(100)
+        cancel = threading.Event()
+
+        reports = []
+        for report in library.validate_all(max_workers=2, cancel=cancel):
+            reports.append(report)
+            cancel.set()
+
+        assert 1 <= len(reports) < 100
+
+
+class TestCheckLaunch:
+    def test_reports_missing_paths(self, tmp_path):
+        game = Game(name="Doom", exe_path=str(tmp_path / "gone.exe"), config_path="")
+
+        result = check_launch(game)
+
+        assert not result.ok
+        assert result.errors == (
+            f"Game executable not found: {tmp_path / 'gone.exe'}",
+            "Config directory not found: ",
+        )
+        assert result.timed_out == ()
+
+    def test_valid_game(self, tmp_path):
+        exe = tmp_path / "doom.exe"
+        exe.touch()
+
+        result = check_launch(Game(name="Doom", exe_path=str(exe), config_path=str(tmp_path)))
+
+        assert result.ok
+
+    def test_slow_paths_time_out(self, tmp_path, monkeypatch):
+        hung = threading.Event()
+        exe = str(tmp_path / "mnt" / "doom.exe")
+        original = stat_cache.exists
+        monkeypatch.setattr(stat_cache, "exists", lambda p: hung.wait() or original(p))
+        game = Game(name="Doom", exe_path=exe, config_path=str(tmp_path / "gone"))
+
+        try:
+            result = check_launch(game, timeout=0.05)
+        finally:
+            hung.set()
+
+        assert result.timed_out == (exe,)
+        assert result.errors == (f"Config directory not found: {tmp_path / 'gone'}",)
+
+    def test_cancel_stops_waiting(self, tmp_path, monkeypatch):
+        hung = threading.Event()
+        cancel = threading.Event()
+        cancel.set()
+        monkeypatch.setattr(stat_cache, "exists", lambda p: hung.wait())
+        game = Game(name="Doom", exe_path=str(tmp_path / "doom.exe"), config_path=str(tmp_path))
+
+        try:
+            result = check_launch(game, timeout=60, cancel=cancel)
+        finally:
+            hung.set()
+
+        assert str(tmp_path / "doom.exe") in result.timed_out